@@ -0,0 +1,85 @@
+# Importing Libraries
+import time
+import numpy as np
+import pandas as pd
+from data_handling.handling_missing_values import FillMissingVaulues
+from feature_engineering.feature_engineering import (BinaryEncoding, FeaturePipeline, LogTransformation,
+                                                     OneHotEncoding, StandardScaling)
+from feature_engineering.inference_plan import InferencePlan
+from outlier_detection.outlier_detection import IQROutlierDetection, OutlierDetector
+
+# ***************************************************************
+# ************ Single-Listing Latency: pandas vs Compiled Plan **
+# ***************************************************************
+# Run from the repository root:  python -m benchmarks.bench_inference_plan
+
+NUMERIC = ["area", "bedrooms", "bathrooms", "stories", "parking"]
+YES_NO = ["mainroad", "guestroom", "basement", "hotwaterheating", "airconditioning", "prefarea"]
+
+def make_listings(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    # Housing-like listings with a few missing values
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "area": rng.lognormal(8.4, 0.4, n_rows).round(),
+        "bedrooms": rng.integers(1, 6, n_rows).astype(float),
+        "bathrooms": rng.integers(1, 4, n_rows).astype(float),
+        "stories": rng.integers(1, 4, n_rows).astype(float),
+        "parking": rng.integers(0, 3, n_rows).astype(float),
+        **{column: rng.choice(["yes", "no"], n_rows) for column in YES_NO},
+        "furnishingstatus": rng.choice(["furnished", "semi-furnished", "unfurnished"], n_rows),
+    })
+    for column in ["area", "bedrooms", "furnishingstatus"]:
+        df.loc[rng.random(n_rows) < 0.02, column] = None
+    return df
+
+def fit_steps(df: pd.DataFrame):
+    numeric_imputer = FillMissingVaulues(method="median").fit(df)
+    mode_imputer = FillMissingVaulues(method="mode").fit(df)
+    filled = mode_imputer.transform(numeric_imputer.transform(df))
+    detector = OutlierDetector(IQROutlierDetection()).fit(filled[NUMERIC])
+    capped = detector.transform(filled, method="cap")
+    pipeline = FeaturePipeline([
+        BinaryEncoding(YES_NO),
+        OneHotEncoding(["furnishingstatus"]),
+        LogTransformation(["area"]),
+        StandardScaling(NUMERIC),
+    ]).fit(capped)
+    return numeric_imputer, mode_imputer, detector, pipeline
+
+def pandas_path(listing: dict, numeric_imputer, mode_imputer, detector, pipeline) -> np.ndarray:
+    df = pd.DataFrame([listing])
+    df = mode_imputer.transform(numeric_imputer.transform(df))
+    df = detector.transform(df.astype({column: np.float64 for column in NUMERIC}), method="cap")
+    return pipeline.transform(df)[0]
+
+def latencies(function, listings: list) -> np.ndarray:
+    timings = np.empty(len(listings))
+    for position, listing in enumerate(listings):
+        start = time.perf_counter()
+        function(listing)
+        timings[position] = time.perf_counter() - start
+    return timings * 1e6
+
+def report(name: str, timings: np.ndarray):
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"  {name:<26} p50 {p50:9.1f} us   p99 {p99:9.1f} us")
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    df = make_listings(20_000)
+    steps = fit_steps(df)
+    plan = InferencePlan.compile(steps[3], imputers=[steps[0], steps[1]], outlier_detector=steps[2])
+    plan = InferencePlan.from_dict(plan.to_dict())
+
+    listings = [{key: (None if value is None or value != value else value) for key, value in record.items()}
+                for record in make_listings(2_000, seed=1).to_dict("records")]
+    rows = [np.array([listing[field] for field in plan.input_columns], dtype=object) for listing in listings]
+    for listing in listings[:200]:
+        np.testing.assert_allclose(plan.transform_row(listing), pandas_path(listing, *steps), rtol=1e-12)
+
+    print(f"{len(plan.feature_names)} features, {len(listings)} listings")
+    report("pandas transforms", latencies(lambda listing: pandas_path(listing, *steps), listings[:300]))
+    report("InferencePlan (dict)", latencies(plan.transform_row, listings))
+    report("InferencePlan (NumPy row)", latencies(plan.transform_row, rows))
@@ -0,0 +1,67 @@
+# Importing Libraries
+import time
+import numpy as np
+import pandas as pd
+from data_handling.handling_missing_values import FillMissingVaulues, column_modes
+
+# ***************************************************************
+# ************ Mode Imputation: Column Loop vs Single Pass ******
+# ***************************************************************
+# Run from the repository root:  python -m benchmarks.bench_mode_imputation
+# Measured on 1 CPU with pandas 3 (Arrow-backed str columns): the modes alone are 2.0-2.2x
+# faster on category columns and 1.3-1.7x on string columns, where hashing the values bounds
+# both paths; with the fill included the imputation is 1.4-1.5x and 1.1-1.2x faster.
+
+def make_frame(n_rows: int, n_columns: int, cardinality: int, missing: float, seed: int = 0,
+               categorical: bool = False) -> pd.DataFrame:
+    # wide frame of categorical-like string columns with randomly missing values
+    rng = np.random.default_rng(seed)
+    levels = np.array([f"level_{i}" for i in range(cardinality)], dtype=object)
+    data = {}
+    for column in range(n_columns):
+        values = levels[rng.integers(0, cardinality, n_rows)]
+        values[rng.random(n_rows) < missing] = None
+        data[f"col_{column}"] = values
+    df = pd.DataFrame(data)
+    return df.astype("category") if categorical else df
+
+def column_loop(df: pd.DataFrame) -> pd.DataFrame:
+    # the previous implementation; the fill is assigned back because the chained
+    # fillna(..., inplace=True) it used does nothing under copy-on-write
+    df_cleaned = df.copy()
+    for column in df_cleaned.columns:
+        df_cleaned[column] = df_cleaned[column].fillna(df[column].mode().iloc[0])
+    return df_cleaned
+
+def mode_loop(df: pd.DataFrame) -> pd.Series:
+    # the modes of the previous implementation, without the fill
+    return pd.Series({column: df[column].mode().iloc[0] for column in df.columns}, dtype=object)
+
+def single_pass(df: pd.DataFrame) -> pd.DataFrame:
+    return FillMissingVaulues(method="mode").handle(df)
+
+def best_of(function, df: pd.DataFrame, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    for categorical in (True, False):
+        print("category columns (e.g. after DtypeCompactor)" if categorical else "string columns")
+        for n_rows, n_columns, cardinality in [(100_000, 50, 20), (100_000, 200, 200), (1_000_000, 20, 1_000)]:
+            df = make_frame(n_rows, n_columns, cardinality, missing=0.05, categorical=categorical)
+            assert column_loop(df).equals(single_pass(df))
+            assert mode_loop(df).equals(column_modes(df))
+            loop_seconds = best_of(column_loop, df)
+            pass_seconds = best_of(single_pass, df)
+            mode_loop_seconds = best_of(mode_loop, df)
+            modes_seconds = best_of(column_modes, df)
+            print(f"  {n_rows:>9} rows x {n_columns:>3} columns, {cardinality:>5} levels: "
+                  f"modes {mode_loop_seconds:.3f}s -> {modes_seconds:.3f}s ({mode_loop_seconds / modes_seconds:.1f}x), "
+                  f"imputation {loop_seconds:.3f}s -> {pass_seconds:.3f}s ({loop_seconds / pass_seconds:.1f}x)")
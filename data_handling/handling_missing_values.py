@@ -1,11 +1,69 @@
 #importing libraries
+from typing import Iterable, Iterator
+import numpy as np
 import pandas as pd
 import logging
+from joblib import Parallel, delayed
+from sklearn.experimental import enable_iterative_imputer  # noqa: F401 (enables IterativeImputer)
+from sklearn.impute import IterativeImputer
+from sklearn.neighbors import BallTree, KDTree
 
 
 #setup logging configurations
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s -%(message)s")
 
+#****************************************************************************************
+#******************* Most Frequent Value of Every Column *******************************
+#****************************************************************************************
+
+def column_modes(df: pd.DataFrame) -> pd.Series:
+    ''' Computes the mode of every column with one counting pass per column.
+    Categorical columns are counted directly on their codes with np.bincount, other columns with
+    one unsorted value_counts, instead of Series.mode() which also sorts the values.
+    Ties resolve to the smallest value, like Series.mode().iloc[0]. Columns without any value
+    are left out.
+    Parameters:
+    df(pd.DataFrame): Takes Dataframe as args
+    Returns:
+    Series: the mode of each column indexed by column name
+    '''
+    modes = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # shift by one so missing values (code -1) land in bin 0 and are ignored
+            counts = np.bincount(series.cat.codes.to_numpy() + 1, minlength=len(series.cat.categories) + 1)[1:]
+            uniques = series.cat.categories
+        else:
+            value_counts = series.value_counts(sort=False, dropna=True)
+            counts, uniques = value_counts.to_numpy(), value_counts.index
+
+        if len(counts) == 0 or counts.max() == 0:
+            continue
+        tied = np.flatnonzero(counts == counts.max())
+        if len(tied) == 1 or isinstance(series.dtype, pd.CategoricalDtype):
+            # category codes follow category order, so the first tie is the smallest
+            modes[column] = uniques[tied[0]]
+        else:
+            try:
+                modes[column] = min(uniques[tied])
+            except TypeError:
+                modes[column] = uniques[tied[0]]
+
+    return pd.Series(list(modes.values()), index=list(modes), dtype=object)
+
+def _write_imputed(df: pd.DataFrame, columns: pd.Index, values: np.ndarray, missing: np.ndarray):
+    # writes the imputed values back at the missing positions only; columns without missing
+    # values are not touched and keep their dtype (e.g. int64 bedrooms)
+    for position in np.flatnonzero(missing.any(axis=0)):
+        column = columns[position]
+        series = df[column]
+        # float columns keep their precision, others (nullable integers) cannot hold the estimates
+        dtype = series.dtype if isinstance(series.dtype, np.dtype) and series.dtype.kind == "f" else np.float64
+        filled = series.to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+        filled[missing[:, position]] = values[missing[:, position], position]
+        df[column] = filled
+
 #****************************************************************************************
 #*******************Abstract Classs  for Handling Missing Values ***********************
 #****************************************************************************************
@@ -20,6 +78,25 @@ class HandlingMissing():
         '''
         pass
 
+    def fit(self, df: pd.DataFrame):
+        ''' Learns whatever the strategy needs from the data, stateless strategies learn nothing
+        Parameters:
+        df(pd.DataFrame): Takes Dataframe as args
+        Returns:
+        HandlingMissing: the fitted strategy
+        '''
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        ''' Applies the fitted strategy to a DataFrame or a chunk of one
+        Parameters:
+        df(pd.DataFrame): Takes Dataframe as args
+        inplace(bool): modify df instead of returning a new DataFrame where the strategy supports it
+        Returns:
+        DataFrame: cleaned dataframe
+        '''
+        return self.handle(df)
+
 #************************************************************************************
 #***************** Drop Missing Values **********************************************
 #************************************************************************************
@@ -66,45 +143,274 @@ class FillMissingVaulues(HandlingMissing):
         """
         self.method = method
         self.fill_value = fill_value
+        self.columns_ = None
+        self.fill_values_ = None
 
-    def handle(self, df: pd.DataFrame) -> pd.DataFrame:
-
-        ''' Fill  rows or columns with missing values based on the axis and thresh values
+    def fit(self, df: pd.DataFrame):
+        ''' Learns the fill value of every column once
         Parameters:
         df(pd.DataFrame): Takes dataframe as arg
         Returns:
-        Dataframe: returns cleaned dataframe 
+        FillMissingVaulues: the fitted strategy, fill values are stored in columns_ / fill_values_
         '''
-        logging.info(f"filling missing values with method = {self.method}")
-        
-        df_cleaned = df.copy()
+        logging.info(f"Fitting fill values with method = {self.method}")
 
         if self.method == "mean":
-            numeric_columns = df_cleaned.select_dtypes(include="number").columns
-            df_cleaned[numeric_columns] = df_cleaned[numeric_columns].fillna(
-                df[numeric_columns].mean()
-            )
+            numeric_columns = df.select_dtypes(include="number").columns
+            self.columns_ = numeric_columns
+            self.fill_values_ = df[numeric_columns].mean().to_numpy(dtype=np.float64)
         elif self.method == "median":
-            numeric_columns = df_cleaned.select_dtypes(include="number").columns
-            df_cleaned[numeric_columns] = df_cleaned[numeric_columns].fillna(
-                df[numeric_columns].median()
-            )
-
-
-        elif self.method ==  'mode':
-            for column in df_cleaned.columns:
-                df_cleaned[column].fillna(df[column].mode().iloc[0], inplace=True)
-        
+            numeric_columns = df.select_dtypes(include="number").columns
+            self.columns_ = numeric_columns
+            self.fill_values_ = df[numeric_columns].median().to_numpy(dtype=np.float64)
+        elif self.method == 'mode':
+            modes = column_modes(df)
+            self.columns_ = modes.index
+            self.fill_values_ = modes.to_numpy(dtype=object)
         elif self.method == 'constant':
-            df_cleaned = df_cleaned.fillna(self.fill_value)
-        
+            self.columns_ = df.columns
+            self.fill_values_ = np.full(len(df.columns), self.fill_value, dtype=object)
         else:
             logging.warning(f"Unknown method '{self.method}'. No missing values")
+            self.columns_ = pd.Index([])
+            self.fill_values_ = np.array([], dtype=object)
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        ''' Fills missing values with the fitted fill values, no statistics are recomputed
+        Parameters:
+        df(pd.DataFrame): Takes dataframe (or a chunk) as arg
+        inplace(bool): fill df itself instead of returning a new DataFrame
+        Returns:
+        Dataframe: returns cleaned dataframe, a copy of df unless inplace
+        '''
+        if self.fill_values_ is None:
+            raise ValueError("FillMissingVaulues is not fitted, call fit() first")
+
+        # only the columns that actually contain missing values are touched
+        fill = {column: value for column, value in zip(self.columns_, self.fill_values_)
+                if column in df.columns and df[column].hasnans}
+        if not fill:
+            return df if inplace else df.copy()
+        if inplace:
+            df.fillna(value=fill, inplace=True)
+            return df
+        return df.fillna(value=fill)
+
+    def handle(self, df: pd.DataFrame) -> pd.DataFrame:
+
+        ''' Fill  rows or columns with missing values based on the axis and thresh values
+        Parameters:
+        df(pd.DataFrame): Takes dataframe as arg
+        Returns:
+        Dataframe: returns cleaned dataframe 
+        '''
+        logging.info(f"filling missing values with method = {self.method}")
+
+        df_cleaned = self.fit(df).transform(df)
 
         logging.info('Missing Values filled')
     
         return df_cleaned
     
+# ********************************************************************
+#**************** KNN Imputation *************************************
+#*********************************************************************
+
+class KNNImputation(HandlingMissing):
+    def __init__ (self, n_neighbors= 5, columns = None, algorithm = "kd_tree", leaf_size = 40,
+                  fit_sample_size = None, batch_size = 10_000, n_jobs = -1, random_state = 42):
+        """ 
+        parameters:
+        n_neighbors (int): number of similar houses averaged to fill a value
+
+        columns (list): numeric columns used for the distance and imputed, all numeric columns when None
+
+        algorithm (str): "kd_tree" or "ball_tree" neighbor index
+
+        leaf_size (int): leaf size of the neighbor index
+
+        fit_sample_size (int): number of complete rows kept as neighbors, all complete rows when None
+
+        batch_size (int): number of rows per neighbor query batch
+
+        n_jobs (int): number of threads running query batches, -1 uses every core
+
+        random_state (int): seed used when sampling the neighbor rows
+        
+        """
+        self.n_neighbors = n_neighbors
+        self.columns = columns
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.fit_sample_size = fit_sample_size
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.columns_ = None
+
+    def fit(self, df: pd.DataFrame):
+        ''' Stores the standardized complete rows that neighbors are searched in
+        Parameters:
+        df(pd.DataFrame): Takes dataframe as arg
+        Returns:
+        KNNImputation: the fitted strategy
+        '''
+        self.columns_ = pd.Index(self.columns) if self.columns is not None else df.select_dtypes(include="number").columns
+        values = df[self.columns_].to_numpy(dtype=np.float64)
+        self.mean_ = np.nanmean(values, axis=0)
+        self.scale_ = np.nanstd(values, axis=0)
+        self.scale_[~(self.scale_ > 0)] = 1.0
+
+        reference = values[~np.isnan(values).any(axis=1)]
+        if self.fit_sample_size is not None and len(reference) > self.fit_sample_size:
+            rng = np.random.default_rng(self.random_state)
+            reference = reference[rng.choice(len(reference), size=self.fit_sample_size, replace=False)]
+        if len(reference) < self.n_neighbors:
+            raise ValueError(f"KNN imputation needs at least {self.n_neighbors} complete rows, found {len(reference)}")
+
+        logging.info(f"Fitting KNN imputation on {len(reference)} complete rows")
+        self.reference_ = reference
+        self.reference_scaled_ = (reference - self.mean_) / self.scale_
+        # one index per pattern of observed columns, built on first use and reused afterwards
+        self._trees = {}
+        return self
+
+    def _tree(self, observed: tuple):
+        if observed not in self._trees:
+            tree_class = KDTree if self.algorithm == "kd_tree" else BallTree
+            self._trees[observed] = tree_class(self.reference_scaled_[:, list(observed)], leaf_size=self.leaf_size)
+        return self._trees[observed]
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        ''' Fills each missing value with the mean of that column over the nearest complete rows,
+        the distance is measured on the columns the row does have
+        Parameters:
+        df(pd.DataFrame): Takes dataframe (or a chunk) as arg
+        inplace(bool): fill df itself instead of returning a new DataFrame
+        Returns:
+        Dataframe: returns cleaned dataframe
+        '''
+        if self.columns_ is None:
+            raise ValueError("KNNImputation is not fitted, call fit() first")
+        logging.info(f"Imputing missing values from {self.n_neighbors} nearest neighbors")
+
+        values = df[self.columns_].to_numpy(dtype=np.float64, copy=True)
+        missing = np.isnan(values)
+        incomplete = np.flatnonzero(missing.any(axis=1))
+        if len(incomplete) == 0:
+            return df if inplace else df.copy()
+
+        # rows sharing the same missing columns are queried against the same index
+        patterns, pattern_of_row = np.unique(missing[incomplete], axis=0, return_inverse=True)
+        for number, pattern in enumerate(patterns):
+            rows = incomplete[pattern_of_row.ravel() == number]
+            observed = tuple(np.flatnonzero(~pattern))
+            if not observed:
+                values[np.ix_(rows, np.flatnonzero(pattern))] = self.mean_[pattern]
+                continue
+
+            queries = (values[np.ix_(rows, observed)] - self.mean_[list(observed)]) / self.scale_[list(observed)]
+            tree = self._tree(observed)
+            batches = np.array_split(queries, -(-len(queries) // self.batch_size))
+            neighbors = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(tree.query)(batch, k=self.n_neighbors, return_distance=False) for batch in batches)
+            neighbors = np.concatenate(neighbors)
+
+            filled_columns = np.flatnonzero(pattern)
+            values[np.ix_(rows, filled_columns)] = self.reference_[:, filled_columns][neighbors].mean(axis=1)
+
+        if not inplace:
+            df = df.copy()
+        _write_imputed(df, self.columns_, values, missing)
+        return df
+
+    def handle(self, df: pd.DataFrame) -> pd.DataFrame:
+        ''' Fills missing numeric values from similar rows of the same DataFrame
+        Parameters:
+        df(pd.DataFrame): Takes dataframe as arg
+        Returns:
+        Dataframe: returns cleaned dataframe 
+        '''
+        return self.fit(df).transform(df)
+
+# ********************************************************************
+#**************** Iterative (Model-Based) Imputation *****************
+#*********************************************************************
+
+class IterativeImputation(HandlingMissing):
+    def __init__ (self, columns = None, estimator = None, max_iter = 10, fit_sample_size = None, random_state = 42):
+        """ 
+        parameters:
+        columns (list): numeric columns to impute, all numeric columns when None
+
+        estimator (sklearn regressor): model predicting a column from the others, BayesianRidge when None
+
+        max_iter (int): number of imputation rounds over the columns
+
+        fit_sample_size (int): number of rows the models are fitted on, all rows when None
+
+        random_state (int): seed of the imputer and of the row sample
+        
+        """
+        self.columns = columns
+        self.estimator = estimator
+        self.max_iter = max_iter
+        self.fit_sample_size = fit_sample_size
+        self.random_state = random_state
+        self.columns_ = None
+
+    def fit(self, df: pd.DataFrame):
+        ''' Fits one regression model per column, each predicting it from the other columns
+        Parameters:
+        df(pd.DataFrame): Takes dataframe as arg
+        Returns:
+        IterativeImputation: the fitted strategy
+        '''
+        self.columns_ = pd.Index(self.columns) if self.columns is not None else df.select_dtypes(include="number").columns
+        values = df[self.columns_].to_numpy(dtype=np.float64)
+        if self.fit_sample_size is not None and len(values) > self.fit_sample_size:
+            rng = np.random.default_rng(self.random_state)
+            values = values[rng.choice(len(values), size=self.fit_sample_size, replace=False)]
+
+        logging.info(f"Fitting iterative imputation on {len(values)} rows")
+        self.imputer_ = IterativeImputer(estimator=self.estimator, max_iter=self.max_iter,
+                                         random_state=self.random_state, keep_empty_features=True)
+        self.imputer_.fit(values)
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        ''' Fills missing values with the predictions of the fitted models
+        Parameters:
+        df(pd.DataFrame): Takes dataframe (or a chunk) as arg
+        inplace(bool): fill df itself instead of returning a new DataFrame
+        Returns:
+        Dataframe: returns cleaned dataframe
+        '''
+        if self.columns_ is None:
+            raise ValueError("IterativeImputation is not fitted, call fit() first")
+        values = df[self.columns_].to_numpy(dtype=np.float64, copy=True)
+        missing = np.isnan(values)
+        incomplete = missing.any(axis=1)
+        if not incomplete.any():
+            return df if inplace else df.copy()
+
+        logging.info("Imputing missing values with the fitted regression models")
+        values[incomplete] = self.imputer_.transform(values[incomplete])
+        if not inplace:
+            df = df.copy()
+        _write_imputed(df, self.columns_, values, missing)
+        return df
+
+    def handle(self, df: pd.DataFrame) -> pd.DataFrame:
+        ''' Fills missing numeric values by regression on the other columns
+        Parameters:
+        df(pd.DataFrame): Takes dataframe as arg
+        Returns:
+        Dataframe: returns cleaned dataframe 
+        '''
+        return self.fit(df).transform(df)
+
 # *******************************************************************
 #************ Context Class for Handling Missing Values *************
 #********************************************************************
@@ -146,6 +452,44 @@ class MissingValueHandler:
 
         logging.info("Executing missing value handling strategy")
         return self._strategy.handle(df)
+
+    def fit(self, df: pd.DataFrame):
+        '''Learns the fill values of the current strategy once.
+
+        Parameters:
+        df (pd.DataFrame): the dataframe the values are learned from
+
+        returns:
+        MissingValueHandler: the handler with a fitted strategy
+        '''
+        logging.info("Fitting missing value handling strategy")
+        self._strategy.fit(df)
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        '''Applies the fitted strategy without recomputing any statistics.
+
+        Parameters:
+        df (pd.DataFrame): the dataframe to be cleaned
+        inplace (bool): modify df instead of returning a new DataFrame
+
+        returns:
+        DataFrame: the cleaned dataframe
+        '''
+        return self._strategy.transform(df, inplace=inplace)
+
+    def transform_chunks(self, chunks: Iterable[pd.DataFrame], inplace: bool = True) -> Iterator[pd.DataFrame]:
+        '''Applies the fitted strategy to a stream of chunks, e.g. from ZipDataset.stream.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): the chunks to be cleaned
+        inplace (bool): fill each chunk in place, chunks are usually not reused
+
+        returns:
+        Iterator[pd.DataFrame]: the cleaned chunks
+        '''
+        for chunk in chunks:
+            yield self._strategy.transform(chunk, inplace=inplace)
     
 # Example Usage
 
@@ -164,6 +508,18 @@ if __name__ == "__main__":
     # missing_value_handler.set_strategy(FillMissingVaulues(method='mean'))
     # df.filled = missing_value_handler.handle_missing_values(df)
 
+    # # estimate a missing area from the 5 most similar houses
+
+    # missing_value_handler.set_strategy(KNNImputation(n_neighbors=5))
+    # df_filled = missing_value_handler.handle_missing_values(df)
+
+    # # learn the medians once on the training data and reuse them on new batches
+
+    # missing_value_handler.set_strategy(FillMissingVaulues(method='median'))
+    # missing_value_handler.fit(df)
+    # for chunk in missing_value_handler.transform_chunks(pd.read_csv("./extracted_data/new_listings.csv", chunksize=100_000)):
+    #     ...
+
     
 
 
@@ -0,0 +1,167 @@
+# Importing Libraries
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable
+import numpy as np
+import scipy.sparse as sp
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ***************************************************************
+# ************ NumPy Arrays Backed by Shared Memory *************
+# ***************************************************************
+
+class SharedArray:
+    # Copies an array into a shared memory block once. Worker processes attach to the block
+    # by name and get a zero-copy view instead of receiving a pickled copy.
+    def __init__(self, array: np.ndarray):
+        """
+        Parameters:
+        array (np.ndarray): The array to share.
+        """
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.spec = (self._shm.name, array.shape, array.dtype.str)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)[...] = array
+        self.nbytes = array.nbytes
+
+    @staticmethod
+    def attach(spec):
+        """
+        Attaches to a shared array from its spec.
+
+        Parameters:
+        spec (tuple): The (name, shape, dtype) of the shared block.
+
+        Returns:
+        shm, array: The shared memory handle, which must stay referenced, and the array view.
+        """
+        name, shape, dtype = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    def release(self):
+        # Frees the shared block, call once every worker is done with it.
+        self._shm.close()
+        self._shm.unlink()
+
+class SharedMatrix:
+    # Shares a dense array or a scipy.sparse matrix. A sparse matrix is shared as its three
+    # CSR arrays (data, indices, indptr) and rebuilt around them in the worker, so it is never
+    # densified.
+    def __init__(self, matrix):
+        """
+        Parameters:
+        matrix (np.ndarray or scipy.sparse matrix): The matrix to share.
+        """
+        if sp.issparse(matrix):
+            matrix = sp.csr_matrix(matrix)
+            self._arrays = [SharedArray(matrix.data), SharedArray(matrix.indices), SharedArray(matrix.indptr)]
+            self.spec = ("csr", matrix.shape, [array.spec for array in self._arrays])
+        else:
+            self._arrays = [SharedArray(matrix)]
+            self.spec = ("dense", None, [self._arrays[0].spec])
+        self.nbytes = sum(array.nbytes for array in self._arrays)
+
+    @staticmethod
+    def attach(spec):
+        """
+        Attaches to a shared matrix from its spec.
+
+        Parameters:
+        spec (tuple): The (kind, shape, array specs) of the shared matrix.
+
+        Returns:
+        handles, matrix: The shared memory handles, which must stay referenced, and the matrix.
+        """
+        kind, shape, specs = spec
+        handles, arrays = zip(*(SharedArray.attach(array_spec) for array_spec in specs))
+        if kind == "csr":
+            return handles, sp.csr_matrix(arrays, shape=shape, copy=False)
+        return handles, arrays[0]
+
+    def release(self):
+        for array in self._arrays:
+            array.release()
+
+# ***************************************************************
+# ************ Worker Side of the Fold Evaluation ***************
+# ***************************************************************
+
+_worker = {}
+
+def _init_worker(X_spec, y_spec, submitted_at: float):
+    # Runs once per worker process: attaches to the shared data and records startup costs.
+    started_at = time.time()
+    X_handles, X = SharedMatrix.attach(X_spec)
+    y_shm, y = SharedArray.attach(y_spec)
+    _worker.update(X=X, y=y, handles=(X_handles, y_shm), startup_seconds=started_at - submitted_at,
+                   attach_seconds=time.time() - started_at)
+
+def _run_fold(evaluate: Callable, fold: int, train_index: np.ndarray, test_index: np.ndarray) -> dict:
+    X, y = _worker["X"], _worker["y"]
+    start = time.perf_counter()
+    result = evaluate(X[train_index], X[test_index], y[train_index], y[test_index])
+    return {"fold": fold, "result": result, "pid": os.getpid(), "seconds": time.perf_counter() - start,
+            "startup_seconds": _worker["startup_seconds"], "attach_seconds": _worker["attach_seconds"]}
+
+# ***************************************************************
+# ************ Parallel Evaluation of Cross-Validation Folds ****
+# ***************************************************************
+
+def run_folds(X, y: np.ndarray, folds: list, evaluate: Callable, n_jobs: int = None):
+    """
+    Evaluates every fold on a process pool. X and y are placed in shared memory once and
+    every worker attaches to them, only the fold positions are sent with each task.
+
+    Parameters:
+    X (np.ndarray or scipy.sparse matrix): The feature matrix, sparse matrices are passed to
+        evaluate as CSR row slices.
+    y (np.ndarray): The target values.
+    folds (list): (train_index, test_index) pairs of row positions.
+    evaluate (Callable): Module-level function called as evaluate(X_train, X_test, y_train, y_test).
+    n_jobs (int): Number of worker processes, defaults to the core count.
+
+    Returns:
+    results, report: The evaluate results ordered by fold, and a dict of timing measurements.
+    """
+    if not folds:
+        # no worker to start and nothing to share
+        return [], {"n_jobs": 0, "shared_bytes": 0, "transfer_seconds": 0.0, "worker_startup_seconds": [],
+                    "worker_attach_seconds": [], "fold_seconds": [], "wall_seconds": 0.0}
+
+    start = time.perf_counter()
+    shared_X, shared_y = SharedMatrix(X), SharedArray(y)
+    transfer_seconds = time.perf_counter() - start
+
+    n_jobs = min(n_jobs or os.cpu_count(), len(folds))
+    try:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(shared_X.spec, shared_y.spec, time.time())) as executor:
+            futures = [executor.submit(_run_fold, evaluate, fold, train_index, test_index)
+                       for fold, (train_index, test_index) in enumerate(folds)]
+            outcomes = [future.result() for future in futures]
+        wall_seconds = time.perf_counter() - start
+    finally:
+        shared_X.release()
+        shared_y.release()
+
+    workers = {outcome["pid"]: outcome for outcome in outcomes}
+    report = {
+        "n_jobs": n_jobs,
+        "shared_bytes": shared_X.nbytes + shared_y.nbytes,
+        "transfer_seconds": transfer_seconds,
+        "worker_startup_seconds": [worker["startup_seconds"] for worker in workers.values()],
+        "worker_attach_seconds": [worker["attach_seconds"] for worker in workers.values()],
+        "fold_seconds": [outcome["seconds"] for outcome in outcomes],
+        "wall_seconds": wall_seconds,
+    }
+    logging.info(f"Evaluated {len(folds)} folds on {n_jobs} workers in {wall_seconds:.3f}s "
+                 f"(copy to shared memory {transfer_seconds:.3f}s, "
+                 f"max worker startup {max(report['worker_startup_seconds']):.3f}s).")
+    return [outcome["result"] for outcome in outcomes], report
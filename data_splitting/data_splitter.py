@@ -1,7 +1,12 @@
 # Importing Libraries
 import logging
+import os
+from typing import Iterable
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+import scipy.sparse as sp
+from sklearn.model_selection import KFold, StratifiedKFold, TimeSeriesSplit, train_test_split
+from data_splitting.cross_validation import run_folds
 
 # Setup logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -26,6 +31,94 @@ class DataSplitting():
         """
         pass
 
+    def split_indices(self, df: pd.DataFrame, target_column: str):
+        """
+        Abstract method returning the row positions of the training and testing sets.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        train_index, test_index: Integer arrays of row positions.
+        """
+        pass
+
+    def required_columns(self):
+        """
+        Returns the columns of df, besides the target, the split is computed from.
+
+        Returns:
+        list: The column names, None when every column is used.
+        """
+        return []
+
+def index_dtype(n_rows: int) -> np.dtype:
+    # int32 row positions unless the frame is too long for them
+    return np.dtype(np.int32) if n_rows < np.iinfo(np.int32).max else np.dtype(np.int64)
+
+# ***************************************************************
+# ************** Lazy View over an Index-Only Split *************
+# ***************************************************************
+
+class LazySplit:
+    # Holds the row positions of a split together with a reference to the source frame.
+    # X_train, X_test, y_train and y_test are only materialized when accessed.
+    def __init__(self, df: pd.DataFrame, target_column: str, train_index: np.ndarray, test_index: np.ndarray):
+        """
+        Initializes the LazySplit.
+
+        Parameters:
+        df (pd.DataFrame): The DataFrame the positions refer to, it is not copied.
+        target_column (str): The name of the target column.
+        train_index (np.ndarray): Row positions of the training set.
+        test_index (np.ndarray): Row positions of the testing set.
+        """
+        self._df = df
+        self.target_column = target_column
+        self.train_index = train_index
+        self.test_index = test_index
+        self._features = [position for position, column in enumerate(df.columns) if column != target_column]
+        self._target = df.columns.get_loc(target_column)
+
+    @property
+    def X_train(self) -> pd.DataFrame:
+        return self._df.iloc[self.train_index, self._features]
+
+    @property
+    def X_test(self) -> pd.DataFrame:
+        return self._df.iloc[self.test_index, self._features]
+
+    @property
+    def y_train(self) -> pd.Series:
+        return self._df.iloc[self.train_index, self._target]
+
+    @property
+    def y_test(self) -> pd.Series:
+        return self._df.iloc[self.test_index, self._target]
+
+    def masks(self):
+        """
+        Returns the split as boolean masks over the rows of the frame.
+
+        Returns:
+        train_mask, test_mask: Boolean arrays.
+        """
+        train_mask = np.zeros(len(self._df), dtype=bool)
+        test_mask = np.zeros(len(self._df), dtype=bool)
+        train_mask[self.train_index] = True
+        test_mask[self.test_index] = True
+        return train_mask, test_mask
+
+    @property
+    def nbytes(self) -> int:
+        # memory held by the split itself, the frame is shared
+        return self.train_index.nbytes + self.test_index.nbytes
+
+    def __iter__(self):
+        # allows X_train, X_test, y_train, y_test = split
+        return iter((self.X_train, self.X_test, self.y_train, self.y_test))
+
 # ***************************************************************
 # ******************* Simple Train-Test Split *******************
 # ***************************************************************
@@ -65,6 +158,245 @@ class TrainTestSplit(DataSplitting):
         logging.info("Train-test split completed.")
         return X_train, X_test, y_train, y_test
 
+    def split_indices(self, df: pd.DataFrame, target_column: str):
+        """
+        Returns the row positions of the same split split_data produces.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        train_index, test_index: Integer arrays of row positions.
+        """
+        positions = np.arange(len(df), dtype=index_dtype(len(df)))
+        train_index, test_index = train_test_split(
+            positions, test_size=self.test_size, random_state=self.random_state
+        )
+        return train_index, test_index
+
+# ***************************************************************
+# ************ Deterministic Hash-Based Train-Test Split ********
+# ***************************************************************
+
+class HashTrainTestSplit(DataSplitting):
+    # This strategy assigns every row to train or test from a hash of a stable key, so the
+    # split is the same on every run and machine and can be computed one chunk at a time.
+    def __init__(self, key_column: str = None, test_size=0.2, hash_key: str = "0123456789123456"):
+        """
+        Initializes the HashTrainTestSplit with specific parameters.
+
+        Parameters:
+        key_column (str): The column identifying a row (e.g. a listing id). All columns are hashed when None.
+        test_size (float): The proportion of the rows assigned to the test split.
+        hash_key (str): 16 character key of the hash, change it to draw a different split.
+        """
+        if len(hash_key.encode("utf8")) != 16:
+            raise ValueError("hash_key must be 16 bytes long")
+        self.key_column = key_column
+        self.test_size = test_size
+        self.hash_key = hash_key
+
+    def required_columns(self):
+        return None if self.key_column is None else [self.key_column]
+
+    def test_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Returns a boolean array marking the rows that belong to the test split.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame or chunk.
+
+        Returns:
+        np.ndarray: True for test rows.
+        """
+        keys = df if self.key_column is None else df[self.key_column]
+        hashes = pd.util.hash_pandas_object(keys, index=False, hash_key=self.hash_key).to_numpy()
+        # the top 53 bits of the hash give a uniform number in [0, 1)
+        return (hashes >> np.uint64(11)) * (1.0 / 2 ** 53) < self.test_size
+
+    def split_data(self, df: pd.DataFrame, target_column: str):
+        """
+        Splits the data into training and testing sets from the hash of the key column.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        X_train, X_test, y_train, y_test: The training and testing splits for features and target.
+        """
+        logging.info("Performing hash-based train-test split.")
+        mask = self.test_mask(df)
+        features = df.columns.drop(target_column)
+
+        X_train, X_test = df.loc[~mask, features], df.loc[mask, features]
+        y_train, y_test = df.loc[~mask, target_column], df.loc[mask, target_column]
+
+        logging.info("Hash-based train-test split completed.")
+        return X_train, X_test, y_train, y_test
+
+    def split_indices(self, df: pd.DataFrame, target_column: str):
+        """
+        Returns the row positions of the training and testing sets.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        train_index, test_index: Integer arrays of row positions.
+        """
+        mask = self.test_mask(df)
+        dtype = index_dtype(len(df))
+        return np.flatnonzero(~mask).astype(dtype), np.flatnonzero(mask).astype(dtype)
+
+    def split_chunks(self, chunks: Iterable[pd.DataFrame], train_path: str, test_path: str) -> dict:
+        """
+        Splits a stream of chunks and appends each part to a csv file, so datasets larger
+        than memory can be split. Existing files at the output paths are replaced.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The chunks to split, e.g. from ZipDataset.stream.
+        train_path (str): The csv file receiving the training rows.
+        test_path (str): The csv file receiving the testing rows.
+
+        Returns:
+        dict: The number of rows written to each split.
+        """
+        logging.info("Performing hash-based train-test split on chunks.")
+        for path in (train_path, test_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        counts = {"train": 0, "test": 0}
+        for chunk in chunks:
+            mask = self.test_mask(chunk)
+            for name, path, part in (("train", train_path, chunk[~mask]), ("test", test_path, chunk[mask])):
+                part.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+                counts[name] += len(part)
+
+        logging.info(f"Hash-based split written: {counts['train']} train rows, {counts['test']} test rows.")
+        return counts
+
+# ***************************************************************
+# ************ Abstract Class for Cross-Validation Splits *******
+# ***************************************************************
+
+class CrossValidationSplitting(DataSplitting):
+    # Cross-validation strategies produce several train/test folds instead of a single split.
+    # Subclasses must implement the split_folds method.
+    def split_folds(self, df: pd.DataFrame, target_column: str) -> list:
+        """
+        Abstract method returning the row positions of every fold.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        list: (train_index, test_index) pairs of integer row positions.
+        """
+        pass
+
+    def split_indices(self, df: pd.DataFrame, target_column: str) -> list:
+        return self.split_folds(df, target_column)
+
+    def split_data(self, df: pd.DataFrame, target_column: str) -> list:
+        """
+        Splits the data into folds. Folds are returned as LazySplit views so the k training
+        sets are never held in memory at the same time.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        list: One LazySplit per fold.
+        """
+        return [LazySplit(df, target_column, train_index, test_index)
+                for train_index, test_index in self.split_folds(df, target_column)]
+
+    def _as_positions(self, folds, n_rows: int) -> list:
+        dtype = index_dtype(n_rows)
+        return [(train_index.astype(dtype), test_index.astype(dtype)) for train_index, test_index in folds]
+
+# ***************************************************************
+# ************************ K-Fold Split *************************
+# ***************************************************************
+
+class KFoldSplit(CrossValidationSplitting):
+    # This strategy implements plain k-fold cross-validation.
+    def __init__(self, n_splits=5, shuffle=True, random_state=42):
+        """
+        Parameters:
+        n_splits (int): The number of folds.
+        shuffle (bool): Shuffle the rows before cutting them into folds.
+        random_state (int): The seed used when shuffling.
+        """
+        self.n_splits = n_splits
+        self.shuffle = shuffle
+        self.random_state = random_state
+
+    def split_folds(self, df: pd.DataFrame, target_column: str) -> list:
+        logging.info(f"Performing {self.n_splits}-fold split.")
+        kfold = KFold(n_splits=self.n_splits, shuffle=self.shuffle,
+                      random_state=self.random_state if self.shuffle else None)
+        return self._as_positions(kfold.split(np.empty(len(df))), len(df))
+
+# ***************************************************************
+# ************ Stratified K-Fold on Target Quantiles ************
+# ***************************************************************
+
+class StratifiedQuantileKFold(CrossValidationSplitting):
+    # This strategy stratifies the folds on quantile bins of a continuous target such as price,
+    # so every fold sees the same price distribution.
+    def __init__(self, n_splits=5, n_bins=10, random_state=42):
+        """
+        Parameters:
+        n_splits (int): The number of folds.
+        n_bins (int): The number of target quantile bins to stratify on.
+        random_state (int): The seed used when shuffling.
+        """
+        self.n_splits = n_splits
+        self.n_bins = n_bins
+        self.random_state = random_state
+
+    def split_folds(self, df: pd.DataFrame, target_column: str) -> list:
+        logging.info(f"Performing {self.n_splits}-fold split stratified on {self.n_bins} quantiles of {target_column}.")
+        bins = pd.qcut(df[target_column], q=self.n_bins, labels=False, duplicates="drop").to_numpy()
+        skfold = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+        return self._as_positions(skfold.split(np.empty(len(df)), bins), len(df))
+
+# ***************************************************************
+# ******************** Time-Ordered Split ***********************
+# ***************************************************************
+
+class TimeOrderedSplit(CrossValidationSplitting):
+    # This strategy trains on earlier rows and tests on the rows that follow them, so no fold
+    # is evaluated on data older than what it was trained on.
+    def __init__(self, time_column: str, n_splits=5, gap=0):
+        """
+        Parameters:
+        time_column (str): The column the rows are ordered by (e.g. listing date).
+        n_splits (int): The number of folds.
+        gap (int): The number of rows left out between each training and testing set.
+        """
+        self.time_column = time_column
+        self.n_splits = n_splits
+        self.gap = gap
+
+    def required_columns(self):
+        return [self.time_column]
+
+    def split_folds(self, df: pd.DataFrame, target_column: str) -> list:
+        logging.info(f"Performing {self.n_splits}-fold time-ordered split on {self.time_column}.")
+        order = np.argsort(df[self.time_column].to_numpy(), kind="stable")
+        splitter = TimeSeriesSplit(n_splits=self.n_splits, gap=self.gap)
+        # the folds are cut on sorted positions and mapped back to the frame's row positions
+        folds = ((order[train], order[test]) for train, test in splitter.split(order))
+        return self._as_positions(folds, len(df))
+
 # **********************************************************
 # ***************** Class for Data Splitting ***************
 # **********************************************************
@@ -90,20 +422,131 @@ class DataSplitter:
         logging.info("Switching data splitting strategy.")
         self._strategy = strategy
 
-    def split(self, df: pd.DataFrame, target_column: str):
+    def split(self, df: pd.DataFrame, target_column: str, lazy: bool = False):
         """
         Executes the data splitting using the current strategy.
 
         Parameters:
         df (pd.DataFrame): The input DataFrame to be split.
         target_column (str): The name of the target column.
+        lazy (bool): Return a LazySplit holding only row positions instead of materialized copies.
 
         Returns:
         X_train, X_test, y_train, y_test: The training and testing splits for features and target.
         """
         logging.info("Splitting data using the selected strategy.")
+        if lazy:
+            if isinstance(self._strategy, CrossValidationSplitting):
+                return self._strategy.split_data(df, target_column)
+            train_index, test_index = self._strategy.split_indices(df, target_column)
+            return LazySplit(df, target_column, train_index, test_index)
         return self._strategy.split_data(df, target_column)
 
+    def split_indices(self, df: pd.DataFrame, target_column: str):
+        """
+        Returns the row positions of the split produced by the current strategy.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+
+        Returns:
+        train_index, test_index: Integer arrays of row positions.
+        """
+        return self._strategy.split_indices(df, target_column)
+
+    def split_matrix(self, X, y, df: pd.DataFrame = None, target_column: str = None):
+        """
+        Splits an already encoded feature matrix, e.g. the CSR output of a FeaturePipeline.
+        Rows are selected from the positions of split_indices, sparse matrices stay sparse.
+
+        Parameters:
+        X (np.ndarray or scipy.sparse matrix): The feature matrix, one row per row of df.
+        y (np.ndarray or pd.Series): The target values.
+        df (pd.DataFrame): The frame X was built from. Required by strategies that split on
+            other columns (HashTrainTestSplit, TimeOrderedSplit); the others default to a
+            frame holding only y.
+        target_column (str): The name of the target column in df.
+
+        Returns:
+        X_train, X_test, y_train, y_test: The row slices of X and y, or one such tuple per
+            fold for cross-validation strategies.
+        """
+        df, target_column = self._index_frame(y, df, target_column)
+        X = X.tocsr() if sp.issparse(X) else np.asarray(X)
+        y = np.asarray(y)
+        if X.shape[0] != len(df):
+            raise ValueError(f"X has {X.shape[0]} rows but the frame has {len(df)}")
+
+        logging.info("Splitting feature matrix using the selected strategy.")
+        folds = self._strategy.split_indices(df, target_column)
+        if not isinstance(self._strategy, CrossValidationSplitting):
+            train_index, test_index = folds
+            return X[train_index], X[test_index], y[train_index], y[test_index]
+        return [(X[train_index], X[test_index], y[train_index], y[test_index]) for train_index, test_index in folds]
+
+    def _index_frame(self, y, df: pd.DataFrame, target_column: str):
+        if df is None:
+            required = self._strategy.required_columns()
+            if required is None or required:
+                raise ValueError(f"{type(self._strategy).__name__} splits on {required or 'every column'}, "
+                                 "pass the frame X was built from as df")
+            return pd.DataFrame({"target": np.asarray(y)}), "target"
+        return df, target_column
+
+    def cross_validate_matrix(self, X, y, evaluate, df: pd.DataFrame = None, target_column: str = None,
+                              n_jobs: int = None):
+        """
+        Like cross_validate, for an already encoded feature matrix. Sparse matrices are shared
+        with the workers as CSR arrays and are never densified.
+
+        Parameters:
+        X (np.ndarray or scipy.sparse matrix): The feature matrix, one row per row of df.
+        y (np.ndarray or pd.Series): The target values.
+        evaluate (Callable): Module-level function called as evaluate(X_train, X_test, y_train, y_test).
+        df (pd.DataFrame): The frame X was built from, see split_matrix.
+        target_column (str): The name of the target column in df.
+        n_jobs (int): Number of worker processes, defaults to the core count.
+
+        Returns:
+        results, report: The evaluate results ordered by fold, and a dict of timing measurements.
+        """
+        df, target_column = self._index_frame(y, df, target_column)
+        folds = self._strategy.split_indices(df, target_column)
+        if not isinstance(self._strategy, CrossValidationSplitting):
+            folds = [folds]
+
+        logging.info("Cross-validating feature matrix using the selected strategy.")
+        return run_folds(X, np.asarray(y, dtype=np.float64), folds, evaluate, n_jobs)
+
+    def cross_validate(self, df: pd.DataFrame, target_column: str, evaluate, n_jobs: int = None):
+        """
+        Evaluates every fold of a cross-validation strategy on a process pool. The numeric
+        features and the target are shared with the workers through shared memory.
+
+        Parameters:
+        df (pd.DataFrame): The input DataFrame to be split.
+        target_column (str): The name of the target column.
+        evaluate (Callable): Module-level function called as evaluate(X_train, X_test, y_train, y_test)
+            with NumPy arrays, its return value is collected per fold.
+        n_jobs (int): Number of worker processes, defaults to the core count.
+
+        Returns:
+        results, report: The evaluate results ordered by fold, and a dict of timing measurements.
+        """
+        folds = self._strategy.split_indices(df, target_column)
+        if not isinstance(self._strategy, CrossValidationSplitting):
+            folds = [folds]
+
+        features = df.drop(columns=[target_column]).select_dtypes(include=["number", "bool"])
+        skipped = df.columns.difference(features.columns).drop(target_column)
+        if len(skipped):
+            logging.warning(f"Non-numeric columns {list(skipped)} are not passed to the folds.")
+
+        logging.info("Cross-validating using the selected strategy.")
+        return run_folds(features.to_numpy(dtype=np.float64), df[target_column].to_numpy(dtype=np.float64),
+                         folds, evaluate, n_jobs)
+
 
 # Example usage
 if __name__ == "__main__":
@@ -114,4 +557,17 @@ if __name__ == "__main__":
     # data_splitter = DataSplitter(TrainTestSplit(test_size=0.2, random_state=42))
     # X_train, X_test, y_train, y_test = data_splitter.split(df, target_column='price')
 
+    # #Keep only int32 row positions and materialize the sets when they are used
+    # split = data_splitter.split(df, target_column='price', lazy=True)
+    # model.fit(split.X_train, split.y_train)
+
+    # #Evaluate 5 price-stratified folds in parallel, evaluate must be a module-level function
+    # data_splitter.set_strategy(StratifiedQuantileKFold(n_splits=5))
+    # scores, report = data_splitter.cross_validate(df, 'price', evaluate, n_jobs=4)
+
+    # #Split a dataset larger than memory chunk by chunk, the same rows land in test on every run
+    # splitter = HashTrainTestSplit(key_column='listing_id', test_size=0.2)
+    # chunks = ZipDataset(chunksize=100_000).stream('houseprice.zip')
+    # splitter.split_chunks(chunks, 'train.csv', 'test.csv')
+
     pass
@@ -3,6 +3,7 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+from exporarative_data_analysis.large_data import plot_density, stratified_sample
 
 #**************************************************************************
 #***************** Abstract Class for 2 feature ananlysis *****************
@@ -26,7 +27,28 @@ class FeaturesAnalysis():
 #*****************************************************************************
 
 class NumericalVsNumerical (FeaturesAnalysis):
-    # this strategy analyzes numerical features by plotting their distribution
+    # this strategy analyzes numerical features by plotting their distribution. Above max_points
+    # rows a scatter plot takes minutes and overplots, so it switches to a 2D histogram
+    # ('hist2d') or to a scatter plot of a stratified sample ('sample'); both take about the
+    # same time whatever the number of rows.
+    def __init__(self, max_points: int = 100000, large_mode: str = 'hist2d', gridsize: int = 100,
+                 sample_size: int = 20000, random_state: int = 42):
+        """
+        Parameters:
+        max_points (int): the row count above which the large-data mode is used
+        large_mode (str): 'hist2d' or 'sample'
+        gridsize (int): the number of bins per axis of the 2D histogram and of the sampling strata
+        sample_size (int): the number of rows plotted in 'sample' mode
+        random_state (int): seed of the sampling
+        """
+        if large_mode not in ('hist2d', 'sample'):
+            raise ValueError(f"Unsupported large data mode: {large_mode}")
+        self.max_points = max_points
+        self.large_mode = large_mode
+        self.gridsize = gridsize
+        self.sample_size = sample_size
+        self.random_state = random_state
+
     def analyze(self, df: pd.DataFrame, feature1:str, feature2:str):
         """ Plots scatter plots of any numerical features passed as arguments to be analyzed
         Parameters:
@@ -34,8 +56,16 @@ class NumericalVsNumerical (FeaturesAnalysis):
         Return:
         None: Plots scatter plot for the 2 features
         """
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(x = df[feature1], y = df[feature2])
+        fig, ax = plt.subplots(figsize=(10, 6))
+        if len(df) <= self.max_points:
+            sns.scatterplot(x = df[feature1], y = df[feature2], ax=ax)
+        elif self.large_mode == 'hist2d':
+            plot_density(ax, df[feature1].to_numpy(dtype=float), df[feature2].to_numpy(dtype=float), self.gridsize)
+        else:
+            # strata are the cells of a 2D grid, so sparse regions and outliers stay in the sample
+            sample = stratified_sample(df[[feature1, feature2]], self.sample_size, [feature1, feature2],
+                                       self.gridsize, self.random_state)
+            sns.scatterplot(x = sample[feature1], y = sample[feature2], ax=ax, s=8, alpha=0.5)
         plt.title(f'Distribution of {feature1}  VS {feature2}')
         plt.xlabel(feature1)
         plt.ylabel(feature2)
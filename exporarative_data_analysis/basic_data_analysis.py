@@ -1,5 +1,8 @@
 # import libraries and packages
+import os
+from typing import Iterable
 import pandas as pd
+from exporarative_data_analysis.profiling import DataProfile
 
 #***********************************************************
 #********abstract  Class for Basic Data Inspection**********
@@ -62,6 +65,60 @@ class Summary_Statistics_Analysis(Basic_Data_Analysis):
         print('\n Summary Statistics (Categorical Features):')
         print(df.describe(include='object'))
 
+#***********************************************************************************
+# ************** Concrete Strategy for a Single-Pass Data Profile ******************
+#-**********************************************************************************
+
+class Profile_Analysis(Basic_Data_Analysis):
+    # This Strategy computes dtypes, null counts, min/max/mean/std, quantiles, cardinality and
+    # top values of every column in one pass and returns them instead of printing them.
+    # With a state_path the profile is incremental: the stored profile is updated with the
+    # new batch only and saved again, so each run costs as much as the batch
+    def __init__(self, quantiles=(0.25, 0.5, 0.75), top_k: int = 5, chunksize: int = None, n_jobs: int = None,
+                 state_path: str = None):
+        '''
+            Parameters:
+                quantiles (tuple): the quantile levels reported for numeric columns (t-digest estimates)
+                top_k (int): the number of most frequent values reported per column
+                chunksize (int): profile a DataFrame this many rows at a time to bound memory
+                n_jobs (int): number of threads working on the columns of a chunk
+                state_path (str): JSON file holding the profile of the batches seen so far
+        '''
+        self.quantiles = quantiles
+        self.top_k = top_k
+        self.chunksize = chunksize
+        self.n_jobs = n_jobs
+        self.state_path = state_path
+        self.profile_ = None
+
+    def basic_analysis(self, df):
+        '''
+            Profiles every column of the data
+            Parameters:
+                df(pd.Dataframe or Iterable[pd.DataFrame]): the dataframe, or chunks of it e.g. from ZipDataset.stream.
+                    With a state_path only the new batch is passed
+
+            Returns:
+                dict: the profile, see DataProfile.to_dict. The DataProfile itself is kept in profile_
+        '''
+        if self.state_path is not None and os.path.exists(self.state_path):
+            profile = DataProfile.load(self.state_path, n_jobs=self.n_jobs)
+        else:
+            profile = DataProfile(n_jobs=self.n_jobs)
+        for chunk in self._chunks(df):
+            profile.update(chunk)
+        if self.state_path is not None:
+            profile.save(self.state_path)
+        self.profile_ = profile
+        return profile.to_dict(quantiles=self.quantiles, top_k=self.top_k)
+
+    def _chunks(self, df) -> Iterable[pd.DataFrame]:
+        if not isinstance(df, pd.DataFrame):
+            return df
+        if self.chunksize is None:
+            return [df]
+        return (df.iloc[start:start + self.chunksize] for start in range(0, len(df), self.chunksize))
+
 #************************************************************************************
 # *********** Context Class that uses a Basic_Data_Analysis *************************
 #************************************************************************************-
@@ -100,9 +157,9 @@ class Data_Analyzer:
         df (pd.DataFrame): the dataframe to be inspected
 
         returns:
-        None: Executes the strategy's inspection method 
+        The result of the strategy's inspection method, e.g. the profile of Profile_Analysis
         '''
-        self._strategy.basic_analysis(df)
+        return self._strategy.basic_analysis(df)
 
 # Example Usage
 if __name__ == "__main__":
@@ -128,5 +185,13 @@ if __name__ == "__main__":
     analyzer.set_strategy(Summary_Statistics_Analysis())
     analyzer.execute_analysis(df)
 
+    # Profile every column in one pass and keep the result
+    analyzer.set_strategy(Profile_Analysis(top_k=3))
+    profile = analyzer.execute_analysis(df)
+
+    # Update a stored profile with today's batch only
+    # analyzer.set_strategy(Profile_Analysis(state_path='./profiles/listings.json'))
+    # profile = analyzer.execute_analysis(pd.read_csv('./extracted_data/new_listings.csv'))
+
 
     #pass
\ No newline at end of file
@@ -0,0 +1,193 @@
+# import libraries
+import html
+import multiprocessing
+import os
+import re
+import time
+import warnings
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+from pipeline.shared import SharedFrame
+
+#**************************************************************************
+#***************** Worker Side of the Batch Renderer **********************
+#**************************************************************************
+
+_worker = {}
+
+def _init_worker(frame_spec):
+    # Runs once per worker process: switches to the headless Agg backend and attaches to the data
+    plt.switch_backend('Agg')
+    matplotlib.rcParams['figure.max_open_warning'] = 0
+    handles, df = SharedFrame.attach(frame_spec)
+    _worker.update(df=df, handles=handles)
+
+def _run_strategy(strategy, df: pd.DataFrame, features):
+    # calls analyze with the feature arguments of the strategy's analyzer
+    if features is None:
+        strategy.analyze(df)
+    elif isinstance(features, str):
+        strategy.analyze(df, features)
+    else:
+        strategy.analyze(df, *features)
+
+def _render_job(position: int, strategy, features, output_dir: str, formats: tuple, dpi: int) -> dict:
+    '''
+    Runs one plotting strategy and saves every figure it opened.
+
+    Returns:
+        dict: the job position, the files written, the render time and the error if any
+    '''
+    start = time.perf_counter()
+    name = job_name(position, strategy, features)
+    files, error = [], None
+    before = set(plt.get_fignums())
+    try:
+        with warnings.catch_warnings():
+            # plt.show() is a no-op on Agg and warns about it
+            warnings.filterwarnings('ignore', message='.*non-interactive.*')
+            _run_strategy(strategy, _worker['df'], features)
+        figures = [number for number in plt.get_fignums() if number not in before]
+        for count, number in enumerate(figures, start=1):
+            figure = plt.figure(number)
+            suffix = f'_{count}' if len(figures) > 1 else ''
+            for file_format in formats:
+                file_name = f'{name}{suffix}.{file_format}'
+                figure.savefig(os.path.join(output_dir, file_name), format=file_format, dpi=dpi, bbox_inches='tight')
+                files.append(file_name)
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+    finally:
+        # every figure is closed, pyplot keeps a reference to open figures forever
+        plt.close('all')
+    return {'position': position, 'name': name, 'files': files, 'error': error,
+            'seconds': time.perf_counter() - start}
+
+def job_name(position: int, strategy, features) -> str:
+    # file name stem of a job, e.g. 003_NumericalVsNumerical_area_price
+    parts = [] if features is None else [features] if isinstance(features, str) else list(features)
+    stem = '_'.join([f'{position:03d}', type(strategy).__name__] + [str(part) for part in parts])
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', stem)
+
+#**************************************************************************
+#***************** Batch Renderer for EDA Plots ***************************
+#**************************************************************************
+
+class BatchRenderer:
+    # Renders a list of (strategy, features) plotting jobs headlessly on a process pool and
+    # writes the figures and an index.html to an output directory. Jobs use the existing
+    # FeatureAnalysis, FeaturesAnalysis and MultiFeatureAnalysis strategies unchanged: the
+    # workers run on the Agg backend, where plt.show() does not block, and every figure a
+    # job opens is saved and closed. The data is placed in shared memory once.
+    def __init__(self, output_dir: str, formats=('png',), dpi: int = 100, n_jobs: int = None,
+                 time_budget: float = None):
+        '''
+        Parameters:
+            output_dir (str): the directory receiving the images and index.html
+            formats (tuple): image formats written for every figure, 'png' and/or 'svg'
+            dpi (int): resolution of the raster images
+            n_jobs (int): number of worker processes, defaults to the core count
+            time_budget (float): seconds after which the workers are stopped and the jobs that have
+                not finished are reported as skipped
+        '''
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.dpi = dpi
+        self.n_jobs = n_jobs
+        self.time_budget = time_budget
+
+    def render(self, df: pd.DataFrame, jobs: list) -> list:
+        '''
+        Renders every job and writes index.html.
+
+        Parameters:
+            df (pd.DataFrame): the data all jobs plot
+            jobs (list): (strategy, features) pairs; features is a column name for FeatureAnalysis,
+                a pair of names for FeaturesAnalysis and None for MultiFeatureAnalysis
+
+        Returns:
+            list: one dict per job with its name, files, seconds and error, in job order
+        '''
+        os.makedirs(self.output_dir, exist_ok=True)
+        start = time.perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        results = {}
+
+        shared = SharedFrame(df)
+        try:
+            # leaving the block terminates the workers, including jobs still running at the deadline
+            with multiprocessing.Pool(self.n_jobs or os.cpu_count(), initializer=_init_worker,
+                                      initargs=(shared.spec,)) as pool:
+                pending = [pool.apply_async(_render_job, (position, strategy, features, self.output_dir,
+                                                          self.formats, self.dpi))
+                           for position, (strategy, features) in enumerate(jobs)]
+                for async_result in pending:
+                    timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+                    try:
+                        result = async_result.get(timeout)
+                    except multiprocessing.TimeoutError:
+                        break
+                    results[result['position']] = result
+                for async_result in pending:
+                    if async_result.ready():
+                        result = async_result.get()
+                        results[result['position']] = result
+        finally:
+            shared.release()
+
+        for position, (strategy, features) in enumerate(jobs):
+            if position not in results:
+                results[position] = {'position': position, 'name': job_name(position, strategy, features),
+                                     'files': [], 'error': 'skipped: time budget exceeded', 'seconds': 0.0}
+        results = [results[position] for position in range(len(jobs))]
+        self.write_index(results, time.perf_counter() - start)
+        return results
+
+    def write_index(self, results: list, wall_seconds: float):
+        '''
+        Writes index.html listing every job with its images, render time and error.
+
+        Parameters:
+            results (list): the job results returned by render
+            wall_seconds (float): the total render time
+        '''
+        failed = sum(result['error'] is not None for result in results)
+        sections = []
+        for result in results:
+            images = ''.join(f'<img src="{html.escape(file_name)}" alt="{html.escape(file_name)}">'
+                             for file_name in result['files'] if not file_name.endswith('.svg'))
+            if not images:
+                images = ''.join(f'<img src="{html.escape(file_name)}" alt="{html.escape(file_name)}">'
+                                 for file_name in result['files'])
+            error = f'<p class="error">{html.escape(result["error"])}</p>' if result['error'] else ''
+            sections.append(f'<section><h2>{html.escape(result["name"])}</h2>'
+                            f'<p>{result["seconds"]:.2f}s</p>{error}{images}</section>')
+        page = ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>EDA Report</title>'
+                '<style>body{font-family:sans-serif} img{max-width:100%} .error{color:#b00}</style></head>'
+                f'<body><h1>EDA Report</h1><p>{len(results)} plots, {failed} failed or skipped, '
+                f'rendered in {wall_seconds:.1f}s</p>{"".join(sections)}</body></html>')
+        with open(os.path.join(self.output_dir, 'index.html'), 'w') as file:
+            file.write(page)
+
+
+#Example Usage
+
+if __name__ == "__main__":
+
+    # from exporarative_data_analysis.features_analysis import NumericalFeature, CategoricalFeature
+    # from exporarative_data_analysis._2features_analysis import NumericalVsNumerical, CategoricalVsNumerical
+    # from exporarative_data_analysis.multi_features_analysis import MultiFeatureAnalyzer
+
+    # df = pd.read_csv('./extracted_data/Housing.csv')
+    # numerical_features = df.select_dtypes(include='number').columns.tolist()
+    # categorical_features = df.select_dtypes(exclude='number').columns.tolist()
+
+    # jobs = [(NumericalFeature(), feature) for feature in numerical_features]
+    # jobs += [(CategoricalFeature(), feature) for feature in categorical_features]
+    # jobs += [(NumericalVsNumerical(), ('area', 'price')), (CategoricalVsNumerical(), ('furnishingstatus', 'price'))]
+    # jobs += [(MultiFeatureAnalyzer(), None)]
+
+    # renderer = BatchRenderer('./eda_report', formats=('png', 'svg'), n_jobs=4, time_budget=600)
+    # results = renderer.render(df, jobs)
+    pass
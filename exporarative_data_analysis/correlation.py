@@ -0,0 +1,285 @@
+# import libraries
+import hashlib
+import logging
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from load_dataset.cache import DatasetCache
+from pipeline.keys import stage_key, strategy_params
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    '''
+    Hashes the content, column names and dtypes of a DataFrame. Numeric columns are hashed
+    as their raw bytes and Arrow-backed columns (the str dtype) as their Arrow buffers, so
+    no per-row hashing happens; other columns go through pd.util.hash_pandas_object.
+    The digest is remembered per frame object: a repeated call on the same frame only checks
+    its shape, dtypes and a sample of rows, so in-place edits outside the sample are not seen.
+
+    Parameters:
+        df (pd.DataFrame): the data
+
+    Returns:
+        str: hex digest identifying the data
+    '''
+    check = _frame_check(df)
+    known = _fingerprints.get(id(df))
+    if known is not None and known[0]() is df and known[1] == check:
+        return known[2]
+    digest = _hash_frame(df)
+    key = id(df)
+    _fingerprints[key] = (weakref.ref(df, lambda _: _fingerprints.pop(key, None)), check, digest)
+    return digest
+
+# digests of the frames hashed so far: id(df) -> (weak reference, cheap check, digest); an
+# entry is dropped when its frame is garbage collected
+_fingerprints = {}
+_SAMPLE_ROWS = 32
+
+def _frame_check(df: pd.DataFrame) -> tuple:
+    # shape, column names and dtypes and the hash of a few evenly spaced rows
+    positions = np.unique(np.linspace(0, len(df) - 1, _SAMPLE_ROWS).astype(np.int64)) if len(df) else []
+    sample = pd.util.hash_pandas_object(df.iloc[positions]).to_numpy().tobytes()
+    return df.shape, repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]), sample
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+            digest.update(np.ascontiguousarray(series.to_numpy()).view(np.uint8))
+        elif hasattr(series.array, '__arrow_array__') and not isinstance(series.dtype, pd.CategoricalDtype):
+            for chunk in pa.chunked_array(pa.array(series.array)).chunks:
+                # the buffers of a slice cover its parent, the offset and length select the rows
+                digest.update(repr((chunk.offset, len(chunk))).encode())
+                for buffer in chunk.buffers():
+                    if buffer is not None:
+                        digest.update(buffer)
+        else:
+            digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+#**************************************************************************
+#***************** Abstract Class for Correlation Methods *****************
+#**************************************************************************
+
+class CorrelationMethod():
+    def select(self, df: pd.DataFrame) -> pd.DataFrame:
+        '''
+        Abstract method selecting and encoding the columns the method applies to
+
+        Parameters:
+            df (pd.DataFrame): the data
+
+        Returns:
+            pd.DataFrame: the columns passed to compute
+        '''
+        pass
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        '''
+        Abstract method computing the correlation matrix of the selected columns
+
+        Parameters:
+            data (pd.DataFrame): the output of select
+
+        Returns:
+            pd.DataFrame: square matrix indexed by column name on both axes
+        '''
+        pass
+
+#**************************************************************************
+#***************** Pearson Correlation ************************************
+#**************************************************************************
+
+class PearsonCorrelation(CorrelationMethod):
+    # Pearson correlation of the numeric columns and of the two-valued columns such as the
+    # yes/no amenities, encoded as 1.0 / 0.0. The columns are centered once into a float32
+    # matrix Z and the whole correlation matrix is the single BLAS product Z.T @ Z, scaled by
+    # the standard deviations read off its diagonal.
+    # Missing values are set to the column mean (zero after centering) instead of dropping
+    # rows pair by pair as df.corr() does; without missing values both agree to float32 precision.
+    def select(self, df: pd.DataFrame) -> pd.DataFrame:
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if _is_numeric(series):
+                columns[column] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                continue
+            values = list(series.dropna().unique())
+            if len(values) == 2:
+                positive = 'yes' if 'yes' in values else sorted(values, key=str)[1]
+                encoded = (series == positive).to_numpy(dtype=np.float64)
+                encoded[series.isna().to_numpy()] = np.nan
+                columns[column] = encoded
+        return pd.DataFrame(columns, index=df.index)
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        rows, size = data.shape
+        # column-major, every column is centered straight into its float32 slice
+        centered = np.empty((rows, size), dtype=np.float32, order='F')
+        observed = np.full(size, rows, dtype=np.int64)
+        for position in range(size):
+            values = data.iloc[:, position].to_numpy(dtype=np.float64)
+            mean = values.mean() if rows else 0.0
+            if np.isnan(mean):
+                # only columns with missing values pay for a mask
+                missing = np.isnan(values)
+                observed[position] = rows - missing.sum()
+                mean = values[~missing].mean() if observed[position] else 0.0
+                np.subtract(values, mean, out=centered[:, position], casting='unsafe')
+                centered[missing, position] = 0.0
+            else:
+                np.subtract(values, mean, out=centered[:, position], casting='unsafe')
+        matrix = (centered.T @ centered).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # sample standard deviation of every column over its observed values
+            std = np.sqrt(np.diag(matrix) / (observed - 1))
+            matrix /= np.outer(std, std) * (rows - 1)
+        constant = ~(std > 0)
+        np.clip(matrix, -1.0, 1.0, out=matrix)
+        np.fill_diagonal(matrix, 1.0)
+        # as in df.corr(), constant columns have no correlation
+        matrix[constant, :] = np.nan
+        matrix[:, constant] = np.nan
+        return pd.DataFrame(matrix, index=data.columns, columns=data.columns)
+
+#**************************************************************************
+#***************** Spearman Correlation ***********************************
+#**************************************************************************
+
+class SpearmanCorrelation(PearsonCorrelation):
+    # Spearman correlation: every column is ranked once (ties get their average rank) and the
+    # Pearson matrix product runs on the ranks.
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        return super().compute(data.rank())
+
+#**************************************************************************
+#***************** Cramer's V for Categorical Columns *********************
+#**************************************************************************
+
+class CramersV(CorrelationMethod):
+    # Cramer's V association between categorical columns such as the yes/no amenities and
+    # furnishingstatus: sqrt(chi2 / n / (min(rows, columns) - 1)) of their contingency table,
+    # built with a single bincount of the combined category codes per pair.
+    def __init__(self, max_categories: int = 20):
+        '''
+        Parameters:
+            max_categories (int): non-numeric columns with more distinct values are skipped
+        '''
+        self.max_categories = max_categories
+
+    def select(self, df: pd.DataFrame) -> pd.DataFrame:
+        columns = [column for column in df.columns
+                   if not _is_numeric(df[column]) and df[column].nunique() <= self.max_categories]
+        return df[columns]
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        codes = []
+        for column in data.columns:
+            column_codes, uniques = pd.factorize(data[column])
+            codes.append((column_codes, len(uniques)))
+        size = len(codes)
+        matrix = np.eye(size)
+        for i in range(size):
+            for j in range(i + 1, size):
+                matrix[i, j] = matrix[j, i] = self._association(*codes[i], *codes[j])
+        return pd.DataFrame(matrix, index=data.columns, columns=data.columns)
+
+    @staticmethod
+    def _association(first: np.ndarray, first_levels: int, second: np.ndarray, second_levels: int) -> float:
+        valid = (first >= 0) & (second >= 0)
+        table = np.bincount(first[valid] * second_levels + second[valid],
+                            minlength=first_levels * second_levels).reshape(first_levels, second_levels)
+        # levels only seen next to a missing value in the other column are dropped
+        table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+        n = table.sum()
+        if n == 0 or min(table.shape) < 2:
+            return np.nan
+        expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+        chi2 = ((table - expected) ** 2 / expected).sum()
+        return float(np.sqrt(chi2 / n / (min(table.shape) - 1)))
+
+#**************************************************************************
+#***************** Correlation Analyzer with Result Caching ***************
+#**************************************************************************
+
+# results of this process, keyed by dataset fingerprint and method; the oldest are dropped
+_results = OrderedDict()
+_MAX_RESULTS = 32
+
+class CorrelationAnalyzer:
+    # this class allows you to switch between correlation methods. Results are cached per
+    # dataset fingerprint and method, in memory and optionally in a DatasetCache on disk, so a
+    # repeated heatmap of the same data, e.g. on a notebook rerun, is not recomputed.
+    def __init__(self, strategy: CorrelationMethod, cache: DatasetCache = None):
+        '''
+        Parameters:
+            strategy (CorrelationMethod): the correlation method
+            cache (DatasetCache): optional on-disk cache, keeps results across sessions
+        '''
+        self._strategy = strategy
+        self.cache = cache
+
+    def set_strategy(self, strategy: CorrelationMethod):
+        '''
+        Sets a new correlation method
+
+        Parameters:
+            strategy (CorrelationMethod): the new correlation method
+        '''
+        self._strategy = strategy
+
+    def correlation(self, df: pd.DataFrame) -> pd.DataFrame:
+        '''
+        Returns the correlation matrix of the columns the method selects from df
+
+        Parameters:
+            df (pd.DataFrame): the data
+
+        Returns:
+            pd.DataFrame: square matrix indexed by column name on both axes
+        '''
+        key = stage_key(dataset_fingerprint(df), type(self._strategy).__name__, strategy_params(self._strategy))
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key].copy()
+        if self.cache is not None and key in self.cache:
+            matrix = self.cache.get(key)
+            matrix.index = matrix.columns
+        else:
+            logging.info(f"Computing {type(self._strategy).__name__} correlations.")
+            matrix = self._strategy.compute(self._strategy.select(df))
+            if self.cache is not None:
+                # the columns are stored as strings, the index is rebuilt from them on read
+                self.cache.put(key, matrix.set_axis([str(column) for column in matrix.columns], axis=1))
+        _results[key] = matrix
+        if len(_results) > _MAX_RESULTS:
+            _results.popitem(last=False)
+        return matrix.copy()
+
+
+#Example Usage
+
+if __name__ == "__main__":
+
+    # df = pd.read_csv('./extracted_data/Housing.csv')
+
+    # analyzer = CorrelationAnalyzer(PearsonCorrelation(), cache=DatasetCache('.correlation_cache'))
+    # print(analyzer.correlation(df))
+
+    # analyzer.set_strategy(SpearmanCorrelation())
+    # print(analyzer.correlation(df))
+
+    # analyzer.set_strategy(CramersV())
+    # print(analyzer.correlation(df))
+    pass
@@ -0,0 +1,159 @@
+# import libraries
+import numpy as np
+import pandas as pd
+from matplotlib.colors import LogNorm
+
+#**************************************************************************
+#***************** 2D Binning of Large Numeric Data ***********************
+#**************************************************************************
+
+def bin_index(values: np.ndarray, gridsize: int):
+    '''
+    Assigns every value to one of gridsize equal-width bins over the range of the values.
+    Integer columns spanning fewer than gridsize values (counts, ratings, flags) get one bin
+    per value instead, and a constant column a single bin. Bin indexes are computed
+    arithmetically, one vectorized pass over the values.
+
+    Parameters:
+        values (np.ndarray): the values, missing values allowed
+        gridsize (int): the number of bins
+
+    Returns:
+        index, edges: the bin of every value (-1 where it is missing) and the bin edges
+    '''
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    index = np.full(len(values), -1, dtype=np.int64)
+    if not finite.any():
+        return index, np.linspace(0.0, 1.0, gridsize + 1)
+    observed = values[finite]
+    low, high = observed.min(), observed.max()
+    if high == low:
+        # a constant column, integer or not, gets one bin of width 1 around its value
+        low, high, gridsize = low - 0.5, high + 0.5, 1
+    elif high - low < gridsize and (observed == np.round(observed)).all():
+        low, high = low - 0.5, high + 0.5
+        gridsize = int(high - low)
+    index[finite] = np.minimum(((observed - low) * (gridsize / (high - low))).astype(np.int64), gridsize - 1)
+    return index, np.linspace(low, high, gridsize + 1)
+
+def grid_counts(xindex: np.ndarray, yindex: np.ndarray, xbins: int, ybins: int) -> np.ndarray:
+    # counts per cell of the bin indexes of two columns, points missing either are skipped
+    valid = (xindex >= 0) & (yindex >= 0)
+    codes = xindex[valid] * ybins + yindex[valid]
+    return np.bincount(codes, minlength=xbins * ybins).reshape(xbins, ybins)
+
+def histogram2d(x: np.ndarray, y: np.ndarray, gridsize: int = 100):
+    '''
+    Counts the points per cell of a gridsize x gridsize grid (fewer bins along integer axes,
+    see bin_index), like np.histogram2d with uniform bins but with arithmetic binning and a
+    single bincount.
+
+    Parameters:
+        x (np.ndarray), y (np.ndarray): the coordinates, missing values are skipped
+        gridsize (int): the number of bins per axis
+
+    Returns:
+        counts, xedges, yedges: counts[i, j] is the number of points in x bin i and y bin j
+    '''
+    xindex, xedges = bin_index(x, gridsize)
+    yindex, yedges = bin_index(y, gridsize)
+    return grid_counts(xindex, yindex, len(xedges) - 1, len(yedges) - 1), xedges, yedges
+
+def plot_density(ax, x: np.ndarray, y: np.ndarray, gridsize: int = 100, colorbar: bool = True):
+    '''
+    Draws the 2D histogram of the points on ax.
+
+    Parameters:
+        ax (matplotlib.axes.Axes): the axes to draw on
+        x (np.ndarray), y (np.ndarray): the coordinates
+        gridsize (int): the number of bins per axis
+        colorbar (bool): whether a colorbar is added next to the axes
+    '''
+    return draw_counts(ax, *histogram2d(x, y, gridsize), colorbar=colorbar)
+
+def draw_counts(ax, counts: np.ndarray, xedges: np.ndarray, yedges: np.ndarray, colorbar: bool = True):
+    '''
+    Draws precomputed 2D histogram counts on ax, with empty cells left blank and a log color
+    scale so sparse regions stay visible next to dense ones. The drawing cost depends on the
+    grid size only, not on the number of points.
+
+    Parameters:
+        ax (matplotlib.axes.Axes): the axes to draw on
+        counts (np.ndarray), xedges (np.ndarray), yedges (np.ndarray): as returned by histogram2d
+        colorbar (bool): whether a colorbar is added next to the axes
+    '''
+    masked = np.ma.masked_equal(counts.T, 0)
+    mesh = ax.pcolormesh(xedges, yedges, masked, cmap='viridis',
+                         norm=LogNorm(vmin=1, vmax=max(int(counts.max()), 1)))
+    if colorbar:
+        ax.figure.colorbar(mesh, ax=ax, label='count')
+    return mesh
+
+#**************************************************************************
+#***************** Stratified Sampling of Large Data **********************
+#**************************************************************************
+
+def stratified_positions(strata: np.ndarray, size: int, random_state: int = 42) -> np.ndarray:
+    '''
+    Draws about size row positions, each stratum contributing in proportion to its size but at
+    least one row, so rare strata (tails, small categories) survive the sampling.
+
+    Parameters:
+        strata (np.ndarray): integer stratum code of every row, rows with -1 are never drawn
+        size (int): the target number of rows
+        random_state (int): seed of the random order within the strata
+
+    Returns:
+        np.ndarray: the sorted positions of the drawn rows
+    '''
+    strata = np.asarray(strata, dtype=np.int64)
+    valid = np.flatnonzero(strata >= 0)
+    if len(valid) <= size:
+        return valid
+    codes = strata[valid]
+    counts = np.bincount(codes)
+    quota = np.where(counts > 0, np.maximum(np.ceil(counts * (size / len(valid))), 1), 0).astype(np.int64)
+    # rows sorted by stratum then randomly (the fractional part of the key); the rank of a row
+    # within its stratum decides
+    rng = np.random.default_rng(random_state)
+    order = np.argsort(codes + rng.random(len(codes)))
+    sorted_codes = codes[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ranks = np.arange(len(codes)) - starts[sorted_codes]
+    return np.sort(valid[order[ranks < quota[sorted_codes]]])
+
+def stratified_sample(df: pd.DataFrame, size: int, columns: list = None, gridsize: int = 10,
+                      random_state: int = 42) -> pd.DataFrame:
+    '''
+    Draws a stratified sample of about size rows. Strata are the combinations of the given
+    columns: categorical columns stratify by value, numeric columns by one of gridsize
+    equal-width bins. Without columns the low-cardinality non-numeric columns are used.
+
+    Parameters:
+        df (pd.DataFrame): the data to sample
+        size (int): the target number of rows
+        columns (list): the columns defining the strata
+        gridsize (int): the number of bins of numeric stratifying columns
+        random_state (int): seed of the sampling
+
+    Returns:
+        pd.DataFrame: the sampled rows in their original order
+    '''
+    if len(df) <= size:
+        return df
+    if columns is None:
+        columns = [column for column in df.select_dtypes(exclude='number').columns if df[column].nunique() <= 20]
+    strata = np.zeros(len(df), dtype=np.int64)
+    for column in columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            codes, edges = bin_index(series.to_numpy(dtype=np.float64), gridsize)
+            cardinality = len(edges) - 1
+        else:
+            codes, uniques = pd.factorize(series)
+            cardinality = len(uniques)
+        # missing values form a stratum of their own; the combined codes are compacted after
+        # every column so they stay small
+        _, strata = np.unique(strata * (cardinality + 1) + (codes + 1), return_inverse=True)
+    return df.iloc[stratified_positions(strata, size, random_state)]
@@ -1,9 +1,11 @@
 
 # importing Libraries
 
+import os
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
+from exporarative_data_analysis.profiling import DataProfile
 
 # ******************************************************************************
 # *****************  Abstract Class for MIssing Values Handling ***************
@@ -55,12 +57,13 @@ class Missing_Value_Analysis(Missing_Values_Analysis_template):
             df (pd.DataFrame): Input DataFrame to analyze for missing values.
 
         Returns:
-            None: .
+            pd.Series: missing count per column.
         '''
 
         print('\n Missing Values Count by Column')
-        missing_values = df.isnull().sum()
+        missing_values = self.missing_counts(df)
         print(missing_values[missing_values > 0])
+        return missing_values
     
     def visualize_missing_values(self, df: pd.DataFrame):
         '''
@@ -78,9 +81,67 @@ class Missing_Value_Analysis(Missing_Values_Analysis_template):
         
         print('\n Visualizing Missing values...')
         plt.figure(figsize=(12,8))
+        self.plot_missing_values(df)
+        plt.show()
+
+    def missing_counts(self, df: pd.DataFrame) -> pd.Series:
+        # missing count per column of the analyzed data
+        return df.isnull().sum()
+
+    def plot_missing_values(self, df: pd.DataFrame):
+        # draws the missing values on the current figure
         sns.heatmap(df.isnull(), cbar=False, cmap='viridis')
         plt.title('Missing Values Heatmap')
-        plt.show()
+
+# *********************************************************************
+#************** Incremental Missing Value Analysis ********************
+#**********************************************************************
+
+class Incremental_Missing_Value_Analysis(Missing_Value_Analysis):
+    # Keeps the missing counts of all batches seen so far in a stored DataProfile, so each
+    # new batch of listings only has to be scanned once instead of the whole history. The
+    # report is the one of Missing_Value_Analysis, fed with the counts of the profile.
+    def __init__(self, state_path: str = None, profile: DataProfile = None):
+        '''
+        Parameters:
+            state_path (str): JSON file holding the profile, updated after every batch
+            profile (DataProfile): profile to update in memory, e.g. merged from several partitions
+        '''
+        self.state_path = state_path
+        if profile is None:
+            exists = state_path is not None and os.path.exists(state_path)
+            profile = DataProfile.load(state_path) if exists else DataProfile()
+        self.profile = profile
+
+    def identify_missing_values(self, df: pd.DataFrame):
+        '''
+        Adds the batch to the profile and prints the missing values of the full history.
+
+        Parameters:
+            df (pd.DataFrame): the new batch.
+
+        Returns:
+            pd.Series: missing count per column over all batches.
+        '''
+        self.profile.update(df)
+        if self.state_path is not None:
+            self.profile.save(self.state_path)
+        return super().identify_missing_values(df)
+
+    def missing_counts(self, df: pd.DataFrame) -> pd.Series:
+        # counts of all batches, df was already added to the profile
+        return self.profile.missing_counts()
+
+    def plot_missing_values(self, df: pd.DataFrame):
+        # the row-level heatmap would need the full history, the fraction of missing values
+        # of every column is plotted instead
+        if not self.profile.rows:
+            raise ValueError("No rows have been profiled.")
+        fractions = self.missing_counts(df) / self.profile.rows
+        sns.barplot(x=fractions.index.astype(str), y=fractions.to_numpy(), color='steelblue')
+        plt.title('Fraction of Missing Values (all batches)')
+        plt.ylabel('Missing fraction')
+        plt.xticks(rotation=45)
 
 # Example usage
 if __name__ == '__main__':
@@ -92,6 +153,10 @@ if __name__ == '__main__':
     missing_value_analyzer = Missing_Value_Analysis()
     missing_value_analyzer.analyze(df)
 
+    # add today's batch to the stored missing counts
+    # missing_value_analyzer = Incremental_Missing_Value_Analysis(state_path='./profiles/listings.json')
+    # missing_value_analyzer.analyze(pd.read_csv('./extracted_data/new_listings.csv'))
+
     
 
         
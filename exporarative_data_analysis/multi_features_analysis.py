@@ -1,7 +1,11 @@
 # import libraries
 import matplotlib.pyplot as plt
+import numpy as np
 import seaborn as sns
 import pandas as pd
+from exporarative_data_analysis.correlation import CorrelationAnalyzer, CorrelationMethod, PearsonCorrelation
+from exporarative_data_analysis.large_data import bin_index, draw_counts, grid_counts, stratified_sample
+from load_dataset.cache import DatasetCache
 
 #**************************************************************************
 #***************** Abstract Class for Muilti feature ananlysis *****************
@@ -52,16 +56,43 @@ class MultiFeatureAnalysis():
 #***************** Implementation of multi feature ananlysis *****************
 #**************************************************************************
 
-# this strategy analyzes numerical features by plotting their distribution
+# this strategy analyzes numerical features by plotting their distribution. Above max_points
+# rows the pair plot is drawn from 2D histograms ('hist2d') or from a stratified sample
+# ('sample') instead of every row, so its render time no longer grows with the data. The
+# heatmap uses a CorrelationAnalyzer, which skips unsupported columns and caches its results.
 class MultiFeatureAnalyzer (MultiFeatureAnalysis):
+    def __init__(self, max_points: int = 100000, large_mode: str = 'hist2d', gridsize: int = 50,
+                 sample_size: int = 5000, random_state: int = 42, correlation: CorrelationMethod = None,
+                 cache: DatasetCache = None):
+        '''
+        Parameters:
+        max_points (int): the row count above which the large-data mode is used
+        large_mode (str): 'hist2d' or 'sample'
+        gridsize (int): the number of bins per axis of the histograms
+        sample_size (int): the number of rows plotted in 'sample' mode
+        random_state (int): seed of the sampling
+        correlation (CorrelationMethod): the heatmap's correlation method, Pearson by default
+        cache (DatasetCache): optional on-disk cache of correlation results
+        '''
+        if large_mode not in ('hist2d', 'sample'):
+            raise ValueError(f"Unsupported large data mode: {large_mode}")
+        self.max_points = max_points
+        self.large_mode = large_mode
+        self.gridsize = gridsize
+        self.sample_size = sample_size
+        self.random_state = random_state
+        self.correlation = correlation if correlation is not None else PearsonCorrelation()
+        self.cache = cache
+
     def generate_correlation_heatmap(self, df: pd.DataFrame):
         '''Plots a heatmap for all the features in the DataFrame
         Parameters:
         df(pd.DataFrame): takes DataFrame and two features for anaylsis
         Return:
         None: Plots a heatmap for all the DataFrame features'''
+        matrix = CorrelationAnalyzer(self.correlation, self.cache).correlation(df)
         plt.figure(figsize=(12, 10))
-        sns.heatmap(df.corr(), annot=True, fmt='.2f', cmap='coolwarm', linewidths=1.5)
+        sns.heatmap(matrix, annot=True, fmt='.2f', cmap='coolwarm', vmin=-1, vmax=1, linewidths=1.5)
         plt.title(f'Correlation Heatmap')
         plt.show()
 
@@ -71,10 +102,38 @@ class MultiFeatureAnalyzer (MultiFeatureAnalysis):
         df(pd.DataFrame): takes DataFrame and two features for anaylsis
         Return:
         None: Plots a heatmap for all the DataFrame features'''
-        sns.pairplot(df)
+        if len(df) <= self.max_points:
+            sns.pairplot(df)
+        elif self.large_mode == 'hist2d':
+            self._density_pairplot(df.select_dtypes(include='number'))
+        else:
+            # strata are the low-cardinality categorical columns, so small groups are kept
+            sns.pairplot(stratified_sample(df, self.sample_size, random_state=self.random_state),
+                         plot_kws={'s': 8, 'alpha': 0.5})
         plt.suptitle(f'Pair Plot of Selected Features', y= 1.02)
         plt.show()
 
+    def _density_pairplot(self, df: pd.DataFrame):
+        # pair plot grid with histograms on the diagonal and 2D histograms elsewhere; every
+        # column is binned once and each panel is a single bincount of two bin indexes
+        columns = df.columns
+        size = len(columns)
+        fig, axes = plt.subplots(size, size, figsize=(2.5 * size, 2.5 * size), squeeze=False)
+        bins = {column: bin_index(df[column].to_numpy(dtype=float), self.gridsize) for column in columns}
+        for row, y_column in enumerate(columns):
+            yindex, yedges = bins[y_column]
+            for col, x_column in enumerate(columns):
+                ax = axes[row, col]
+                xindex, xedges = bins[x_column]
+                if row == col:
+                    ax.stairs(np.bincount(xindex[xindex >= 0], minlength=len(xedges) - 1), xedges, fill=True)
+                else:
+                    counts = grid_counts(xindex, yindex, len(xedges) - 1, len(yedges) - 1)
+                    draw_counts(ax, counts, xedges, yedges, colorbar=False)
+                ax.set_xlabel(x_column if row == size - 1 else '')
+                ax.set_ylabel(y_column if col == 0 else '')
+        fig.tight_layout()
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,337 @@
+# import libraries and packages
+import json
+import os
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from outlier_detection.sketches import HyperLogLog, TDigest
+
+#***********************************************************
+#************* Profile of a Single Column ******************
+#***********************************************************
+
+class ColumnProfile:
+    # Mergeable statistics of one column. Numeric columns keep count, mean and the sum of
+    # squared deviations (combined with Chan's parallel update) plus a t-digest for quantiles
+    # and exact min/max. Every column keeps a HyperLogLog sketch of its distinct values and
+    # its value counts for top-k. The value counts are exact until they hold more than
+    # max_values entries; after that only the max_values most frequent are kept, so top-k
+    # becomes approximate and the cardinality comes from the sketch. The state stays bounded
+    # however much history has been added.
+    def __init__(self, name, dtype: str, numeric: bool, compression: float = 200, precision: int = 12,
+                 max_values: int = 10000):
+        '''
+        Parameters:
+            name: the column name
+            dtype (str): the dtype of the column in the first chunk
+            numeric (bool): whether moments and quantiles are computed
+            compression (float): compression of the quantile sketch
+            precision (int): precision of the distinct count sketch
+            max_values (int): the number of value counts kept per column
+        '''
+        self.name = name
+        self.dtype = dtype
+        self.numeric = numeric
+        self.max_values = max_values
+        self.rows = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.digest = TDigest(compression) if numeric else None
+        self.distinct = HyperLogLog(precision)
+        self.value_counts = pd.Series(dtype=np.int64)
+        self.truncated = False
+
+    def add_moments(self, count: int, mean: float, m2: float):
+        # Chan's update of count, mean and m2 with those of another partition
+        total = self.count + count
+        if count:
+            delta = mean - self.mean
+            self.mean += delta * count / total
+            self.m2 += m2 + delta ** 2 * self.count * count / total
+            self.count = total
+
+    def add_counts(self, rows: int, value_counts: pd.Series, observed: int, truncated: bool = False):
+        # observed is the number of non-missing values behind value_counts
+        self.rows += rows
+        if not self.numeric:
+            self.count += observed
+        if self.value_counts.empty:
+            self.value_counts = value_counts
+        elif not value_counts.empty:
+            self.value_counts = self.value_counts.add(value_counts, fill_value=0).astype(np.int64)
+        self.truncated = self.truncated or truncated
+        if len(self.value_counts) > self.max_values:
+            self.value_counts = self.value_counts.nlargest(self.max_values)
+            self.truncated = True
+
+    def add_missing(self, rows: int):
+        # rows in which the column does not exist at all, e.g. a file or chunk without it
+        self.add_counts(rows, pd.Series(dtype=np.int64), 0)
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        '''
+        Merges the profile of the same column computed on other rows.
+
+        Parameters:
+            other (ColumnProfile): the profile to merge
+
+        Returns:
+            ColumnProfile: the merged profile
+        '''
+        if self.numeric:
+            self.add_moments(other.count, other.mean, other.m2)
+            self.digest.merge(other.digest)
+        self.distinct.merge(other.distinct)
+        self.add_counts(other.rows, other.value_counts, other.count, other.truncated)
+        return self
+
+    def to_dict(self, quantiles=(0.25, 0.5, 0.75), top_k: int = 5) -> dict:
+        '''
+        Returns the profile as plain JSON-serializable values.
+
+        Parameters:
+            quantiles (tuple): the quantile levels reported for numeric columns
+            top_k (int): the number of most frequent values reported
+
+        Returns:
+            dict: dtype, count, nulls, cardinality, top values and, for numeric columns,
+                min, max, mean, std and quantiles
+        '''
+        top = self.value_counts.sort_values(ascending=False, kind='stable').head(top_k)
+        profile = {
+            'dtype': self.dtype,
+            'count': int(self.count),
+            'nulls': int(self.rows - self.count),
+            'null_fraction': (self.rows - self.count) / self.rows if self.rows else 0.0,
+            'cardinality': round(self.distinct.count()) if self.truncated else int(len(self.value_counts)),
+            'cardinality_exact': not self.truncated,
+            'top': [[_plain(value), int(count)] for value, count in top.items()],
+        }
+        if self.numeric:
+            empty = self.count == 0
+            profile.update({
+                'min': None if empty else float(self.digest.min),
+                'max': None if empty else float(self.digest.max),
+                'mean': None if empty else float(self.mean),
+                'std': float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else None,
+                'quantiles': {str(q): None if empty else float(self.digest.quantile(q)) for q in quantiles},
+            })
+        return profile
+
+    def to_state(self) -> dict:
+        # the full mergeable state, as plain JSON-serializable values
+        return {
+            'name': self.name, 'dtype': self.dtype, 'numeric': self.numeric, 'max_values': self.max_values,
+            'rows': self.rows, 'count': self.count, 'mean': self.mean, 'm2': self.m2,
+            'digest': self.digest.to_dict() if self.numeric else None,
+            'distinct': self.distinct.to_dict(),
+            'value_counts': [[_plain(value), int(count)] for value, count in self.value_counts.items()],
+            'truncated': self.truncated,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ColumnProfile":
+        profile = cls(state['name'], state['dtype'], state['numeric'], max_values=state['max_values'])
+        profile.rows, profile.count = state['rows'], state['count']
+        profile.mean, profile.m2 = state['mean'], state['m2']
+        profile.digest = TDigest.from_dict(state['digest']) if state['numeric'] else None
+        profile.distinct = HyperLogLog.from_dict(state['distinct'])
+        values = [value for value, _ in state['value_counts']]
+        profile.value_counts = pd.Series([count for _, count in state['value_counts']], index=values, dtype=np.int64)
+        profile.truncated = state['truncated']
+        return profile
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+def _column_pass(series: pd.Series, numeric: bool, compression: float, precision: int):
+    # the per-column work of a chunk: value counts, the distinct count sketch and the quantile
+    # sketch of numeric columns; both sketches are fed the distinct values instead of every row
+    value_counts = series.value_counts(sort=False)
+    distinct = HyperLogLog(precision).update(value_counts.index.to_numpy())
+    digest = None
+    if numeric:
+        digest = TDigest(compression).update(value_counts.index.to_numpy(dtype=np.float64), value_counts.to_numpy())
+    return value_counts, distinct, digest
+
+#***********************************************************
+#************* Profile of a DataFrame **********************
+#***********************************************************
+
+class DataProfile:
+    # Profile of every column, built one chunk at a time. For each chunk the moments of all
+    # numeric columns come from one vectorized pass over a single float array, and the value
+    # counts and sketches of the columns are computed in parallel threads. A profile can be
+    # saved and updated later with only the new rows, or merged with profiles of other
+    # partitions; the cost of an update depends on the new rows, not on the history.
+    def __init__(self, compression: float = 200, precision: int = 12, max_values: int = 10000, n_jobs: int = None):
+        '''
+        Parameters:
+            compression (float): compression of the quantile sketches
+            precision (int): precision of the distinct count sketches
+            max_values (int): the number of value counts kept per column
+            n_jobs (int): number of threads working on the columns of a chunk, all cores when None
+        '''
+        self.compression = compression
+        self.precision = precision
+        self.max_values = max_values
+        self.n_jobs = n_jobs
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, chunk: pd.DataFrame) -> "DataProfile":
+        '''
+        Adds a chunk to the profile. Columns the chunk lacks count its rows as missing, and a
+        column first seen in this chunk counts the rows added before it as missing.
+
+        Parameters:
+            chunk (pd.DataFrame): the rows to add
+
+        Returns:
+            DataProfile: the updated profile
+        '''
+        for column in chunk.columns:
+            if column not in self.columns:
+                dtype = chunk[column].dtype
+                numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                self.columns[column] = ColumnProfile(column, str(dtype), numeric, self.compression,
+                                                     self.precision, self.max_values)
+                self.columns[column].add_missing(self.rows)
+        for column, profile in self.columns.items():
+            if column not in chunk.columns:
+                profile.add_missing(len(chunk))
+        profiles = [self.columns[column] for column in chunk.columns]
+
+        numeric = [profile.name for profile in profiles if profile.numeric]
+        if numeric:
+            values = chunk[numeric].to_numpy(dtype=np.float64)
+            observed = ~np.isnan(values)
+            counts = observed.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = np.where(counts > 0, np.nansum(values, axis=0) / counts, 0.0)
+            m2 = np.nansum((values - means) ** 2, axis=0)
+            for column, count, mean, deviation in zip(numeric, counts, means, m2):
+                self.columns[column].add_moments(int(count), float(mean), float(deviation))
+
+        passes = Parallel(n_jobs=self.n_jobs or -1, prefer='threads')(
+            delayed(_column_pass)(chunk[profile.name], profile.numeric, self.compression, self.precision)
+            for profile in profiles)
+        for profile, (value_counts, distinct, digest) in zip(profiles, passes):
+            profile.add_counts(len(chunk), value_counts, int(value_counts.sum()))
+            profile.distinct.merge(distinct)
+            if digest is not None:
+                profile.digest.merge(digest)
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        '''
+        Merges a profile computed on other rows, e.g. by another worker. A column only one of
+        the profiles has counts the rows of the other as missing.
+
+        Parameters:
+            other (DataProfile): the profile to merge
+
+        Returns:
+            DataProfile: the merged profile
+        '''
+        for column, profile in self.columns.items():
+            if column not in other.columns:
+                profile.add_missing(other.rows)
+        for column, profile in other.columns.items():
+            if column in self.columns:
+                self.columns[column].merge(profile)
+            else:
+                self.columns[column] = profile
+                profile.add_missing(self.rows)
+        self.rows += other.rows
+        return self
+
+    def to_dict(self, quantiles=(0.25, 0.5, 0.75), top_k: int = 5) -> dict:
+        '''
+        Returns the profile as plain JSON-serializable values.
+
+        Parameters:
+            quantiles (tuple): the quantile levels reported for numeric columns
+            top_k (int): the number of most frequent values reported per column
+
+        Returns:
+            dict: the row count and one entry per column, see ColumnProfile.to_dict
+        '''
+        return {'rows': int(self.rows),
+                'columns': {str(column): profile.to_dict(quantiles, top_k) for column, profile in self.columns.items()}}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(**kwargs), default=str)
+
+    def missing_counts(self) -> pd.Series:
+        '''
+        Returns the number of missing values of every column over all rows added so far.
+
+        Returns:
+            pd.Series: missing count per column
+        '''
+        return pd.Series({column: profile.rows - profile.count for column, profile in self.columns.items()},
+                         dtype=np.int64)
+
+    def save(self, path: str):
+        '''
+        Writes the mergeable state of the profile, so it can be updated with the next batch.
+
+        Parameters:
+            path (str): the JSON file to write
+        '''
+        state = {'compression': self.compression, 'precision': self.precision, 'max_values': self.max_values,
+                 'rows': self.rows, 'columns': [profile.to_state() for profile in self.columns.values()]}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(state, file, default=str)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, n_jobs: int = None) -> "DataProfile":
+        '''
+        Reads a profile written by save.
+
+        Parameters:
+            path (str): the JSON file to read
+            n_jobs (int): number of threads used by later updates
+
+        Returns:
+            DataProfile: the profile
+        '''
+        with open(path) as file:
+            state = json.load(file)
+        profile = cls(state['compression'], state['precision'], state['max_values'], n_jobs)
+        profile.rows = state['rows']
+        for column_state in state['columns']:
+            column = ColumnProfile.from_state(column_state)
+            profile.columns[column.name] = column
+        return profile
+
+def diff_profiles(old: dict, new: dict) -> dict:
+    '''
+    Compares two profiles produced by DataProfile.to_dict, e.g. a stored one and today's.
+
+    Parameters:
+        old (dict): the earlier profile
+        new (dict): the later profile
+
+    Returns:
+        dict: the row counts, added and removed columns, and for every common column the
+            statistics that changed as [old, new] pairs
+    '''
+    changes = {}
+    for column in old['columns'].keys() & new['columns'].keys():
+        before, after = old['columns'][column], new['columns'][column]
+        changed = {key: [before.get(key), after.get(key)] for key in before.keys() | after.keys()
+                   if before.get(key) != after.get(key)}
+        if changed:
+            changes[column] = changed
+    return {
+        'rows': [old['rows'], new['rows']],
+        'added_columns': sorted(new['columns'].keys() - old['columns'].keys()),
+        'removed_columns': sorted(old['columns'].keys() - new['columns'].keys()),
+        'changed': changes,
+    }
@@ -0,0 +1,556 @@
+# Importing Libraries
+import logging
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# *******************************************************************
+# ************ Abstract Class for Feature Engineering ***************
+# *******************************************************************
+
+class FeatureEngineering():
+    # This class defines a common interface for feature engineering strategies.
+    # Numeric strategies describe their work as per-column ops ("log1p" or an affine
+    # "scale/shift") and encoders as per-column encodings, so FeaturePipeline can run
+    # several strategies as fused NumPy passes.
+    def __init__(self, features: list):
+        """
+        Parameters:
+        features (list): The columns the strategy is applied to.
+        """
+        self.features = list(features)
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Learns the parameters of the transformation, stateless strategies learn nothing.
+
+        Parameters:
+        df (pd.DataFrame): The dataframe the parameters are learned from.
+
+        Returns:
+        FeatureEngineering: The fitted strategy.
+        """
+        return self
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Abstract method applying the transformation to a DataFrame.
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the features to transform.
+
+        Returns:
+        pd.DataFrame: The dataframe with the transformed features.
+        """
+        pass
+
+    def column_ops(self) -> dict:
+        # Column -> op tuple for numeric strategies, see FeaturePipeline.
+        return {}
+
+    def column_encodings(self) -> dict:
+        # Column -> encoding tuple for encoders, see FeaturePipeline.
+        return {}
+
+# ***************************************************************
+# ******************* Log Transformation ************************
+# ***************************************************************
+
+class LogTransformation(FeatureEngineering):
+    # This strategy applies log(1 + x) to skewed features such as price and area.
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying log transformation to features: {self.features}")
+        df_transformed = df.copy()
+        for feature in self.features:
+            df_transformed[feature] = np.log1p(df[feature].astype(np.float64))
+        logging.info("Log transformation completed.")
+        return df_transformed
+
+    def column_ops(self) -> dict:
+        return {feature: ("log1p",) for feature in self.features}
+
+# ***************************************************************
+# ******************* Standard Scaling **************************
+# ***************************************************************
+
+class StandardScaling(FeatureEngineering):
+    # This strategy scales features to zero mean and unit variance.
+    def __init__(self, features: list):
+        super().__init__(features)
+        self.mean_ = None
+        self.std_ = None
+
+    def fit(self, df: pd.DataFrame):
+        values = df[self.features].to_numpy(dtype=np.float64)
+        self.mean_ = np.nanmean(values, axis=0)
+        self.std_ = np.nanstd(values, axis=0)
+        self.std_[~(self.std_ > 0)] = 1.0
+        return self
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying standard scaling to features: {self.features}")
+        if self.mean_ is None:
+            self.fit(df)
+        df_transformed = df.copy()
+        df_transformed[self.features] = (df[self.features].to_numpy(dtype=np.float64) - self.mean_) / self.std_
+        logging.info("Standard scaling completed.")
+        return df_transformed
+
+    def column_ops(self) -> dict:
+        # (x - mean) / std  ==  x * (1 / std) + (-mean / std)
+        return {feature: ("affine", 1.0 / std, -mean / std)
+                for feature, mean, std in zip(self.features, self.mean_, self.std_)}
+
+# ***************************************************************
+# ******************* Min-Max Scaling ***************************
+# ***************************************************************
+
+class MinMaxScaling(FeatureEngineering):
+    # This strategy scales features to a fixed range, [0, 1] by default.
+    def __init__(self, features: list, feature_range=(0, 1)):
+        super().__init__(features)
+        self.feature_range = feature_range
+        self.min_ = None
+        self.max_ = None
+
+    def fit(self, df: pd.DataFrame):
+        values = df[self.features].to_numpy(dtype=np.float64)
+        self.min_ = np.nanmin(values, axis=0)
+        self.max_ = np.nanmax(values, axis=0)
+        return self
+
+    def _scale_shift(self):
+        low, high = self.feature_range
+        span = self.max_ - self.min_
+        span[~(span > 0)] = 1.0
+        scale = (high - low) / span
+        return scale, low - self.min_ * scale
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying min-max scaling to features: {self.features}")
+        if self.min_ is None:
+            self.fit(df)
+        scale, shift = self._scale_shift()
+        df_transformed = df.copy()
+        df_transformed[self.features] = df[self.features].to_numpy(dtype=np.float64) * scale + shift
+        logging.info("Min-max scaling completed.")
+        return df_transformed
+
+    def column_ops(self) -> dict:
+        scale, shift = self._scale_shift()
+        return {feature: ("affine", a, b) for feature, a, b in zip(self.features, scale, shift)}
+
+# ***************************************************************
+# ******************* Binary Encoding ***************************
+# ***************************************************************
+
+class BinaryEncoding(FeatureEngineering):
+    # This strategy encodes two-valued columns such as the yes/no amenities as 1.0 / 0.0.
+    def __init__(self, features: list, positive="yes"):
+        """
+        Parameters:
+        features (list): The columns to encode.
+        positive: The value encoded as 1.0, every other value becomes 0.0 and missing values stay NaN.
+        """
+        super().__init__(features)
+        self.positive = positive
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying binary encoding to features: {self.features}")
+        df_transformed = df.copy()
+        for feature in self.features:
+            df_transformed[feature] = _binary_values(df[feature], self.positive)
+        logging.info("Binary encoding completed.")
+        return df_transformed
+
+    def column_encodings(self) -> dict:
+        return {feature: ("binary", self.positive) for feature in self.features}
+
+def _binary_values(series: pd.Series, positive) -> np.ndarray:
+    values = (series == positive).to_numpy(dtype=np.float64)
+    values[series.isna().to_numpy()] = np.nan
+    return values
+
+# ***************************************************************
+# ******************* One-Hot Encoding **************************
+# ***************************************************************
+
+class OneHotEncoding(FeatureEngineering):
+    # This strategy expands low-cardinality columns such as furnishingstatus into one
+    # indicator column per category seen during fit. Unseen categories encode as all zeros.
+    def __init__(self, features: list):
+        super().__init__(features)
+        self.categories_ = None
+
+    def fit(self, df: pd.DataFrame):
+        self.categories_ = {feature: pd.Index(pd.unique(df[feature].dropna())).sort_values()
+                            for feature in self.features}
+        return self
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying one-hot encoding to features: {self.features}")
+        if self.categories_ is None:
+            self.fit(df)
+        encoded = []
+        for feature in self.features:
+            categories = self.categories_[feature]
+            codes = pd.Categorical(df[feature], categories=categories).codes
+            indicators = np.zeros((len(df), len(categories)))
+            valid = codes >= 0
+            indicators[np.flatnonzero(valid), codes[valid]] = 1.0
+            encoded.append(pd.DataFrame(indicators, index=df.index,
+                                        columns=[f"{feature}_{category}" for category in categories]))
+        df_transformed = pd.concat([df.drop(columns=self.features)] + encoded, axis=1)
+        logging.info("One-hot encoding completed.")
+        return df_transformed
+
+    def column_encodings(self) -> dict:
+        return {feature: ("onehot", self.categories_[feature]) for feature in self.features}
+
+# ***************************************************************
+# ************ Sparse One-Hot Encoding (CSR output) *************
+# ***************************************************************
+
+class SparseOneHotEncoding(OneHotEncoding):
+    # One-hot encoding for high-cardinality columns such as zip code or neighborhood. The
+    # indicators are built directly as a scipy.sparse CSR matrix with one stored value per
+    # encoded cell, so memory grows with the number of rows, not rows x categories.
+    sparse = True
+
+    def transform_sparse(self, df: pd.DataFrame) -> sp.csr_matrix:
+        """
+        Encodes the features as a CSR matrix, columns follow feature_names().
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the features to encode.
+
+        Returns:
+        sp.csr_matrix: The float64 indicator matrix.
+        """
+        if self.categories_ is None:
+            self.fit(df)
+        n_rows, offset = len(df), 0
+        columns, valid = [], []
+        for feature in self.features:
+            categories = self.categories_[feature]
+            codes = pd.Categorical(df[feature], categories=categories).codes.astype(np.int64)
+            valid.append(codes >= 0)
+            columns.append(codes + offset)
+            offset += len(categories)
+        return _csr_from_columns(n_rows, offset, np.column_stack(columns), np.column_stack(valid))
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying sparse one-hot encoding to features: {self.features}")
+        encoded = pd.DataFrame.sparse.from_spmatrix(self.transform_sparse(df), index=df.index,
+                                                    columns=self.feature_names())
+        logging.info("Sparse one-hot encoding completed.")
+        return pd.concat([df.drop(columns=self.features), encoded], axis=1)
+
+    def feature_names(self) -> list:
+        return [f"{feature}_{category}" for feature in self.features for category in self.categories_[feature]]
+
+    def column_encodings(self) -> dict:
+        return {feature: ("sparse", self) for feature in self.features}
+
+# ***************************************************************
+# ******************* Feature Hashing ***************************
+# ***************************************************************
+
+class HashingEncoding(FeatureEngineering):
+    # Hashes "feature=value" pairs into a fixed number of CSR columns. Nothing is learned
+    # during fit, so the output width does not depend on how many categories appear and
+    # unseen categories need no special handling. Colliding pairs share a column, a sign
+    # derived from the hash keeps collisions from adding up in expectation.
+    sparse = True
+
+    def __init__(self, features: list, n_features: int = 2 ** 18, alternate_sign: bool = True,
+                 hash_key: str = "0123456789123456"):
+        """
+        Parameters:
+        features (list): The columns to encode.
+        n_features (int): The number of output columns.
+        alternate_sign (bool): Give each hashed pair a +1 or -1 value instead of always 1.
+        hash_key (str): 16 character key of the hash.
+        """
+        super().__init__(features)
+        if len(hash_key.encode("utf8")) != 16:
+            raise ValueError("hash_key must be 16 bytes long")
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+        self.hash_key = hash_key
+
+    def transform_sparse(self, df: pd.DataFrame) -> sp.csr_matrix:
+        """
+        Encodes the features as a CSR matrix of n_features columns.
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the features to encode.
+
+        Returns:
+        sp.csr_matrix: The float64 hashed matrix.
+        """
+        columns, valid, signs = [], [], []
+        for feature in self.features:
+            values = (feature + "=" + df[feature].astype(str)).to_numpy(dtype=object)
+            hashes = pd.util.hash_array(values, hash_key=self.hash_key)
+            columns.append((hashes % np.uint64(self.n_features)).astype(np.int64))
+            valid.append(df[feature].notna().to_numpy())
+            # the top bit of the hash picks the sign
+            signs.append(np.where(hashes >> np.uint64(63), -1.0, 1.0) if self.alternate_sign
+                         else np.ones(len(df)))
+        matrix = _csr_from_columns(len(df), self.n_features, np.column_stack(columns),
+                                   np.column_stack(valid), np.column_stack(signs))
+        matrix.sum_duplicates()
+        return matrix
+
+    def apply_transformation(self, df: pd.DataFrame) -> pd.DataFrame:
+        logging.info(f"Applying feature hashing to features: {self.features}")
+        encoded = pd.DataFrame.sparse.from_spmatrix(self.transform_sparse(df), index=df.index,
+                                                    columns=self.feature_names())
+        logging.info("Feature hashing completed.")
+        return pd.concat([df.drop(columns=self.features), encoded], axis=1)
+
+    def feature_names(self) -> list:
+        return [f"hash_{position}" for position in range(self.n_features)]
+
+    def column_encodings(self) -> dict:
+        return {feature: ("sparse", self) for feature in self.features}
+
+def _csr_from_columns(n_rows: int, n_columns: int, columns: np.ndarray, valid: np.ndarray,
+                      data: np.ndarray = None) -> sp.csr_matrix:
+    # Builds a CSR matrix from an (n_rows, k) array of column positions, at most one value
+    # per row and position; invalid (missing) cells are not stored.
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=indptr[1:])
+    data = np.ones(int(indptr[-1])) if data is None else data[valid].astype(np.float64)
+    return sp.csr_matrix((data, columns[valid], indptr), shape=(n_rows, n_columns))
+
+# ***************************************************************
+# ************ Fused Feature Engineering Pipeline ***************
+# ***************************************************************
+
+class FeaturePipeline:
+    # Composes feature engineering strategies. After fit, the steps are compiled into a plan
+    # that writes every output column straight into one float64 matrix: columns with the same
+    # sequence of ops form one contiguous block, consecutive affine ops are folded into a
+    # single scale/shift, and each op runs once per block in place. No intermediate
+    # DataFrame is built between steps. Sparse encoders are kept sparse: when the pipeline
+    # contains one, transform returns a CSR matrix with the dense block followed by the
+    # encoded columns.
+    def __init__(self, steps: list):
+        """
+        Parameters:
+        steps (list): FeatureEngineering strategies, applied in order.
+        """
+        self.steps = steps
+        self.feature_names_ = None
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Fits every step on the output of the previous ones and compiles the fused plan.
+
+        Parameters:
+        df (pd.DataFrame): The training dataframe.
+
+        Returns:
+        FeaturePipeline: The fitted pipeline.
+        """
+        logging.info(f"Fitting feature pipeline with {len(self.steps)} steps.")
+        current = df
+        for step in self.steps:
+            step.fit(current)
+            # sparse encoder outputs cannot be transformed further, so they are not materialized
+            if step is not self.steps[-1] and not getattr(step, "sparse", False):
+                current = step.apply_transformation(current)
+        self._compile(df)
+        return self
+
+    def _compile(self, df: pd.DataFrame):
+        encodings, ops = {}, {}
+        for step in self.steps:
+            for column, encoding in step.column_encodings().items():
+                if column in ops:
+                    raise ValueError(f"Column '{column}' is encoded after being transformed")
+                encodings[column] = encoding
+            for column, op in step.column_ops().items():
+                if encodings.get(column, ("binary",))[0] != "binary":
+                    raise ValueError(f"Column '{column}' is {encodings[column][0]} encoded and cannot be transformed")
+                ops.setdefault(column, []).append(op)
+
+        # numeric outputs: every numeric column plus binary-encoded columns
+        numeric = [column for column in df.columns
+                   if (column not in encodings and pd.api.types.is_numeric_dtype(df[column]))
+                   or encodings.get(column, ("",))[0] == "binary"]
+        dropped = [column for column in df.columns if column not in numeric and column not in encodings]
+        if dropped:
+            logging.warning(f"Non-numeric columns {dropped} are not encoded and are left out of the features.")
+
+        # group numeric columns by their fused op sequence so each group is one contiguous block
+        groups = {}
+        for column in numeric:
+            fused = _fuse_ops(ops.get(column, []))
+            signature = tuple(op[0] for op in fused)
+            groups.setdefault(signature, []).append((column, fused))
+
+        self._blocks, names, start = [], [], 0
+        for signature, members in groups.items():
+            columns = [column for column, _ in members]
+            block_ops = []
+            for position, kind in enumerate(signature):
+                if kind == "affine":
+                    scale = np.array([fused[position][1] for _, fused in members])
+                    shift = np.array([fused[position][2] for _, fused in members])
+                    block_ops.append(("affine", scale, shift))
+                else:
+                    block_ops.append((kind,))
+            binary = [(offset, encodings[column][1]) for offset, column in enumerate(columns) if column in encodings]
+            self._blocks.append((start, columns, binary, block_ops))
+            names += columns
+            start += len(columns)
+
+        self._onehots = []
+        for column, encoding in encodings.items():
+            if encoding[0] == "onehot":
+                categories = encoding[1]
+                self._onehots.append((start, column, categories))
+                names += [f"{column}_{category}" for category in categories]
+                start += len(categories)
+
+        self._sparse = []
+        for column, encoding in encodings.items():
+            if encoding[0] == "sparse" and not any(encoding[1] is encoder for encoder in self._sparse):
+                self._sparse.append(encoding[1])
+        self.n_dense_ = start
+        for encoder in self._sparse:
+            names += encoder.feature_names()
+
+        self.feature_names_ = names
+
+    def transform(self, df: pd.DataFrame, as_frame: bool = False):
+        """
+        Runs the fused plan and returns the feature matrix.
+
+        Parameters:
+        df (pd.DataFrame): The dataframe to transform.
+        as_frame (bool): Wrap the matrix in a DataFrame named by feature_names_.
+
+        Returns:
+        np.ndarray, sp.csr_matrix or pd.DataFrame: The features, one column per name in feature_names_.
+        """
+        if self.feature_names_ is None:
+            raise ValueError("FeaturePipeline is not fitted, call fit() first.")
+        n_rows = len(df)
+        # column-major so every block is a contiguous slice that can be updated in place
+        out = np.empty((n_rows, self.n_dense_), dtype=np.float64, order="F")
+
+        for start, columns, binary, block_ops in self._blocks:
+            block = out[:, start:start + len(columns)]
+            binary_offsets = {offset for offset, _ in binary}
+            plain = [offset for offset in range(len(columns)) if offset not in binary_offsets]
+            if len(plain) == len(columns):
+                block[...] = df[columns].to_numpy(dtype=np.float64)
+            else:
+                for offset in plain:
+                    block[:, offset] = df[columns[offset]].to_numpy(dtype=np.float64)
+                for offset, positive in binary:
+                    block[:, offset] = _binary_values(df[columns[offset]], positive)
+            for op in block_ops:
+                if op[0] == "log1p":
+                    np.log1p(block, out=block)
+                else:
+                    block *= op[1]
+                    block += op[2]
+
+        for start, column, categories in self._onehots:
+            block = out[:, start:start + len(categories)]
+            block[...] = 0.0
+            codes = pd.Categorical(df[column], categories=categories).codes
+            valid = codes >= 0
+            block[np.flatnonzero(valid), codes[valid]] = 1.0
+
+        if self._sparse:
+            out = sp.hstack([sp.csr_matrix(out)] + [encoder.transform_sparse(df) for encoder in self._sparse],
+                            format="csr")
+            if as_frame:
+                return pd.DataFrame.sparse.from_spmatrix(out, index=df.index, columns=self.feature_names_)
+        if as_frame:
+            return pd.DataFrame(out, index=df.index, columns=self.feature_names_)
+        return out
+
+    def fit_transform(self, df: pd.DataFrame, as_frame: bool = False):
+        return self.fit(df).transform(df, as_frame=as_frame)
+
+def _fuse_ops(ops: list) -> list:
+    # Folds consecutive affine ops: (x * a + b) * c + d  ==  x * (a * c) + (b * c + d).
+    fused = []
+    for op in ops:
+        if op[0] == "affine" and fused and fused[-1][0] == "affine":
+            _, a, b = fused[-1]
+            _, c, d = op
+            fused[-1] = ("affine", a * c, b * c + d)
+        else:
+            fused.append(op)
+    return fused
+
+# ***************************************************************
+# ************ Context Class for Feature Engineering ************
+# ***************************************************************
+
+class FeatureEngineer:
+    # This class uses a FeatureEngineering strategy to transform the data.
+    def __init__(self, strategy: FeatureEngineering):
+        """
+        Initializes the FeatureEngineer with a specific feature engineering strategy.
+
+        Parameters:
+        strategy (FeatureEngineering): The strategy to be used.
+        """
+        self._strategy = strategy
+
+    def set_strategy(self, strategy: FeatureEngineering):
+        """
+        Sets a new strategy for the FeatureEngineer.
+
+        Parameters:
+        strategy (FeatureEngineering): The new strategy to be used.
+        """
+        logging.info("Switching feature engineering strategy.")
+        self._strategy = strategy
+
+    def apply_feature_engineering(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Executes the feature engineering using the current strategy.
+
+        Parameters:
+        df (pd.DataFrame): The dataframe containing the features to transform.
+
+        Returns:
+        pd.DataFrame: The transformed dataframe.
+        """
+        logging.info("Applying feature engineering strategy.")
+        return self._strategy.apply_transformation(df)
+
+
+# Example usage
+if __name__ == "__main__":
+    # df = pd.read_csv('./extracted_data/Housing.csv')
+
+    # # Apply a single strategy
+    # feature_engineer = FeatureEngineer(LogTransformation(features=['price', 'area']))
+    # df_log = feature_engineer.apply_feature_engineering(df)
+
+    # # Compose strategies into one fused pass over a NumPy matrix
+    # yes_no = ['mainroad', 'guestroom', 'basement', 'hotwaterheating', 'airconditioning', 'prefarea']
+    # pipeline = FeaturePipeline([
+    #     BinaryEncoding(yes_no),
+    #     OneHotEncoding(['furnishingstatus']),
+    #     LogTransformation(['price', 'area']),
+    #     StandardScaling(['price', 'area', 'bedrooms', 'bathrooms', 'stories', 'parking']),
+    # ])
+    # X = pipeline.fit_transform(df)
+    # print(pipeline.feature_names_)
+
+    pass
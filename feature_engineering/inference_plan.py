@@ -0,0 +1,250 @@
+# Importing Libraries
+import json
+import logging
+import numpy as np
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ***************************************************************
+# ************ Compiled Plan for Single-Row Inference ***********
+# ***************************************************************
+
+class InferencePlan:
+    # The fitted imputation, outlier capping and feature engineering steps flattened into
+    # plain arrays and lookup tables. A listing goes through:
+    #   1. fill:  missing fields take the fitted fill value (fill table)
+    #   2. cap:   numeric fields are clipped to the detector's 1%/99% bounds (lower/upper arrays)
+    #   3. build: numeric outputs are read, yes/no outputs compared to their positive value,
+    #             one-hot outputs set through a category -> position table
+    #   4. ops:   every output column runs the same fixed stages "optional log1p, then x * scale + shift";
+    #             columns that need fewer stages get identity stages
+    # No DataFrame is built and only numpy and the standard library are imported, so a
+    # serving process can load a saved plan without the training dependencies.
+    def __init__(self, input_columns: list, fill_values: dict, numeric_fields: list, cap_lower: np.ndarray,
+                 cap_upper: np.ndarray, numeric_positions: np.ndarray, binary_fields: list, binary_positive: list,
+                 binary_positions: np.ndarray, onehot_tables: dict, stage_log: np.ndarray, stage_scale: np.ndarray,
+                 stage_shift: np.ndarray, feature_names: list):
+        """
+        Use InferencePlan.compile or InferencePlan.load instead of calling this directly.
+
+        Parameters:
+        input_columns (list): The fields a listing must provide, also the order of NumPy rows.
+        fill_values (dict): Field -> value used when the field is missing.
+        numeric_fields (list): The numeric fields, in the order of cap_lower/cap_upper.
+        cap_lower, cap_upper (np.ndarray): Capping bounds of numeric_fields, +-inf when not capped.
+        numeric_positions (np.ndarray): Output position of every numeric field.
+        binary_fields (list): The fields encoded as 1.0 / 0.0.
+        binary_positive (list): The value encoded as 1.0 for each binary field.
+        binary_positions (np.ndarray): Output position of every binary field.
+        onehot_tables (dict): Field -> {category: output position}.
+        stage_log (np.ndarray): (n_stages, n_dense) booleans, apply log1p in that stage.
+        stage_scale, stage_shift (np.ndarray): (n_stages, n_dense) affine op of every stage.
+        feature_names (list): The names of the output columns.
+        """
+        self.input_columns = list(input_columns)
+        self.fill_values = fill_values
+        self.numeric_fields = list(numeric_fields)
+        self.cap_lower = cap_lower
+        self.cap_upper = cap_upper
+        self.numeric_positions = numeric_positions
+        self.binary_fields = list(binary_fields)
+        self.binary_positive = list(binary_positive)
+        self.binary_positions = binary_positions
+        self.onehot_tables = onehot_tables
+        self.stage_log = stage_log
+        self.stage_scale = stage_scale
+        self.stage_shift = stage_shift
+        self.feature_names = list(feature_names)
+        self.n_dense = stage_scale.shape[1]
+        # stages without a log1p column skip the masked log1p call
+        self._stages = [(log.any(), log, scale, shift) for log, scale, shift in zip(stage_log, stage_scale, stage_shift)]
+        self._binary = list(zip(self.binary_fields, self.binary_positive, self.binary_positions.tolist()))
+        self._onehot = list(onehot_tables.items())
+
+    @classmethod
+    def compile(cls, pipeline, imputers=(), outlier_detector=None) -> "InferencePlan":
+        """
+        Builds a plan from fitted steps.
+
+        Parameters:
+        pipeline (FeaturePipeline): The fitted feature pipeline, dense outputs only.
+        imputers: A fitted FillMissingVaulues, a MissingValueHandler wrapping one, or a list of
+            them; when several provide a fill value for a field the first one wins.
+        outlier_detector (OutlierDetector): A fitted detector whose capping bounds are applied.
+
+        Returns:
+        InferencePlan: The compiled plan.
+        """
+        if pipeline.feature_names_ is None:
+            raise ValueError("FeaturePipeline is not fitted, call fit() first.")
+        if pipeline._sparse:
+            raise ValueError("Pipelines with sparse encoders cannot be compiled into an InferencePlan.")
+        logging.info("Compiling inference plan.")
+
+        fill_values = {}
+        for imputer in (imputers if isinstance(imputers, (list, tuple)) else [imputers]):
+            imputer = getattr(imputer, "_strategy", imputer)
+            if getattr(imputer, "fill_values_", None) is None:
+                raise ValueError(f"{type(imputer).__name__} has no fitted fill values and cannot be compiled.")
+            for column, value in zip(imputer.columns_, imputer.fill_values_):
+                fill_values.setdefault(column, _plain(value))
+
+        caps = {}
+        if outlier_detector is not None:
+            if outlier_detector.cap_bounds_ is None:
+                raise ValueError("OutlierDetector is not fitted, call fit() first.")
+            caps = {column: (lower, upper) for column, lower, upper
+                    in zip(outlier_detector.columns_, *outlier_detector.cap_bounds_)}
+
+        numeric_fields, numeric_positions, binary_fields, binary_positive, binary_positions = [], [], [], [], []
+        stages = [[] for _ in range(pipeline.n_dense_)]
+        for start, columns, binary, block_ops in pipeline._blocks:
+            binary = dict(binary)
+            for offset, column in enumerate(columns):
+                if offset in binary:
+                    binary_fields.append(column)
+                    binary_positive.append(_plain(binary[offset]))
+                    binary_positions.append(start + offset)
+                else:
+                    numeric_fields.append(column)
+                    numeric_positions.append(start + offset)
+                stages[start + offset] = _column_stages(block_ops, offset)
+
+        n_stages = max([len(column_stages) for column_stages in stages] + [1])
+        stage_log = np.zeros((n_stages, pipeline.n_dense_), dtype=bool)
+        stage_scale = np.ones((n_stages, pipeline.n_dense_))
+        stage_shift = np.zeros((n_stages, pipeline.n_dense_))
+        for position, column_stages in enumerate(stages):
+            for stage, (log, scale, shift) in enumerate(column_stages):
+                stage_log[stage, position], stage_scale[stage, position], stage_shift[stage, position] = log, scale, shift
+
+        onehot_tables = {column: {_plain(category): start + code for code, category in enumerate(categories)}
+                         for start, column, categories in pipeline._onehots}
+
+        input_columns = list(dict.fromkeys(numeric_fields + binary_fields + list(onehot_tables)))
+        cap_lower = np.array([caps.get(field, (-np.inf, np.inf))[0] for field in numeric_fields], dtype=np.float64)
+        cap_upper = np.array([caps.get(field, (-np.inf, np.inf))[1] for field in numeric_fields], dtype=np.float64)
+        fill_values = {field: value for field, value in fill_values.items() if field in input_columns}
+
+        return cls(input_columns, fill_values, numeric_fields, cap_lower, cap_upper,
+                   np.array(numeric_positions, dtype=np.int64), binary_fields, binary_positive,
+                   np.array(binary_positions, dtype=np.int64), onehot_tables, stage_log, stage_scale,
+                   stage_shift, pipeline.feature_names_)
+
+    def transform_row(self, row) -> np.ndarray:
+        """
+        Turns one listing into its feature vector.
+
+        Parameters:
+        row (dict or np.ndarray): A listing as a dict, or a 1D array ordered as input_columns
+            (an object array when it holds categorical fields).
+
+        Returns:
+        np.ndarray: The float64 feature vector, ordered as feature_names.
+        """
+        if not isinstance(row, dict):
+            row = dict(zip(self.input_columns, row))
+        missing = {field: value for field, value in self.fill_values.items()
+                   if (current := row.get(field)) is None or current != current}
+        if missing:
+            # the caller's dict is left untouched
+            row = {**row, **missing}
+
+        out = np.zeros(len(self.feature_names))
+        numeric = np.array([row.get(field, np.nan) for field in self.numeric_fields], dtype=np.float64)
+        out[self.numeric_positions] = np.minimum(np.maximum(numeric, self.cap_lower), self.cap_upper)
+        for field, positive, position in self._binary:
+            value = row.get(field)
+            out[position] = np.nan if value is None or value != value else float(value == positive)
+
+        dense = out[:self.n_dense]
+        for has_log, log, scale, shift in self._stages:
+            if has_log:
+                np.log1p(dense, out=dense, where=log)
+            dense *= scale
+            dense += shift
+
+        for field, table in self._onehot:
+            position = table.get(row.get(field))
+            if position is not None:
+                out[position] = 1.0
+        return out
+
+    __call__ = transform_row
+
+    def to_dict(self) -> dict:
+        """Returns the plan as plain JSON-serializable values.
+
+        Returns:
+        dict: The arrays as lists and the lookup tables as [category, position] pairs.
+        """
+        return {
+            "input_columns": self.input_columns,
+            "fill_values": [[field, value] for field, value in self.fill_values.items()],
+            "numeric_fields": self.numeric_fields,
+            "cap_lower": _finite_or_none(self.cap_lower),
+            "cap_upper": _finite_or_none(self.cap_upper),
+            "numeric_positions": self.numeric_positions.tolist(),
+            "binary_fields": self.binary_fields,
+            "binary_positive": self.binary_positive,
+            "binary_positions": self.binary_positions.tolist(),
+            "onehot_tables": [[field, list(table.items())] for field, table in self.onehot_tables.items()],
+            "stage_log": self.stage_log.tolist(),
+            "stage_scale": self.stage_scale.tolist(),
+            "stage_shift": self.stage_shift.tolist(),
+            "feature_names": self.feature_names,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "InferencePlan":
+        """Rebuilds a plan from to_dict() output.
+
+        Parameters:
+        state (dict): The serialized plan.
+
+        Returns:
+        InferencePlan: The plan.
+        """
+        n_dense = len(state["stage_scale"][0]) if state["stage_scale"] else 0
+        return cls(state["input_columns"], dict(state["fill_values"]), state["numeric_fields"],
+                   _bounds_array(state["cap_lower"], -np.inf), _bounds_array(state["cap_upper"], np.inf),
+                   np.array(state["numeric_positions"], dtype=np.int64), state["binary_fields"],
+                   state["binary_positive"], np.array(state["binary_positions"], dtype=np.int64),
+                   {field: dict((category, position) for category, position in table)
+                    for field, table in state["onehot_tables"]},
+                   np.array(state["stage_log"], dtype=bool).reshape(-1, n_dense),
+                   np.array(state["stage_scale"], dtype=np.float64).reshape(-1, n_dense),
+                   np.array(state["stage_shift"], dtype=np.float64).reshape(-1, n_dense),
+                   state["feature_names"])
+
+    def save(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str) -> "InferencePlan":
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
+
+def _column_stages(block_ops: list, offset: int) -> list:
+    # Rewrites a column's fused ops as (log1p?, scale, shift) stages.
+    stages = []
+    for op in block_ops:
+        if op[0] == "log1p":
+            stages.append([True, 1.0, 0.0])
+        elif stages and stages[-1][1:] == [1.0, 0.0]:
+            stages[-1][1:] = [float(op[1][offset]), float(op[2][offset])]
+        else:
+            stages.append([False, float(op[1][offset]), float(op[2][offset])])
+    return stages
+
+def _plain(value):
+    # NumPy scalars -> Python scalars so the tables serialize to JSON and hash like the raw input
+    return value.item() if isinstance(value, np.generic) else value
+
+def _finite_or_none(values: np.ndarray) -> list:
+    return [float(value) if np.isfinite(value) else None for value in values]
+
+def _bounds_array(values: list, default: float) -> np.ndarray:
+    return np.array([default if value is None else value for value in values], dtype=np.float64)
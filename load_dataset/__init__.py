@@ -1 +1 @@
-l
+
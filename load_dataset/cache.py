@@ -0,0 +1,210 @@
+#***************************************************
+#**************** IMPORT LIBRARIES******************
+#***************************************************
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+#***************************************************
+#************ Content hash of a source file ********
+#***************************************************
+
+def file_digest(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Hashes the content of a file block by block
+
+    Parameters:
+        file_path (str): the file to hash
+        block_size (int): number of bytes read per block
+
+    Returns:
+        str: hex digest of the file content
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+#*****************************************************************
+#************ On-disk columnar cache for loaded datasets *********
+#*****************************************************************
+
+class DatasetCache:
+    # Stores parsed DataFrames as Feather (Arrow IPC) or Parquet files keyed by the
+    # content hash of the source file, so a dataset is only parsed once per version.
+    def __init__(self, cache_dir: str = ".dataset_cache", max_bytes: int = 2 * 1024 ** 3, file_format: str = "feather"):
+        """
+        Parameters:
+            cache_dir (str): directory holding the cached frames and the cache index
+            max_bytes (int): total size of cached frames above which the least recently used are evicted
+            file_format (str): "feather" (memory-mapped on read) or "parquet"
+        """
+        if file_format not in ("feather", "parquet"):
+            raise ValueError(f"Unsupported cache format: {file_format}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.file_format = file_format
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._index = self._read_index()
+
+    def _read_index(self) -> dict:
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as file:
+                return json.load(file)
+        return {"hits": 0, "misses": 0, "sources": {}}
+
+    def _write_index(self):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self._index, file)
+        os.replace(tmp_path, self._index_path)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{self.file_format}")
+
+    def source_digest(self, file_path: str) -> str:
+        """
+        Returns the content hash of a source file. The hash is only recomputed when the
+        size or modification time of the file changed since it was last seen.
+
+        Parameters:
+            file_path (str): path of the source file
+
+        Returns:
+            str: hex digest of the file content
+        """
+        stat = os.stat(file_path)
+        source = self._index["sources"].get(os.path.abspath(file_path))
+        if source and source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns:
+            return source["digest"]
+        return file_digest(file_path)
+
+    def make_key(self, file_path: str, *parts) -> str:
+        """
+        Builds the cache key of a dataset from the source content hash and any extra
+        parts that change the parsed result (archive member name, reader options).
+
+        Parameters:
+            file_path (str): path of the source file
+            parts: additional values identifying the parsed frame
+
+        Returns:
+            str: the cache key
+        """
+        digest = hashlib.blake2b(self.source_digest(file_path).encode(), digest_size=20)
+        for part in parts:
+            digest.update(repr(part).encode())
+        return digest.hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        # checks for an entry without touching the hit/miss counters
+        return os.path.exists(self._entry_path(key))
+
+    def get(self, key: str) -> pd.DataFrame:
+        """
+        Returns the cached frame for a key, or None on a miss
+
+        Parameters:
+            key (str): the cache key
+
+        Returns:
+            pd.DataFrame: the cached frame or None
+        """
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            self._index["misses"] += 1
+            self._write_index()
+            logging.info(f"Dataset cache miss for key {key}")
+            return None
+
+        if self.file_format == "feather":
+            from pyarrow import feather
+            df = feather.read_table(path, memory_map=True).to_pandas()
+        else:
+            df = pd.read_parquet(path, memory_map=True)
+
+        # touch the entry so eviction treats it as recently used
+        os.utime(path)
+        self._index["hits"] += 1
+        self._write_index()
+        logging.info(f"Dataset cache hit for key {key}")
+        return df
+
+    def put(self, key: str, df: pd.DataFrame, file_path: str = None):
+        """
+        Writes a frame to the cache and evicts old entries if the cache is over budget
+
+        Parameters:
+            key (str): the cache key
+            df (pd.DataFrame): the frame to store
+            file_path (str): the source file, used to drop stale entries when it changes
+        """
+        path = self._entry_path(key)
+        if self.file_format == "feather":
+            # uncompressed Arrow IPC files can be memory-mapped on read
+            df.reset_index(drop=True).to_feather(path, compression="uncompressed")
+        else:
+            df.to_parquet(path, index=False)
+
+        if file_path is not None:
+            source_path = os.path.abspath(file_path)
+            stat = os.stat(file_path)
+            previous = self._index["sources"].get(source_path)
+            digest = self.source_digest(file_path)
+            if previous and previous["digest"] != digest:
+                # the source changed, entries built from the old content are stale
+                for stale_key in previous["keys"]:
+                    self._remove(stale_key)
+                previous = None
+            keys = previous["keys"] if previous else []
+            if key not in keys:
+                keys.append(key)
+            self._index["sources"][source_path] = {"digest": digest, "size": stat.st_size,
+                                                   "mtime_ns": stat.st_mtime_ns, "keys": keys}
+        self.evict()
+        self._write_index()
+
+    def _remove(self, key: str):
+        path = self._entry_path(key)
+        if os.path.exists(path):
+            os.remove(path)
+            logging.info(f"Removed dataset cache entry {key}")
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in max_bytes
+        """
+        suffix = f".{self.file_format}"
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(suffix)]
+        entries.sort(key=os.path.getmtime)
+        total = sum(os.path.getsize(path) for path in entries)
+        while entries and total > self.max_bytes:
+            path = entries.pop(0)
+            total -= os.path.getsize(path)
+            os.remove(path)
+            logging.info(f"Evicted dataset cache entry {os.path.basename(path)}")
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters and the current size of the cache
+
+        Returns:
+            dict: hits, misses, hit_rate, entries and bytes
+        """
+        suffix = f".{self.file_format}"
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(suffix)]
+        lookups = self._index["hits"] + self._index["misses"]
+        return {
+            "hits": self._index["hits"],
+            "misses": self._index["misses"],
+            "hit_rate": self._index["hits"] / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(os.path.getsize(path) for path in entries),
+        }
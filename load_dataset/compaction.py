@@ -0,0 +1,231 @@
+#***************************************************
+#**************** IMPORT LIBRARIES******************
+#***************************************************
+import logging
+import numpy as np
+import pandas as pd
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# pairs of strings that are read as True / False
+BOOLEAN_VALUES = {"yes": True, "no": False, "true": True, "false": False, "y": True, "n": False}
+
+# signed only, so differences between downcast columns cannot wrap around
+INTEGER_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+def smallest_integer_dtype(low, high) -> np.dtype:
+    """
+    Returns the smallest integer dtype able to hold every value in [low, high]
+
+    Parameters:
+        low, high: the range of the column
+
+    Returns:
+        np.dtype: the integer dtype
+    """
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+#*****************************************************************
+#************ Dtype inference and memory compaction **************
+#*****************************************************************
+
+class DtypeCompactor:
+    # Infers compact dtypes (bool, category, downcast integers and floats) from a sample of
+    # the data and applies them to whole frames or to a stream of chunks.
+    def __init__(self, sample_rows: int = 10_000, max_categories: int = 50, max_category_ratio: float = 0.5):
+        """
+        Parameters:
+            sample_rows (int): number of rows used to infer the dtypes
+            max_categories (int): object columns with at most this many distinct values become category
+            max_category_ratio (float): upper bound of distinct values / rows for a category column
+        """
+        self.sample_rows = sample_rows
+        self.max_categories = max_categories
+        self.max_category_ratio = max_category_ratio
+        self.plan_ = None
+        self._report = {}
+
+    def params(self) -> dict:
+        """
+        Returns the configuration of the compactor, without the inferred plan
+
+        Returns:
+            dict: sample_rows, max_categories and max_category_ratio
+        """
+        return {"sample_rows": self.sample_rows, "max_categories": self.max_categories,
+                "max_category_ratio": self.max_category_ratio}
+
+    def __repr__(self) -> str:
+        # cache keys include the repr of the loader options, so it holds the configuration only
+        # (no object address, no plan inferred by an earlier load)
+        return f"DtypeCompactor({', '.join(f'{name}={value!r}' for name, value in self.params().items())})"
+
+    def infer(self, sample: pd.DataFrame) -> dict:
+        """
+        Decides the target dtype of each column from a sample of the data
+
+        Parameters:
+            sample (pd.DataFrame): rows used for the inference
+
+        Returns:
+            dict: column -> (kind, parameter) with kind one of bool, category, integer, float.
+                Integers keep the (low, high) range of the sample and floats their target dtype.
+        """
+        plan = {}
+        for column in sample.columns:
+            series = sample[column]
+            if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_integer_dtype(series):
+                plan[column] = ("integer", (int(series.min()), int(series.max())) if len(series) else None)
+            elif pd.api.types.is_float_dtype(series):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                # float32 only when it is lossless on the sample
+                lossless = np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+                plan[column] = ("float", "float32" if lossless else "float64")
+            elif series.dtype == object or pd.api.types.is_string_dtype(series):
+                values = series.dropna().unique()
+                if len(values) and all(isinstance(value, str) and value.strip().lower() in BOOLEAN_VALUES for value in values):
+                    plan[column] = ("bool", {value: BOOLEAN_VALUES[value.strip().lower()] for value in values})
+                elif len(values) <= self.max_categories and len(values) <= self.max_category_ratio * len(series):
+                    plan[column] = ("category", sorted(values, key=str))
+        self.plan_ = plan
+        self._report = {}
+        logging.info(f"Inferred compact dtypes for {len(plan)} columns")
+        return plan
+
+    def _convert(self, column: str, series: pd.Series, fixed: bool = False) -> pd.Series:
+        # fixed: chunks of a stream, every chunk gets the planned dtype or raises, so the chunks
+        # concatenate without upcasting; otherwise the plan widens to fit the frame
+        kind, parameter = self.plan_[column]
+        if kind == "bool":
+            mapping = parameter
+            unseen = series.dropna()[~series.dropna().isin(list(mapping))]
+            if len(unseen):
+                if fixed:
+                    self._outside_plan(column, f"values outside {list(mapping)}")
+                logging.warning(f"Column '{column}' has values outside {list(mapping)}, left unchanged")
+                return series
+            converted = series.map(mapping)
+            if fixed:
+                return converted.astype("boolean")
+            return converted.astype(bool) if not converted.isna().any() else converted.astype("boolean")
+        if kind == "category":
+            known = set(parameter)
+            new_values = [value for value in series.dropna().unique() if value not in known]
+            if new_values and fixed:
+                self._outside_plan(column, f"categories {sorted(new_values, key=str)[:5]} not in the sample")
+            if new_values:
+                # the frame holds values past the sample, its categories grow with them
+                parameter = parameter + sorted(new_values, key=str)
+                self.plan_[column] = ("category", parameter)
+            return series.astype(pd.CategoricalDtype(parameter))
+        if kind == "integer":
+            observed = series.dropna()
+            if pd.api.types.is_float_dtype(observed) and (observed != np.round(observed)).any():
+                if fixed:
+                    self._outside_plan(column, "non-integer values")
+                logging.warning(f"Column '{column}' has non-integer values, left unchanged")
+                return series
+            if fixed:
+                # nullable, so chunks with and without missing values share the dtype
+                dtype = smallest_integer_dtype(*parameter) if parameter is not None else np.dtype(np.int64)
+                info = np.iinfo(dtype)
+                if len(observed) and (observed.min() < info.min or observed.max() > info.max):
+                    self._outside_plan(column, f"values outside the {dtype} range")
+                return series.astype(f"Int{dtype.itemsize * 8}")
+            if len(observed):
+                # the range grows to the whole frame, like the category list
+                low, high = parameter if parameter is not None else (observed.min(), observed.max())
+                parameter = (int(min(low, observed.min())), int(max(high, observed.max())))
+                self.plan_[column] = ("integer", parameter)
+            dtype = smallest_integer_dtype(*parameter) if parameter is not None else np.dtype(np.int8)
+            if series.hasnans:
+                return series.astype(f"Int{dtype.itemsize * 8}")
+            return series.astype(dtype)
+        if kind == "float":
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            if parameter == "float32":
+                compact = values.astype(np.float32)
+                if np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+                    return pd.Series(compact, index=series.index, name=series.name)
+                if fixed:
+                    self._outside_plan(column, "values float32 cannot hold exactly")
+                self.plan_[column] = ("float", "float64")
+            return pd.Series(values, index=series.index, name=series.name)
+        return series
+
+    def _outside_plan(self, column: str, reason: str):
+        raise ValueError(f"Column '{column}' has {reason}, the dtypes of a stream are fixed by its first "
+                         f"chunk; raise sample_rows or pass the column's dtype to the loader")
+
+    def apply(self, df: pd.DataFrame, fixed: bool = True) -> pd.DataFrame:
+        """
+        Converts the columns of a frame to the inferred dtypes and records the bytes saved.
+        The first chunk of a stream fixes the plan when none was inferred; every chunk then
+        gets exactly the planned dtypes (nullable integers and booleans, so missing values do
+        not change them) and a chunk that does not fit them raises a ValueError.
+
+        Parameters:
+            df (pd.DataFrame): the frame (or chunk) to compact
+            fixed (bool): keep the planned dtypes; False widens the plan to fit df instead
+
+        Returns:
+            pd.DataFrame: the compacted frame
+        """
+        if self.plan_ is None:
+            self.infer(df.head(self.sample_rows))
+
+        converted = {}
+        for column in df.columns:
+            if column not in self.plan_:
+                continue
+            before = df[column].memory_usage(index=False, deep=True)
+            series = self._convert(column, df[column], fixed)
+            after = series.memory_usage(index=False, deep=True)
+            converted[column] = series
+
+            entry = self._report.setdefault(column, {"from_dtype": str(df[column].dtype), "to_dtype": None,
+                                                     "bytes_before": 0, "bytes_after": 0})
+            entry["to_dtype"] = str(series.dtype)
+            entry["bytes_before"] += before
+            entry["bytes_after"] += after
+
+        if converted:
+            df = df.copy(deep=False)
+            for column, series in converted.items():
+                df[column] = series
+        return df
+
+    def compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Infers the dtypes from the first sample_rows rows and compacts the whole frame
+
+        Parameters:
+            df (pd.DataFrame): the frame to compact
+
+        Returns:
+            pd.DataFrame: the compacted frame
+        """
+        self.infer(df.head(self.sample_rows))
+        df = self.apply(df, fixed=False)
+        report = self.report()
+        logging.info(f"Compacted frame from {report['bytes_before'].sum()} to {report['bytes_after'].sum()} bytes")
+        return df
+
+    def report(self) -> pd.DataFrame:
+        """
+        Returns the memory used by each converted column before and after compaction
+
+        Returns:
+            pd.DataFrame: from_dtype, to_dtype, bytes_before, bytes_after and bytes_saved per column
+        """
+        report = pd.DataFrame.from_dict(self._report, orient="index",
+                                        columns=["from_dtype", "to_dtype", "bytes_before", "bytes_after"])
+        report["bytes_saved"] = report["bytes_before"] - report["bytes_after"]
+        return report
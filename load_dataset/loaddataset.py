@@ -1,9 +1,52 @@
 #***************************************************
 #**************** IMPORT LIBRARIES******************
 #***************************************************
+import io
+import logging
 import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+import numpy as np
 import pandas as pd 
+from load_dataset.cache import DatasetCache
+from load_dataset.compaction import DtypeCompactor
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# file types that can be read out of an archive
+SUPPORTED_EXTENSIONS = (".csv", ".json", ".xlsx")
+
+#***************************************************
+#******** Read a single member out of an archive ****
+#***************************************************
+
+def read_zip_member(file_path: str, member: str, usecols: list = None, dtype: dict = None) -> pd.DataFrame:
+    """
+    Reads one supported file straight out of a .zip archive without extracting it.
+    Defined at module level so it can be dispatched to worker processes.
+
+    Parameters:
+        file_path (str): path of the .zip file
+        member (str): name of the file inside the archive
+        usecols (list): columns to keep
+        dtype (dict): column -> dtype mapping
+
+    Returns:
+        DataFrame
+    """
+    with zipfile.ZipFile(file_path, 'r') as zip_ref:
+        with zip_ref.open(member) as file:
+            if member.endswith('.csv'):
+                return pd.read_csv(file, usecols=usecols, dtype=dtype)
+            elif member.endswith('.json'):
+                df = pd.read_json(file, dtype=dtype)
+            else:
+                df = pd.read_excel(io.BytesIO(file.read()), usecols=usecols, dtype=dtype)
+    if usecols is not None:
+        df = df[usecols]
+    return df
 
 #***************************************************
 #********ABSTRACT CLASS FOR DATASET LOADER**********
@@ -23,10 +66,31 @@ class LoadDataset():
 #*****************************************************************
 #***** implementation of concrete class for .Zip file loader ******
 #*****************************************************************
-class ZipDataset(LoadDataset):    
+class ZipDataset(LoadDataset):
+    def __init__(self, chunksize: int = None, usecols: list = None, dtype: dict = None,
+                 combine: bool = False, n_jobs: int = None, source_column: str = "source",
+                 compactor: DtypeCompactor = None):
+        """
+        Parameters:
+            chunksize (int): number of rows per DataFrame chunk yielded by stream()
+            usecols (list): columns to parse, everything else is skipped while reading
+            dtype (dict): column -> dtype mapping applied by the csv parser
+            combine (bool): read every supported member and concatenate them into one frame
+            n_jobs (int): number of worker processes used when combining, defaults to the core count
+            source_column (str): column holding the member name each row came from when combining
+            compactor (DtypeCompactor): optional pass converting the loaded data to compact dtypes
+        """
+        self.chunksize = chunksize
+        self.usecols = usecols
+        self.dtype = dtype
+        self.combine = combine
+        self.n_jobs = n_jobs
+        self.source_column = source_column
+        self.compactor = compactor
+
     def loader(self, file_path:str)-> pd.DataFrame:
         '''
-            Extract .zip files and return a pandas Dataframe
+            Reads the supported file of a .zip archive into a pandas Dataframe
             Parameters:
                 Takes file path of .zip files containing datasets as a string
             Returns:
@@ -36,51 +100,370 @@ class ZipDataset(LoadDataset):
         # check if file is .zip file
         if not file_path.endswith('.zip'):
             raise ValueError('File not a .zip File')
-        
-        #Extract the zip file to extracted data directory
+
+        if self.combine:
+            return self.load_members(file_path)
+
+        # the single supported member is read straight out of the archive with the configured
+        # columns and dtypes, nothing is extracted to disk
         with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall("extracted_data")
+            member = self.find_member(zip_ref)
 
-        # Find the extracted supported file
-        extracted_files = os.listdir("extracted_data")
-        csv_files = [file for file in extracted_files if file.endswith((".csv", ".json",".xlsx"))]
+        if self.chunksize and member.endswith('.csv'):
+            # parsed chunk by chunk, each chunk compacted before the next is read
+            return pd.concat(self.stream(file_path), ignore_index=True)
 
-        if len(csv_files)== 0:
-            raise FileNotFoundError ('No supported file found in extracted_data. Supported types : ".csv", ".json",".xlsx"')
-        elif len(csv_files) >1 :
+        df = read_zip_member(file_path, member, self.usecols, self.dtype)
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
+        return df
+
+    def find_members(self, zip_ref: zipfile.ZipFile) -> list:
+        '''
+            Returns the names of all supported files inside an open archive
+            Parameters:
+                zip_ref (zipfile.ZipFile): the opened archive
+            Returns:
+                list: names of the archive members
+        '''
+        members = [name for name in zip_ref.namelist()
+                   if not name.endswith('/') and name.endswith(SUPPORTED_EXTENSIONS)]
+
+        if len(members) == 0:
+            raise FileNotFoundError('No supported file found in archive. Supported types : ".csv", ".json",".xlsx"')
+        return members
+
+    def find_member(self, zip_ref: zipfile.ZipFile) -> str:
+        '''
+            Returns the name of the single supported file inside an open archive
+            Parameters:
+                zip_ref (zipfile.ZipFile): the opened archive
+            Returns:
+                str: name of the archive member
+        '''
+        members = self.find_members(zip_ref)
+        if len(members) > 1:
             raise ValueError("Muiltiple supported files found. Please specify which one to use")
+        return members[0]
+
+    def load_members(self, file_path: str) -> pd.DataFrame:
+        '''
+            Parses every supported member of the archive in parallel worker processes and
+            concatenates them into one frame with a column naming the source member.
+            Parameters:
+                file_path (str): path of the .zip file
+            Returns:
+                DataFrame
+        '''
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            members = self.find_members(zip_ref)
+
+        logging.info(f"Reading {len(members)} members from {file_path}")
+        if len(members) == 1:
+            frames = [read_zip_member(file_path, members[0], self.usecols, self.dtype)]
         else:
-            # read supported file into DataFrame
-            # select the first supported file in the extracted data directory
-            csv_files_path = os.path.join('extracted_data', csv_files[0])
-        
-        # load dataset and return a Dataframe
-        if csv_files_path.endswith(".csv"):
-            df=pd.read_csv(csv_files_path)
-        elif csv_files_path.endswith('.json'):
-            df=pd.read_json(csv_files_path)
-        elif csv_files_path.endswith(".xlxs"):
-            df=pd.read_excel(csv_files_path)
-
-        #Return the Dataframe
+            n_jobs = min(self.n_jobs or os.cpu_count(), len(members))
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                frames = list(executor.map(read_zip_member, [file_path] * len(members), members,
+                                           [self.usecols] * len(members), [self.dtype] * len(members)))
+
+        df = self.concat_members(frames, members)
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
         return df
+
+    def concat_members(self, frames: list, members: list) -> pd.DataFrame:
+        '''
+            Reconciles the schemas of the member frames and concatenates them
+            Parameters:
+                frames (list): one DataFrame per member
+                members (list): member names, used for the source column
+            Returns:
+                DataFrame
+        '''
+        # union of all columns, in the order they are first seen
+        columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+
+        for frame, member in zip(frames, members):
+            missing = [column for column in columns if column not in frame.columns]
+            if missing:
+                logging.warning(f"{member} is missing columns {missing}, filling with NaN")
+
+        # cast columns whose dtype differs between members to a common dtype up front
+        for column in columns:
+            dtypes = [frame[column].dtype for frame in frames if column in frame.columns]
+            if any(dtype != dtypes[0] for dtype in dtypes):
+                if all(isinstance(dtype, np.dtype) and dtype.kind in 'iuf' for dtype in dtypes):
+                    common = np.result_type(*dtypes)
+                else:
+                    common = object
+                logging.warning(f"Column '{column}' has dtypes {sorted(set(map(str, dtypes)))} across members, "
+                                f"casting to {common}")
+                for index, frame in enumerate(frames):
+                    if column in frame.columns:
+                        frames[index] = frame.astype({column: common})
+
+        df = pd.concat([frame.reindex(columns=columns) for frame in frames], ignore_index=True)
+        codes = np.repeat(np.arange(len(members)), [len(frame) for frame in frames])
+        df[self.source_column] = pd.Categorical.from_codes(codes, categories=members)
+        return df
+
+    def stream(self, file_path: str) -> Iterator[pd.DataFrame]:
+        '''
+            Reads the csv member straight out of the archive, without extracting it to disk,
+            and yields it as DataFrame chunks of `chunksize` rows. Only one chunk is held in
+            memory at a time.
+            Parameters:
+                file_path (str): path of the .zip file
+            Returns:
+                Iterator[pd.DataFrame]: DataFrame chunks
+        '''
+        if not file_path.endswith('.zip'):
+            raise ValueError('File not a .zip File')
+        if not self.chunksize:
+            raise ValueError('chunksize must be set to stream a .zip File')
+
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            member = self.find_member(zip_ref)
+            if not member.endswith('.csv'):
+                raise ValueError(f'Streaming is only supported for .csv files, found: {member}')
+
+            # the member is decompressed on the fly while the parser consumes it
+            with zip_ref.open(member) as file:
+                reader = pd.read_csv(file, chunksize=self.chunksize,
+                                     usecols=self.usecols, dtype=self.dtype)
+                for number, chunk in enumerate(reader):
+                    if self.compactor is not None:
+                        # dtypes are inferred on the first chunk and kept for the rest
+                        if number == 0:
+                            self.compactor.infer(chunk.head(self.compactor.sample_rows))
+                        chunk = self.compactor.apply(chunk)
+                    yield chunk
     
+#*****************************************************************
+#********** concrete loaders for plain and compressed csv ********
+#*****************************************************************
+class CsvDataset(LoadDataset):
+    def __init__(self, usecols: list = None, dtype: dict = None, compactor: DtypeCompactor = None):
+        """
+        Parameters:
+            usecols (list): columns to parse, everything else is skipped while reading
+            compactor (DtypeCompactor): optional pass converting the loaded data to compact dtypes
+            dtype (dict): column -> dtype mapping applied by the csv parser
+        """
+        self.usecols = usecols
+        self.dtype = dtype
+        self.compactor = compactor
+
+    def loader(self, file_path:str)-> pd.DataFrame:
+        '''
+            Reads a .csv file, gzip/bz2/xz compressed files are decompressed on the fly
+            Parameters:
+                Takes file path of the .csv file as a string
+            Returns:
+                DataFrame
+        '''
+        df = pd.read_csv(file_path, usecols=self.usecols, dtype=self.dtype, compression='infer')
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
+        return df
+
+#*****************************************************************
+#********** concrete loader for json-lines files *****************
+#*****************************************************************
+class JsonLinesDataset(LoadDataset):
+    def __init__(self, usecols: list = None, dtype: dict = None, compactor: DtypeCompactor = None):
+        """
+        Parameters:
+            usecols (list): columns to keep
+            compactor (DtypeCompactor): optional pass converting the loaded data to compact dtypes
+            dtype (dict): column -> dtype mapping
+        """
+        self.usecols = usecols
+        self.dtype = dtype
+        self.compactor = compactor
+
+    def loader(self, file_path:str)-> pd.DataFrame:
+        '''
+            Reads a json-lines file (one json record per line)
+            Parameters:
+                Takes file path of the .jsonl file as a string
+            Returns:
+                DataFrame
+        '''
+        df = pd.read_json(file_path, lines=True, dtype=self.dtype, compression='infer')
+        if self.usecols is not None:
+            df = df[self.usecols]
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
+        return df
+
+#*****************************************************************
+#********** concrete loaders for columnar files ******************
+#*****************************************************************
+class ParquetDataset(LoadDataset):
+    def __init__(self, columns: list = None, filters: list = None, compactor: DtypeCompactor = None):
+        """
+        Parameters:
+            columns (list): columns to read, other columns are never decoded
+            filters (list): row filters in pyarrow's (column, op, value) form,
+                row groups that cannot match are skipped
+            compactor (DtypeCompactor): optional pass converting the loaded data to compact dtypes
+        """
+        self.columns = columns
+        self.filters = filters
+        self.compactor = compactor
+
+    def loader(self, file_path:str)-> pd.DataFrame:
+        '''
+            Reads a .parquet file with column projection and predicate pushdown
+            Parameters:
+                Takes file path of the .parquet file as a string
+            Returns:
+                DataFrame
+        '''
+        df = pd.read_parquet(file_path, columns=self.columns, filters=self.filters)
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
+        return df
+
+class FeatherDataset(ParquetDataset):
+    def loader(self, file_path:str)-> pd.DataFrame:
+        '''
+            Reads a .feather (Arrow IPC) file with column projection and predicate pushdown
+            Parameters:
+                Takes file path of the .feather file as a string
+            Returns:
+                DataFrame
+        '''
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        dataset = ds.dataset(file_path, format='feather')
+        row_filter = pq.filters_to_expression(self.filters) if self.filters else None
+        df = dataset.to_table(columns=self.columns, filter=row_filter).to_pandas()
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
+        return df
+
+#*****************************************************************
+#********** concrete loader for excel files **********************
+#*****************************************************************
+class ExcelDataset(LoadDataset):
+    def __init__(self, compactor: DtypeCompactor = None):
+        """
+        Parameters:
+            compactor (DtypeCompactor): optional pass converting the loaded data to compact dtypes
+        """
+        self.compactor = compactor
+
+    def loader(self, file_path:str)-> pd.DataFrame:
+        '''
+            Reads the first sheet of an .xlsx file
+            Parameters:
+                Takes file path of the .xlsx file as a string
+            Returns:
+                DataFrame
+        '''
+        df = pd.read_excel(file_path)
+        if self.compactor is not None:
+            df = self.compactor.compact(df)
+        return df
+
+#*****************************************************************
+#********** Cached loader backed by the columnar dataset cache ***
+#*****************************************************************
+class CachedDataset(LoadDataset):
+    def __init__(self, dataset: LoadDataset, cache: DatasetCache):
+        """
+        Parameters:
+            dataset (LoadDataset): the loader used on a cache miss
+            cache (DatasetCache): the cache the parsed frames are stored in
+        """
+        self.dataset = dataset
+        self.cache = cache
+
+    def loader(self, file_path:str)-> pd.DataFrame:
+        '''
+            Returns the cached frame for the file, parsing it with the wrapped loader on a miss
+            Parameters:
+                Takes file path of the dataset as a string
+            Returns:
+                DataFrame
+        '''
+        members = None
+        if hasattr(self.dataset, 'find_members'):
+            with zipfile.ZipFile(file_path, 'r') as zip_ref:
+                members = self.dataset.find_members(zip_ref)
+
+        key = self.cache.make_key(file_path, members, type(self.dataset).__name__, sorted(vars(self.dataset).items()))
+        df = self.cache.get(key)
+        if df is None:
+            df = self.dataset.loader(file_path)
+            self.cache.put(key, df, file_path)
+        return df
+
 #*************************************************************************
 #************ Implementation Factory for Dataset Loader ******************
 #*************************************************************************
 class LoadDataFactory:
-    def get_data_loader(file_extension:str)-> LoadDataset:
+    # file extension -> LoadDataset subclass, extended with LoadDataFactory.register
+    _loaders = {
+        '.zip': ZipDataset,
+        '.csv': CsvDataset,
+        '.jsonl': JsonLinesDataset,
+        '.ndjson': JsonLinesDataset,
+        '.parquet': ParquetDataset,
+        '.feather': FeatherDataset,
+        '.xlsx': ExcelDataset,
+    }
+    # compression suffixes pandas decompresses on the fly, the extension before them picks the loader
+    _compressions = ('.gz', '.bz2', '.xz')
+
+    @staticmethod
+    def file_extension(file_path:str)-> str:
+        ''' Returns the extension selecting the loader of a file, looking through a compression suffix
+            Parameter:
+                file_path (str): the file name, or an extension such as .jsonl.gz
+            Returns:
+                str: e.g .jsonl for data.jsonl.gz, .csv for data.csv.bz2 and for a bare data.gz
+        '''
+        # the prefix keeps splitext from reading a bare extension (".jsonl") as a hidden file name
+        root, extension = os.path.splitext('_' + os.path.basename(file_path))
+        if extension.lower() not in LoadDataFactory._compressions:
+            return extension
+        return os.path.splitext(root)[1] or '.csv'
+
+    @staticmethod
+    def register(file_extension:str, loader_class:type):
+        ''' Registers a LoadDataset subclass for a file extension
+            Parameter:
+                file_extension (str): extension handled by the loader e.g .tsv
+                loader_class (type): subclass of LoadDataset
+        '''
+        if not issubclass(loader_class, LoadDataset):
+            raise TypeError(f'{loader_class.__name__} is not a LoadDataset')
+        LoadDataFactory._loaders[file_extension] = loader_class
+
+    @staticmethod
+    def get_data_loader(file_extension:str, cache: DatasetCache = None, **kwargs)-> LoadDataset:
         ''' Method takes a single parameter and check if it is of correct type and return a correct instanct of LoadData 
             Parameter:
-                file extention as a string e.g .zip
+                file extention as a string e.g .zip, compressed files pass the full extension e.g .jsonl.gz
+                cache (DatasetCache): optional cache, parsed frames are reused across runs when given
+                kwargs: options passed to the loader e.g usecols, columns, filters
 
             Returns:
-                Instance of class LoadDataset (in this case it returns ZipDataset)        
+                Instance of class LoadDataset registered for the extension
         '''
-        if file_extension=='.zip':
-            return ZipDataset()
-        else:
+        file_extension = LoadDataFactory.file_extension(file_extension)
+        if file_extension not in LoadDataFactory._loaders:
             raise ValueError(f'No Data Loader available for file extension: {file_extension}')
+        data_loader = LoadDataFactory._loaders[file_extension](**kwargs)
+
+        if cache is not None:
+            return CachedDataset(data_loader, cache)
+        return data_loader
 
 # Example Usage
 if __name__ == "__main__":
@@ -88,7 +471,7 @@ if __name__ == "__main__":
     file_path ="/Users/De/Documents/HexSoftwares/house_price_prediction/houseprice.zip"
 
     # Determine the file extension
-    file_extension = os.path.splitext(file_path)[1]
+    file_extension = LoadDataFactory.file_extension(file_path)
 
     ## Get appropriate Data Loader
     data_loader =LoadDataFactory.get_data_loader(file_extension)
@@ -97,5 +480,27 @@ if __name__ == "__main__":
 
     ## df contains the dataframe from Extracted csv
     print(df.head())
+
+    ## read only the columns and rows a pipeline uses from a parquet file
+    # data_loader = LoadDataFactory.get_data_loader('.parquet', columns=['price', 'area'], filters=[('area', '>', 2000)])
+    # df = data_loader.loader('houseprice.parquet')
+
+    ## concatenate every csv of a multi-member archive, parsed in parallel
+    # data_loader = ZipDataset(combine=True, n_jobs=4)
+    # df = data_loader.loader(file_path)
+
+    ## convert yes/no columns to bool, low-cardinality strings to category and downcast numbers
+    # compactor = DtypeCompactor()
+    # df = LoadDataFactory.get_data_loader(file_extension, compactor=compactor).loader(file_path)
+    # print(compactor.report())
+
+    ## reuse the parsed frame across runs, the cache is invalidated when the archive changes
+    # data_loader = LoadDataFactory.get_data_loader(file_extension, cache=DatasetCache(max_bytes=5 * 1024 ** 3))
+    # df = data_loader.loader(file_path)
+
+    ## stream the archive in chunks of 100_000 rows instead of extracting it
+    # data_loader = ZipDataset(chunksize=100_000, usecols=['price', 'area'], dtype={'area': 'int32'})
+    # for chunk in data_loader.stream(file_path):
+    #     print(chunk.shape)
     
 
@@ -1,9 +1,17 @@
 #  Importing Libraries 
+import json
 import logging
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
+from joblib import Parallel, delayed
+from scipy.stats import chi2
+from sklearn.covariance import MinCovDet
+from sklearn.ensemble import IsolationForest
+from typing import Iterable, Iterator
+from outlier_detection.sketches import StreamingSummary
+from outlier_detection.stats import ColumnStats
 
 # Setup logging configuration
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -12,18 +20,39 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 #************ Abstract Class for Outlier Detection ****************
 #******************************************************************
 class OutlierDetection():
-    
-    def detect_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
+    # quantile levels the strategy needs from ColumnStats
+    quantiles = ()
+    # per-column strategies derive their bounds from ColumnStats
+    uses_column_stats = True
+
+    def compute_bounds(self, stats: ColumnStats):
+        """
+        Abstract method returning the per-column bounds outside which a value is an outlier.
+
+        Parameters:
+        stats (ColumnStats): The statistics of the columns.
+
+        Returns:
+        lower, upper (np.ndarray): The lower and upper bound of each column.
+        """
+        pass
+
+    def detect_outliers(self, df: pd.DataFrame, stats: ColumnStats = None) -> pd.DataFrame:
         """
-        Abstract method to detect outliers in the given DataFrame.
+        Detects outliers in the given DataFrame with one vectorized comparison against the bounds.
 
         Parameters:
         df (pd.DataFrame): The dataframe containing features for outlier detection.
+        stats (ColumnStats): Precomputed statistics, computed from df when None.
 
         Returns:
         pd.DataFrame: A boolean dataframe indicating where outliers are located.
         """
-        pass
+        if stats is None:
+            stats = ColumnStats.from_frame(df, quantiles=self.quantiles)
+        lower, upper = self.compute_bounds(stats)
+        values = df.to_numpy(dtype=np.float64)
+        return pd.DataFrame((values < lower) | (values > upper), index=df.index, columns=df.columns)
 
 # *********************************************************************
 # ************ Z-Score Based Outlier Detection ************************
@@ -32,10 +61,13 @@ class ZScoreOutlierDetection(OutlierDetection):
     def __init__(self, threshold=3):
         self.threshold = threshold
 
-    def detect_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_bounds(self, stats: ColumnStats):
+        # |x - mean| / std > threshold  <=>  x outside mean -/+ threshold * std
+        return stats.mean - self.threshold * stats.std, stats.mean + self.threshold * stats.std
+
+    def detect_outliers(self, df: pd.DataFrame, stats: ColumnStats = None) -> pd.DataFrame:
         logging.info("Detecting outliers using the Z-score method.")
-        z_scores = np.abs((df - df.mean()) / df.std())
-        outliers = z_scores > self.threshold
+        outliers = super().detect_outliers(df, stats)
         logging.info(f"Outliers detected with Z-score threshold: {self.threshold}.")
         return outliers
 
@@ -43,15 +75,150 @@ class ZScoreOutlierDetection(OutlierDetection):
 # ********************** IQR Based Outlier Detection *******************************
 # **********************************************************************************
 class IQROutlierDetection(OutlierDetection):
-    def detect_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
-        logging.info("Detecting outliers using the IQR method.")
-        Q1 = df.quantile(0.25)
-        Q3 = df.quantile(0.75)
+    quantiles = (0.25, 0.75)
+
+    def __init__(self, multiplier=1.5):
+        self.multiplier = multiplier
+
+    def compute_bounds(self, stats: ColumnStats):
+        Q1 = stats.quantile(0.25)
+        Q3 = stats.quantile(0.75)
         IQR = Q3 - Q1
-        outliers = (df < (Q1 - 1.5 * IQR)) | (df > (Q3 + 1.5 * IQR))
+        return Q1 - self.multiplier * IQR, Q3 + self.multiplier * IQR
+
+    def detect_outliers(self, df: pd.DataFrame, stats: ColumnStats = None) -> pd.DataFrame:
+        logging.info("Detecting outliers using the IQR method.")
+        outliers = super().detect_outliers(df, stats)
         logging.info("Outliers detected using the IQR method.")
         return outliers
 
+# **********************************************************************************
+# ************ Abstract Class for Multivariate (Row-Level) Outlier Detection *******
+# **********************************************************************************
+class MultivariateOutlierDetection(OutlierDetection):
+    # Flags whole rows that are anomalous in combination (e.g. a small area with many bedrooms).
+    # The model is fitted on a random subsample and rows are scored in parallel batches.
+    uses_column_stats = False
+
+    def __init__(self, contamination=0.01, fit_sample_size=100_000, batch_size=100_000, n_jobs=-1, random_state=42):
+        """
+        Parameters:
+        contamination (float): The expected proportion of outlier rows.
+        fit_sample_size (int): The number of rows the model is fitted on, None fits on all rows.
+        batch_size (int): The number of rows scored per parallel task.
+        n_jobs (int): The number of parallel scoring jobs, -1 uses every core.
+        random_state (int): The seed for the subsample and the model.
+        """
+        self.contamination = contamination
+        self.fit_sample_size = fit_sample_size
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.model_ = None
+        self.threshold_ = None
+        # set by OutlierDetector.fit; until then detect_outliers refits on every frame it gets
+        self.prefit_ = False
+
+    def _fit_model(self, values: np.ndarray):
+        # Abstract: fits the model and sets threshold_ on the complete rows in values.
+        pass
+
+    def _score(self, values: np.ndarray) -> np.ndarray:
+        # Abstract: anomaly score of each row, higher is more anomalous.
+        pass
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Fits the model on a random subsample of the complete rows.
+
+        Parameters:
+        df (pd.DataFrame): The numeric dataframe.
+
+        Returns:
+        MultivariateOutlierDetection: The fitted strategy.
+        """
+        values = df.to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values).any(axis=1)]
+        if self.fit_sample_size is not None and len(values) > self.fit_sample_size:
+            rng = np.random.default_rng(self.random_state)
+            values = values[rng.choice(len(values), size=self.fit_sample_size, replace=False)]
+        logging.info(f"Fitting {type(self).__name__} on {len(values)} rows.")
+        self._fit_model(values)
+        return self
+
+    def score_samples(self, values: np.ndarray) -> np.ndarray:
+        """
+        Scores rows in parallel batches. Rows with missing values get a NaN score.
+
+        Parameters:
+        values (np.ndarray): The rows to score.
+
+        Returns:
+        np.ndarray: The anomaly score of each row.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        scores = np.full(len(values), np.nan)
+        complete = ~np.isnan(values).any(axis=1)
+        rows = values[complete]
+        if len(rows) <= self.batch_size:
+            scores[complete] = self._score(rows)
+        else:
+            batches = np.array_split(rows, -(-len(rows) // self.batch_size))
+            scores[complete] = np.concatenate(
+                Parallel(n_jobs=self.n_jobs)(delayed(self._score)(batch) for batch in batches))
+        return scores
+
+    def predict_mask(self, values: np.ndarray) -> np.ndarray:
+        # True for rows scored above the fitted threshold.
+        return self.score_samples(values) > self.threshold_
+
+    def detect_outliers(self, df: pd.DataFrame, stats: ColumnStats = None) -> pd.DataFrame:
+        logging.info(f"Detecting outliers using {type(self).__name__}.")
+        if not self.prefit_:
+            self.fit(df)
+        rows = self.predict_mask(df.to_numpy(dtype=np.float64))
+        # a row-level outlier is marked in every column so it works with handle_outliers
+        outliers = pd.DataFrame(np.repeat(rows[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+        logging.info(f"{int(rows.sum())} outlier rows detected.")
+        return outliers
+
+# **********************************************************************************
+# ********************** Isolation Forest Outlier Detection ************************
+# **********************************************************************************
+class IsolationForestOutlierDetection(MultivariateOutlierDetection):
+    def __init__(self, n_estimators=100, max_samples=256, **kwargs):
+        """
+        Parameters:
+        n_estimators (int): The number of isolation trees.
+        max_samples (int): The number of rows each tree is grown on.
+        kwargs: contamination, fit_sample_size, batch_size, n_jobs and random_state.
+        """
+        super().__init__(**kwargs)
+        self.n_estimators = n_estimators
+        self.max_samples = max_samples
+
+    def _fit_model(self, values: np.ndarray):
+        self.model_ = IsolationForest(n_estimators=self.n_estimators, max_samples=min(self.max_samples, len(values)),
+                                      random_state=self.random_state, n_jobs=self.n_jobs).fit(values)
+        self.threshold_ = np.quantile(self._score(values), 1 - self.contamination)
+
+    def _score(self, values: np.ndarray) -> np.ndarray:
+        return -self.model_.score_samples(values)
+
+# **********************************************************************************
+# ************** Robust Mahalanobis Distance Outlier Detection *********************
+# **********************************************************************************
+class MahalanobisOutlierDetection(MultivariateOutlierDetection):
+    # Squared Mahalanobis distance from a robust (Minimum Covariance Determinant) location and
+    # covariance; rows beyond the chi-square quantile at 1 - contamination are outliers.
+    def _fit_model(self, values: np.ndarray):
+        self.model_ = MinCovDet(random_state=self.random_state).fit(values)
+        self.threshold_ = chi2.ppf(1 - self.contamination, df=values.shape[1])
+
+    def _score(self, values: np.ndarray) -> np.ndarray:
+        centered = values - self.model_.location_
+        return np.einsum("ij,jk,ik->i", centered, self.model_.get_precision(), centered)
+
 # ****************************************************************************
 # ************ Class for Outlier Detection and Handling **********************
 # ****************************************************************************
@@ -63,23 +230,192 @@ class OutlierDetector:
         strategy (OutlierDetection): The Outlier Detection strategy.
         """
         self._strategy = strategy
+        self.columns_ = None
+        self.bounds_ = None
+        self.cap_bounds_ = None
 
     def set_strategy(self, strategy: OutlierDetection):
         logging.info("Switching outlier detection strategy.")
         self._strategy = strategy
+        self.columns_ = None
+        self.bounds_ = None
+        self.cap_bounds_ = None
+
+    def fit(self, df: pd.DataFrame):
+        """Computes the per-column outlier bounds and capping bounds once, so they can be
+        reused by transform on other frames or single listings.
 
-    def detect_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
+        Parameters:
+        df (pd.DataFrame): The numeric training dataframe.
+
+        Returns:
+        OutlierDetector: The fitted detector.
+        """
+        logging.info("Fitting outlier bounds.")
+        stats = ColumnStats.from_frame(df, quantiles=tuple(self._strategy.quantiles) + (0.01, 0.99))
+        if not self._strategy.uses_column_stats:
+            self._strategy.fit(df)
+            # later frames are scored with this model instead of a model of their own
+            self._strategy.prefit_ = True
+        return self._set_bounds(stats)
+
+    def fit_summary(self, summary: StreamingSummary):
+        """Computes the bounds from a streaming summary instead of an in-memory frame.
+
+        Parameters:
+        summary (StreamingSummary): The summary fitted on the training data.
+
+        Returns:
+        OutlierDetector: The fitted detector.
+        """
+        logging.info("Fitting outlier bounds from a streaming summary.")
+        stats = summary.to_stats(quantiles=tuple(self._strategy.quantiles) + (0.01, 0.99))
+        return self._set_bounds(stats)
+
+    def _set_bounds(self, stats: ColumnStats):
+        self.columns_ = list(stats.columns)
+        if self._strategy.uses_column_stats:
+            lower, upper = self._strategy.compute_bounds(stats)
+        else:
+            # row-level strategies keep their fitted model, the bounds never reject a value
+            lower, upper = np.full(len(stats.columns), -np.inf), np.full(len(stats.columns), np.inf)
+        # row 0 holds the lower bounds, row 1 the upper bounds, one column per feature
+        self.bounds_ = np.vstack([lower, upper]).astype(np.float64)
+        self.cap_bounds_ = np.vstack([stats.quantile(0.01), stats.quantile(0.99)]).astype(np.float64)
+        return self
+
+    def _check_fitted(self):
+        if self.bounds_ is None:
+            raise ValueError("OutlierDetector is not fitted, call fit() first.")
+
+    def outlier_mask(self, values: np.ndarray) -> np.ndarray:
+        """Flags rows with at least one value outside the fitted bounds.
+
+        Parameters:
+        values (np.ndarray): A row or a 2D array of rows, in the order of columns_.
+
+        Returns:
+        np.ndarray: True for outlier rows (a scalar bool for a single row).
+        """
+        self._check_fitted()
+        if not self._strategy.uses_column_stats:
+            mask = self._strategy.predict_mask(values)
+            return mask[0] if np.ndim(values) == 1 else mask
+        return ((values < self.bounds_[0]) | (values > self.bounds_[1])).any(axis=-1)
+
+    def transform(self, data, method="remove"):
+        """Applies the fitted bounds with a single vectorized comparison.
+
+        Parameters:
+        data (pd.DataFrame, dict or np.ndarray): A frame, a single listing as a dict, or rows
+            ordered as columns_.
+        method (str): "remove" drops outlier rows (a single listing or row becomes None), "cap" clips
+            values to the fitted 1%/99% quantiles and "flag" returns the outlier mask.
+
+        Returns:
+        The data with outliers handled, in the same form it was given.
+        """
+        self._check_fitted()
+        if isinstance(data, dict):
+            values = np.fromiter((data[column] for column in self.columns_), dtype=np.float64, count=len(self.columns_))
+        elif isinstance(data, pd.DataFrame):
+            values = data[self.columns_].to_numpy(dtype=np.float64)
+        else:
+            values = np.asarray(data, dtype=np.float64)
+
+        if method == "flag":
+            return self.outlier_mask(values)
+        if method == "remove":
+            # a single row is checked as a one-row batch and, like a dict, kept or dropped whole
+            mask = self.outlier_mask(np.atleast_2d(values))
+            if isinstance(data, dict) or values.ndim == 1:
+                return None if mask[0] else data
+            if isinstance(data, (pd.DataFrame, np.ndarray)):
+                return data[~mask]
+            return [row for row, outlier in zip(data, mask) if not outlier]
+        if method == "cap":
+            capped = np.clip(values, self.cap_bounds_[0], self.cap_bounds_[1])
+            if isinstance(data, dict):
+                return {**data, **dict(zip(self.columns_, capped.tolist()))}
+            if isinstance(data, pd.DataFrame):
+                data = data.copy()
+                data[self.columns_] = capped
+                return data
+            return capped
+        logging.warning(f"Unknown method '{method}'. No outlier handling performed.")
+        return data
+
+    def to_dict(self) -> dict:
+        """Returns the fitted bounds as plain JSON-serializable values.
+
+        Returns:
+        dict: The strategy, its parameters, the columns and the bounds.
+        """
+        self._check_fitted()
+        if not self._strategy.uses_column_stats:
+            raise ValueError(f"{type(self._strategy).__name__} holds a fitted model and cannot be serialized to JSON.")
+        return {
+            "strategy": type(self._strategy).__name__,
+            "params": vars(self._strategy),
+            "columns": self.columns_,
+            "bounds": self.bounds_.tolist(),
+            "cap_bounds": self.cap_bounds_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "OutlierDetector":
+        """Rebuilds a fitted detector from to_dict() output.
+
+        Parameters:
+        state (dict): The serialized detector.
+
+        Returns:
+        OutlierDetector: The fitted detector.
+        """
+        strategy = globals()[state["strategy"]](**state["params"])
+        detector = cls(strategy)
+        detector.columns_ = list(state["columns"])
+        detector.bounds_ = np.asarray(state["bounds"], dtype=np.float64)
+        detector.cap_bounds_ = np.asarray(state["cap_bounds"], dtype=np.float64)
+        return detector
+
+    def save(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path: str) -> "OutlierDetector":
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
+
+    def detect_outliers(self, df: pd.DataFrame, stats: ColumnStats = None) -> pd.DataFrame:
         logging.info("Executing outlier detection strategy.")
-        return self._strategy.detect_outliers(df)
+        return self._strategy.detect_outliers(df, stats)
+
+    def keep_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Flags the rows handle_outliers(method="remove") keeps.
+
+        Parameters:
+        df (pd.DataFrame): The numeric columns to check.
+
+        Returns:
+        np.ndarray: Positional boolean mask, True for rows without outliers; unlike index
+            labels it stays exact when the index has repeated labels.
+        """
+        # the statistics are computed once and handed to the strategy
+        stats = ColumnStats.from_frame(df, quantiles=self._strategy.quantiles) if self._strategy.uses_column_stats else None
+        outliers = self.detect_outliers(df, stats)
+        return (~outliers.to_numpy()).all(axis=1)
 
     def handle_outliers(self, df: pd.DataFrame, method="remove", **kwargs) -> pd.DataFrame:
-        outliers = self.detect_outliers(df)
         if method == "remove":
+            keep = self.keep_mask(df)
             logging.info("Removing outliers from the dataset.")
-            df_cleaned = df[(~outliers).all(axis=1)]
+            df_cleaned = df[keep]
         elif method == "cap":
+            stats = ColumnStats.from_frame(df, quantiles=(0.01, 0.99))
             logging.info("Capping outliers in the dataset.")
-            df_cleaned = df.clip(lower=df.quantile(0.01), upper=df.quantile(0.99), axis=1)
+            df_cleaned = df.clip(lower=stats.quantile(0.01), upper=stats.quantile(0.99), axis=1)
         else:
             logging.warning(f"Unknown method '{method}'. No outlier handling performed.")
             return df
@@ -87,6 +423,46 @@ class OutlierDetector:
         logging.info("Outlier handling completed.")
         return df_cleaned
 
+    def summarize(self, chunks: Iterable[pd.DataFrame], compression: float = 200) -> StreamingSummary:
+        """Fits a mergeable streaming summary over numeric chunks, holding one chunk at a time.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The numeric chunks, e.g. from ZipDataset.stream.
+        compression (float): Compression of the quantile sketches.
+
+        Returns:
+        StreamingSummary: Summaries from several workers can be combined with merge().
+        """
+        logging.info("Summarizing chunks for outlier thresholds.")
+        summary = StreamingSummary(compression)
+        for chunk in chunks:
+            summary.update(chunk)
+        return summary
+
+    def handle_outliers_stream(self, chunks: Iterable[pd.DataFrame], summary: StreamingSummary,
+                               method="remove") -> Iterator[pd.DataFrame]:
+        """Handles outliers chunk by chunk with thresholds taken from a streaming summary, so
+        data that does not fit in memory can be cleaned in a second pass.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The numeric chunks to clean.
+        summary (StreamingSummary): The summary fitted on the full data.
+        method (str): "remove" or "cap", as in handle_outliers.
+
+        Returns:
+        Iterator[pd.DataFrame]: The cleaned chunks.
+        """
+        stats = summary.to_stats(quantiles=tuple(self._strategy.quantiles) + (0.01, 0.99))
+        for chunk in chunks:
+            if method == "remove":
+                outliers = self.detect_outliers(chunk, stats)
+                yield chunk[(~outliers.to_numpy()).all(axis=1)]
+            elif method == "cap":
+                yield chunk.clip(lower=stats.quantile(0.01), upper=stats.quantile(0.99), axis=1)
+            else:
+                logging.warning(f"Unknown method '{method}'. No outlier handling performed.")
+                yield chunk
+
     def visualize_outliers(self, df: pd.DataFrame, features: list):
         logging.info(f"Visualizing outliers for features: {features}")
         for feature in features:
@@ -111,6 +487,21 @@ if __name__ == "__main__":
     # df_cleaned = outlier_detector.handle_outliers(df_numeric, method="remove")
 
     # print(df_cleaned.shape)
+
+    # # Flag houses that are only anomalous in combination, fitted on a 100k row subsample
+    # outlier_detector.set_strategy(MahalanobisOutlierDetection(contamination=0.01, fit_sample_size=100_000))
+    # df_cleaned = outlier_detector.handle_outliers(df_numeric, method="remove")
+
+    # # Fit the bounds on the training data and check single listings at serving time
+    # outlier_detector.fit(df_numeric).save("outlier_bounds.json")
+    # serving_detector = OutlierDetector.load("outlier_bounds.json")
+    # serving_detector.transform({"price": 13300000, "area": 7420}, method="flag")
+
+    # # Out-of-core: fit thresholds on one pass over the chunks, clean them on a second pass
+    # chunks = ZipDataset(chunksize=100_000, usecols=['price', 'area'])
+    # summary = outlier_detector.summarize(chunks.stream(path))
+    # for chunk in outlier_detector.handle_outliers_stream(chunks.stream(path), summary):
+    #     ...
     # # Visualize outliers in specific features
     # # outlier_detector.visualize_outliers(df_cleaned, features=["SalePrice", "Gr Liv Area"])
     pass
@@ -0,0 +1,273 @@
+#  Importing Libraries
+import logging
+import numpy as np
+import pandas as pd
+from outlier_detection.stats import ColumnStats
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# *****************************************************************
+# ************ Mergeable Quantile Sketch (t-digest) ***************
+# *****************************************************************
+class TDigest:
+    # Approximates the distribution of a column with weighted centroids. Centroids near the
+    # median are wide and centroids in the tails are narrow (arcsine scale function), so the
+    # extreme quantiles used for outlier thresholds are the most accurate.
+    #
+    # Error bound: a centroid at quantile q covers at most pi * sqrt(q * (1 - q)) / compression
+    # of the rank range, and an estimate is interpolated between neighbouring centroids, so the
+    # rank error of quantile(q) stays within about that width (~0.0016 at q=0.01 and
+    # ~0.0068 at q=0.25 for compression=200). The minimum and maximum are exact.
+    def __init__(self, compression: float = 200):
+        """
+        Parameters:
+        compression (float): Roughly the number of centroids kept, higher is more accurate.
+        """
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray, weights: np.ndarray = None) -> "TDigest":
+        """
+        Adds a batch of values to the sketch, NaN values are ignored.
+
+        Parameters:
+        values (np.ndarray): The values to add.
+        weights (np.ndarray): How often each value occurs, e.g. the counts of distinct values.
+
+        Returns:
+        TDigest: The updated sketch.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.ones(values.size) if weights is None else np.asarray(weights, dtype=np.float64)
+        observed = ~np.isnan(values)
+        values, weights = values[observed], weights[observed]
+        if values.size:
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, weights]))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """
+        Merges another sketch, e.g. one fitted by a different worker, into this one.
+
+        Parameters:
+        other (TDigest): The sketch to merge.
+
+        Returns:
+        TDigest: The merged sketch.
+        """
+        if other.weights.size:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        # points whose scaled quantile falls in the same unit interval form one centroid
+        k = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Estimates one or more quantiles.
+
+        Parameters:
+        q (float or array): The quantile levels in [0, 1].
+
+        Returns:
+        np.ndarray: The estimated quantiles, NaN when the sketch is empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if not self.weights.size:
+            return np.full(q.shape, np.nan)
+        cumulative = np.cumsum(self.weights)
+        positions = (cumulative - self.weights / 2) / cumulative[-1]
+        return np.interp(q, np.r_[0.0, positions, 1.0], np.r_[self.min, self.means, self.max])
+
+    def to_dict(self) -> dict:
+        # plain JSON-serializable state, an empty sketch stores no min/max
+        empty = not self.weights.size
+        return {"compression": self.compression, "means": self.means.tolist(), "weights": self.weights.tolist(),
+                "min": None if empty else float(self.min), "max": None if empty else float(self.max)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "TDigest":
+        digest = cls(state["compression"])
+        digest.means = np.asarray(state["means"], dtype=np.float64)
+        digest.weights = np.asarray(state["weights"], dtype=np.float64)
+        if state["min"] is not None:
+            digest.min, digest.max = state["min"], state["max"]
+        return digest
+
+# *****************************************************************
+# ************ Mergeable Distinct Count Sketch (HyperLogLog) ******
+# *****************************************************************
+class HyperLogLog:
+    # Estimates the number of distinct values with 2 ** precision one-byte registers. Each
+    # value is hashed, the first `precision` bits pick a register and the register keeps the
+    # longest run of leading zeros seen in the remaining bits. Two sketches merge by taking
+    # the register-wise maximum. The relative standard error is 1.04 / sqrt(2 ** precision),
+    # about 1.6% for precision=12 (4 KB).
+    def __init__(self, precision: int = 12):
+        """
+        Parameters:
+        precision (int): Number of hash bits used to pick a register, between 4 and 18.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values) -> "HyperLogLog":
+        """
+        Adds values to the sketch. Adding a value again does not change the sketch, so it is
+        enough to pass the distinct values of a batch.
+
+        Parameters:
+        values (array-like): The values to add, missing values included.
+
+        Returns:
+        HyperLogLog: The updated sketch.
+        """
+        values = np.asarray(values)
+        if not values.size:
+            return self
+        hashes = pd.util.hash_array(values if values.dtype != object else values.astype(str))
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # remaining bits, with a guard bit so the run of zeros is at most 64 - precision
+        rest = (hashes << np.uint64(self.precision)) | np.uint64(1 << (self.precision - 1))
+        high, low = (rest >> np.uint64(32)).astype(np.float64), (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        # position of the highest set bit, from exact 32-bit halves
+        with np.errstate(divide="ignore"):
+            highest = np.where(high > 0, 32 + np.floor(np.log2(high)), np.floor(np.log2(low)))
+        rank = (64 - highest).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Sketches must have the same precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> float:
+        """
+        Estimates the number of distinct values added.
+
+        Returns:
+        float: The estimate, with linear counting for small cardinalities.
+        """
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            return float(m * np.log(m / zeros))
+        return float(estimate)
+
+    def to_dict(self) -> dict:
+        return {"precision": self.precision, "registers": self.registers.tolist()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HyperLogLog":
+        sketch = cls(state["precision"])
+        sketch.registers = np.asarray(state["registers"], dtype=np.uint8)
+        return sketch
+
+# *****************************************************************
+# ************ Streaming Column Summary ***************************
+# *****************************************************************
+class StreamingSummary:
+    # Per-column count, mean and variance (Welford / Chan's parallel update) plus a t-digest,
+    # fitted one chunk at a time and mergeable across workers.
+    def __init__(self, compression: float = 200):
+        """
+        Parameters:
+        compression (float): Compression of the per-column t-digests.
+        """
+        self.compression = compression
+        self.columns = None
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        self.digests = None
+
+    def _combine(self, columns, count, mean, m2, digests):
+        if self.columns is None:
+            self.columns = pd.Index(columns)
+            self.count, self.mean, self.m2, self.digests = count, mean, m2, digests
+            return
+        if not self.columns.equals(pd.Index(columns)):
+            raise ValueError("Summaries must be fitted on the same columns")
+        total = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + m2 + delta ** 2 * self.count * count / total, 0.0)
+        self.count = total
+        for digest, other in zip(self.digests, digests):
+            digest.merge(other)
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingSummary":
+        """
+        Adds a chunk of numeric data to the summary.
+
+        Parameters:
+        chunk (pd.DataFrame): The numeric chunk.
+
+        Returns:
+        StreamingSummary: The updated summary.
+        """
+        values = chunk.to_numpy(dtype=np.float64)
+        count = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        digests = [TDigest(self.compression).update(values[:, position]) for position in range(values.shape[1])]
+        self._combine(chunk.columns, count, mean, m2, digests)
+        return self
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        """
+        Merges a summary fitted on other chunks into this one.
+
+        Parameters:
+        other (StreamingSummary): The summary to merge.
+
+        Returns:
+        StreamingSummary: The merged summary.
+        """
+        if other.columns is not None:
+            self._combine(other.columns, other.count, other.mean, other.m2, other.digests)
+        return self
+
+    def to_stats(self, quantiles=(0.25, 0.75)) -> ColumnStats:
+        """
+        Returns the summary as ColumnStats so the outlier strategies can compute their bounds.
+
+        Parameters:
+        quantiles (tuple): The quantile levels to estimate.
+
+        Returns:
+        ColumnStats: Exact mean and std, approximate quantiles.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+        levels = {q: np.array([digest.quantile(q) for digest in self.digests]) for q in quantiles}
+        return ColumnStats(self.columns, self.mean.copy(), std, levels)
@@ -0,0 +1,85 @@
+#  Importing Libraries
+import logging
+import numpy as np
+import pandas as pd
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# *****************************************************************
+# ************ Column Statistics Computed in One Pass *************
+# *****************************************************************
+class ColumnStats:
+    # Holds the per-column mean, standard deviation and quantiles of a numeric frame.
+    # Everything is computed from one contiguous float array, the quantiles with a single
+    # np.partition call for all requested levels instead of one sort per quantile.
+    def __init__(self, columns, mean: np.ndarray, std: np.ndarray, quantiles: dict):
+        """
+        Parameters:
+        columns (pd.Index): The columns the statistics belong to.
+        mean (np.ndarray): Mean of each column.
+        std (np.ndarray): Sample standard deviation (ddof=1) of each column.
+        quantiles (dict): Quantile level -> array of that quantile for each column.
+        """
+        self.columns = pd.Index(columns)
+        self.mean = mean
+        self.std = std
+        self.quantiles = quantiles
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, quantiles=(0.25, 0.75)) -> "ColumnStats":
+        """
+        Computes the statistics of every column of a numeric DataFrame.
+
+        Parameters:
+        df (pd.DataFrame): The numeric dataframe.
+        quantiles (tuple): The quantile levels to compute.
+
+        Returns:
+        ColumnStats: The statistics, quantiles use linear interpolation like DataFrame.quantile.
+        """
+        logging.info(f"Computing column statistics for {df.shape[1]} columns.")
+        # one column per row of a C-ordered array keeps every column contiguous
+        values = np.ascontiguousarray(df.to_numpy(dtype=np.float64).T)
+        quantiles = tuple(sorted(set(quantiles)))
+
+        if np.isnan(values).any():
+            mean = np.nanmean(values, axis=1)
+            std = np.nanstd(values, axis=1, ddof=1)
+            levels = {q: np.empty(len(values)) for q in quantiles}
+            for position, column in enumerate(values):
+                column_quantiles = _partition_quantiles(column[~np.isnan(column)], quantiles)
+                for q in quantiles:
+                    levels[q][position] = column_quantiles[q]
+        else:
+            mean = values.mean(axis=1)
+            std = values.std(axis=1, ddof=1)
+            levels = _partition_quantiles(values, quantiles)
+
+        return cls(df.columns, mean, std, levels)
+
+    def quantile(self, q: float) -> np.ndarray:
+        if q not in self.quantiles:
+            raise KeyError(f"Quantile {q} was not computed, available: {sorted(self.quantiles)}")
+        return self.quantiles[q]
+
+def _partition_quantiles(values: np.ndarray, quantiles: tuple) -> dict:
+    # Linearly interpolated quantiles along the last axis from one partial sort.
+    n = values.shape[-1]
+    if not quantiles:
+        return {}
+    if n == 0:
+        shape = values.shape[:-1]
+        return {q: np.full(shape, np.nan) for q in quantiles}
+
+    positions = {q: q * (n - 1) for q in quantiles}
+    kth = sorted({int(np.floor(p)) for p in positions.values()} | {int(np.ceil(p)) for p in positions.values()})
+    partitioned = np.partition(values, kth, axis=-1)
+
+    result = {}
+    for q, position in positions.items():
+        low, high = int(np.floor(position)), int(np.ceil(position))
+        fraction = position - low
+        lower = partitioned[..., low]
+        result[q] = lower + (partitioned[..., high] - lower) * fraction
+    return result
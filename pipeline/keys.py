@@ -0,0 +1,26 @@
+# Importing Libraries
+import hashlib
+
+# Cache key helpers shared by the pipeline stages and other cached results (e.g. correlations).
+# They only depend on hashlib, so importing them does not load the pipeline stages.
+
+def strategy_params(strategy) -> list:
+    """
+    Returns the configuration of a strategy: its attributes without fitted state (names
+    ending in "_") and private attributes, sorted by name.
+
+    Parameters:
+    strategy: The strategy object.
+
+    Returns:
+    list: (name, value) pairs.
+    """
+    return sorted((name, value) for name, value in vars(strategy).items()
+                  if not name.startswith("_") and not name.endswith("_"))
+
+def stage_key(input_key: str, *parts) -> str:
+    # blake2b of the input key and the repr of every part, as in DatasetCache.make_key
+    digest = hashlib.blake2b(input_key.encode(), digest_size=20)
+    for part in parts:
+        digest.update(repr(part).encode())
+    return digest.hexdigest()
@@ -0,0 +1,290 @@
+# Importing Libraries
+import logging
+import time
+import numpy as np
+import pandas as pd
+from data_handling.handling_missing_values import HandlingMissing, MissingValueHandler
+from data_splitting.data_splitter import CrossValidationSplitting, DataSplitter, DataSplitting, LazySplit
+from load_dataset.cache import DatasetCache
+from load_dataset.loaddataset import LoadDataFactory
+from outlier_detection.outlier_detection import OutlierDetection, OutlierDetector
+from pipeline.keys import stage_key, strategy_params
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# column holding a non-default index while a frame is cached, Feather files have no index
+INDEX_COLUMN = "__index__"
+
+# ***************************************************************
+# ************ Abstract Class for Pipeline Stages ***************
+# ***************************************************************
+
+class PipelineStage():
+    # A stage turns the output of the previous stage into its own output. Its cache key is
+    # derived from the input key and its parameters only, so the keys of a whole pipeline are
+    # known before anything runs.
+
+    # set when decode needs the stage input in addition to the cached frame
+    needs_input = False
+
+    def params(self) -> list:
+        """
+        Abstract method returning the values that change the output of the stage.
+
+        Returns:
+        list: Values whose repr goes into the cache key.
+        """
+        pass
+
+    def key(self, input_key: str) -> str:
+        return stage_key(input_key, type(self).__name__, self.params())
+
+    def run(self, data):
+        """
+        Abstract method computing the output of the stage.
+
+        Parameters:
+        data: The output of the previous stage, None for the first stage.
+
+        Returns:
+        The stage output.
+        """
+        pass
+
+    def encode(self, output) -> pd.DataFrame:
+        # Output -> frame stored in the cache
+        if not isinstance(output.index, pd.RangeIndex) or output.index.start != 0 or output.index.step != 1:
+            return output.reset_index(names=INDEX_COLUMN)
+        return output
+
+    def decode(self, frame: pd.DataFrame, data):
+        # Cached frame -> output, data is the stage input when needs_input is set
+        if INDEX_COLUMN in frame.columns:
+            frame = frame.set_index(INDEX_COLUMN)
+            frame.index.name = None
+        return frame
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+# ***************************************************************
+# ******************* Loading Stage *****************************
+# ***************************************************************
+
+class LoadStage(PipelineStage):
+    # Loads the dataset through LoadDataFactory. The key starts from the content hash of the
+    # file, so editing the file invalidates every stage built on it.
+    def __init__(self, file_path: str, **loader_kwargs):
+        """
+        Parameters:
+        file_path (str): The dataset file, its extension selects the loader.
+        loader_kwargs: Options passed to the loader e.g. usecols, columns, filters.
+        """
+        self.file_path = file_path
+        self.loader_kwargs = loader_kwargs
+
+    def params(self) -> list:
+        return [LoadDataFactory.file_extension(self.file_path), sorted(self.loader_kwargs.items())]
+
+    def source_key(self, cache: DatasetCache) -> str:
+        return cache.source_digest(self.file_path)
+
+    def run(self, data) -> pd.DataFrame:
+        data_loader = LoadDataFactory.get_data_loader(LoadDataFactory.file_extension(self.file_path), **self.loader_kwargs)
+        return data_loader.loader(self.file_path)
+
+# ***************************************************************
+# ******************* Missing Value Stage ***********************
+# ***************************************************************
+
+class MissingValueStage(PipelineStage):
+    # Runs a HandlingMissing strategy through MissingValueHandler.
+    def __init__(self, strategy: HandlingMissing):
+        self.strategy = strategy
+
+    def params(self) -> list:
+        return [type(self.strategy).__name__, strategy_params(self.strategy)]
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        return MissingValueHandler(self.strategy).handle_missing_values(data)
+
+    @property
+    def name(self) -> str:
+        return f"{type(self).__name__}({type(self.strategy).__name__})"
+
+# ***************************************************************
+# ******************* Outlier Stage *****************************
+# ***************************************************************
+
+class OutlierStage(PipelineStage):
+    # Runs an OutlierDetection strategy through OutlierDetector on the numeric columns; the
+    # other columns are kept and follow the removed or capped rows.
+    def __init__(self, strategy: OutlierDetection, method: str = "remove", columns: list = None):
+        """
+        Parameters:
+        strategy (OutlierDetection): The outlier detection strategy.
+        method (str): "remove" or "cap", as in OutlierDetector.handle_outliers.
+        columns (list): The columns checked for outliers, all numeric columns when None.
+        """
+        self.strategy = strategy
+        self.method = method
+        self.columns = columns
+
+    def params(self) -> list:
+        return [type(self.strategy).__name__, strategy_params(self.strategy), self.method, self.columns]
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        columns = self.columns if self.columns is not None else data.select_dtypes(include="number").columns
+        detector = OutlierDetector(self.strategy)
+        if self.method == "remove":
+            # positional, so repeated index labels (e.g. after concatenating chunks) stay exact
+            return data[detector.keep_mask(data[columns])]
+        cleaned = detector.handle_outliers(data[columns], method=self.method)
+        data = data.copy()
+        data[columns] = cleaned
+        return data
+
+    @property
+    def name(self) -> str:
+        return f"{type(self).__name__}({type(self.strategy).__name__})"
+
+# ***************************************************************
+# ******************* Splitting Stage ***************************
+# ***************************************************************
+
+class SplitStage(PipelineStage):
+    # Splits with a DataSplitting strategy. Only the row positions are cached, the output is
+    # a LazySplit (a list of them for cross-validation) over the stage input.
+    needs_input = True
+
+    def __init__(self, strategy: DataSplitting, target_column: str):
+        """
+        Parameters:
+        strategy (DataSplitting): The data splitting strategy.
+        target_column (str): The name of the target column.
+        """
+        self.strategy = strategy
+        self.target_column = target_column
+
+    def params(self) -> list:
+        return [type(self.strategy).__name__, strategy_params(self.strategy), self.target_column]
+
+    def run(self, data: pd.DataFrame):
+        return DataSplitter(self.strategy).split(data, self.target_column, lazy=True)
+
+    def encode(self, output) -> pd.DataFrame:
+        splits = output if isinstance(output, list) else [output]
+        return pd.concat([pd.DataFrame({"fold": fold, "test": test, "position": positions})
+                          for fold, split in enumerate(splits)
+                          for test, positions in ((False, split.train_index), (True, split.test_index))],
+                         ignore_index=True)
+
+    def decode(self, frame: pd.DataFrame, data: pd.DataFrame):
+        fold, test, positions = (frame[column].to_numpy() for column in ("fold", "test", "position"))
+        splits = [LazySplit(data, self.target_column, positions[(fold == number) & ~test],
+                            positions[(fold == number) & test])
+                  for number in np.unique(fold)]
+        return splits if isinstance(self.strategy, CrossValidationSplitting) else splits[0]
+
+    @property
+    def name(self) -> str:
+        return f"{type(self).__name__}({type(self.strategy).__name__})"
+
+# ***************************************************************
+# ************ Pipeline with Stage-Level Caching ****************
+# ***************************************************************
+
+class Pipeline:
+    # Chains stages and caches every stage output in a DatasetCache under a key built from
+    # the key of its input and its own parameters. A run starts from the last stage whose
+    # output is cached, so changing a parameter only reruns that stage and the ones after it.
+    def __init__(self, stages: list, cache: DatasetCache = None):
+        """
+        Parameters:
+        stages (list): PipelineStage objects, the first one is usually a LoadStage.
+        cache (DatasetCache): Where stage outputs are stored, defaults to ".pipeline_cache".
+        """
+        self.stages = stages
+        self.cache = cache if cache is not None else DatasetCache(".pipeline_cache")
+        self.report_ = None
+
+    def keys(self) -> list:
+        """
+        Returns the cache key of every stage, computed without running anything.
+
+        Returns:
+        list: One key per stage.
+        """
+        first = self.stages[0]
+        key = first.source_key(self.cache) if isinstance(first, LoadStage) else ""
+        keys = []
+        for stage in self.stages:
+            key = stage.key(key)
+            keys.append(key)
+        return keys
+
+    def run(self):
+        """
+        Runs the pipeline, reusing cached stage outputs.
+
+        Returns:
+        The output of the last stage. self.report_ lists for every stage whether it was
+        loaded from the cache, computed, or skipped because a later stage was cached.
+        """
+        self._keys = self.keys()
+        self.report_ = [{"stage": stage.name, "key": key, "status": "skipped", "seconds": 0.0}
+                        for stage, key in zip(self.stages, self._keys)]
+        start = time.perf_counter()
+        output = self._output(len(self.stages) - 1)
+        computed = [entry["stage"] for entry in self.report_ if entry["status"] == "computed"]
+        logging.info(f"Pipeline finished in {time.perf_counter() - start:.3f}s, "
+                     f"computed stages: {computed or 'none'}.")
+        return output
+
+    def _output(self, position: int):
+        stage, key, entry = self.stages[position], self._keys[position], self.report_[position]
+        cached = key in self.cache
+        data = None
+        if position > 0 and (stage.needs_input or not cached):
+            data = self._output(position - 1)
+
+        start = time.perf_counter()
+        if cached:
+            output = stage.decode(self.cache.get(key), data)
+            entry["status"] = "cached"
+        else:
+            logging.info(f"Running pipeline stage {stage.name}.")
+            output = stage.run(data)
+            self.cache.put(key, stage.encode(output), self._source_path())
+            entry["status"] = "computed"
+        entry["seconds"] = time.perf_counter() - start
+        return output
+
+    def _source_path(self) -> str:
+        # entries are registered with the source file so they are dropped when it changes
+        first = self.stages[0]
+        return first.file_path if isinstance(first, LoadStage) else None
+
+
+# Example usage
+if __name__ == "__main__":
+    # from data_handling.handling_missing_values import FillMissingVaulues
+    # from data_splitting.data_splitter import TrainTestSplit
+    # from outlier_detection.outlier_detection import ZScoreOutlierDetection
+
+    # pipeline = Pipeline([
+    #     LoadStage('houseprice.zip'),
+    #     MissingValueStage(FillMissingVaulues(method='mean')),
+    #     OutlierStage(ZScoreOutlierDetection(threshold=3)),
+    #     SplitStage(TrainTestSplit(test_size=0.2, random_state=42), target_column='price'),
+    # ])
+    # X_train, X_test, y_train, y_test = pipeline.run()
+
+    # # only the outlier and split stages run again
+    # pipeline.stages[2] = OutlierStage(ZScoreOutlierDetection(threshold=2.5))
+    # split = pipeline.run()
+    # print(pipeline.report_)
+
+    pass
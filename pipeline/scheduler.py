@@ -0,0 +1,200 @@
+# Importing Libraries
+import hashlib
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from load_dataset.cache import DatasetCache, file_digest
+from pipeline.keys import stage_key
+from pipeline.pipeline import LoadStage, PipelineStage
+from pipeline.shared import SharedFrame
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# ***************************************************************
+# ************ Worker Side of the Sweep *************************
+# ***************************************************************
+
+# shared frames attached by this worker: block names -> (handles, frame). A frame is reused by
+# every task of the level that reads it and kept open until its results were sent back.
+_attached = {}
+
+def _run_node(stage: PipelineStage, input_spec) -> tuple:
+    names = tuple(column_spec[1][0] for column_spec in input_spec[0])
+    if names not in _attached:
+        # frames of earlier levels are no longer read, their blocks can be closed
+        for stale in list(_attached):
+            handles, _ = _attached.pop(stale)
+            for shm in handles:
+                shm.close()
+        _attached[names] = SharedFrame.attach(input_spec)
+    data = _attached[names][1]
+
+    start = time.perf_counter()
+    output = stage.encode(stage.run(data))
+    return output, time.perf_counter() - start, os.getpid()
+
+# ***************************************************************
+# ************ Strategy Sweep as a DAG of Stages ****************
+# ***************************************************************
+
+class SweepScheduler:
+    # Runs every combination of a grid of stages, e.g. 3 imputations x 4 outlier strategies x
+    # 1 split. Combinations that start with the same stages share those nodes, so every
+    # distinct prefix runs once. The DAG is run level by level: all nodes of a level are
+    # independent and run on a process pool, reading their input from a SharedFrame.
+    def __init__(self, source, grid: list, cache: DatasetCache = None, n_jobs: int = None):
+        """
+        Parameters:
+        source (LoadStage or pd.DataFrame): The base frame or the stage loading it.
+        grid (list): One list of alternative PipelineStage objects per pipeline step.
+        cache (DatasetCache): Optional cache of node outputs, keyed like Pipeline stages.
+        n_jobs (int): Number of worker processes, defaults to the core count.
+        """
+        self.source = source
+        self.grid = grid
+        self.cache = cache
+        self.n_jobs = n_jobs
+        self.report_ = None
+
+    def _source_key(self) -> str:
+        if isinstance(self.source, LoadStage):
+            digest = self.source.source_key(self.cache) if self.cache is not None else file_digest(self.source.file_path)
+            return self.source.key(digest)
+        hashes = pd.util.hash_pandas_object(self.source, index=True).to_numpy()
+        return stage_key(hashlib.blake2b(hashes.tobytes(), digest_size=20).hexdigest(), list(self.source.columns))
+
+    def build(self) -> list:
+        """
+        Builds the DAG. Nodes are identified by their cache key, so identical prefixes are merged.
+
+        Returns:
+        list: One dict per level mapping node key -> (stage, parent key).
+        """
+        levels = [{} for _ in self.grid]
+        root = self._source_key()
+        for combination in itertools.product(*self.grid):
+            parent = root
+            for level, stage in enumerate(combination):
+                key = stage.key(parent)
+                levels[level].setdefault(key, (stage, parent))
+                parent = key
+        self._root = root
+        return levels
+
+    def run(self) -> list:
+        """
+        Runs every combination of the grid.
+
+        Returns:
+        list: (stages, output) pairs in grid order, output is the last stage's output.
+            self.report_ holds the time of every node and level, the wall time, and the
+            longest root-to-leaf branch for comparison.
+        """
+        levels = self.build()
+        n_combinations = int(np.prod([len(options) for options in self.grid]))
+        n_nodes = sum(len(level) for level in levels)
+        logging.info(f"Sweeping {n_combinations} combinations as {n_nodes} distinct stages "
+                     f"on {len(levels)} levels.")
+        start = time.perf_counter()
+
+        if isinstance(self.source, LoadStage):
+            frames = {self._root: self._resolve_source()}
+        else:
+            frames = {self._root: self.source}
+        outputs, node_seconds, level_seconds = {}, {self._root: 0.0}, []
+
+        n_jobs = self.n_jobs or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for level in levels:
+                level_start = time.perf_counter()
+                pending = {}
+                # every input of the level is shared once, however many children read it
+                shared = {parent: SharedFrame(frames[parent])
+                          for parent in {parent for key, (_, parent) in level.items() if not self._cached(key)}}
+                try:
+                    for key, (stage, parent) in level.items():
+                        if self._cached(key):
+                            outputs[key] = stage.decode(self.cache.get(key), frames[parent])
+                            node_seconds[key] = 0.0
+                        else:
+                            pending[key] = executor.submit(_run_node, stage, shared[parent].spec)
+                    for key, future in pending.items():
+                        stage, parent = level[key]
+                        encoded, seconds, _ = future.result()
+                        node_seconds[key] = seconds
+                        if self.cache is not None:
+                            self.cache.put(key, encoded, self._source_path())
+                        outputs[key] = stage.decode(encoded, frames[parent])
+                finally:
+                    for frame in shared.values():
+                        frame.release()
+                for key in level:
+                    if isinstance(outputs[key], pd.DataFrame):
+                        frames[key] = outputs[key]
+                level_seconds.append(time.perf_counter() - level_start)
+
+        results = []
+        branch_seconds = []
+        for combination in itertools.product(*self.grid):
+            parent, seconds = self._root, 0.0
+            for stage in combination:
+                parent = stage.key(parent)
+                seconds += node_seconds[parent]
+            results.append((combination, outputs[parent]))
+            branch_seconds.append(seconds)
+
+        wall_seconds = time.perf_counter() - start
+        self.report_ = {
+            "combinations": n_combinations,
+            "nodes": n_nodes,
+            "n_jobs": n_jobs,
+            "node_seconds": [{"level": position, "stage": stage.name, "key": key, "seconds": node_seconds[key]}
+                             for position, level in enumerate(levels) for key, (stage, _) in level.items()],
+            "level_seconds": level_seconds,
+            "longest_branch_seconds": max(branch_seconds),
+            "serial_seconds": float(sum(branch_seconds)),
+            "wall_seconds": wall_seconds,
+        }
+        logging.info(f"Sweep finished in {wall_seconds:.3f}s, longest branch {max(branch_seconds):.3f}s, "
+                     f"{sum(branch_seconds):.3f}s if every combination ran on its own.")
+        return results
+
+    def _cached(self, key: str) -> bool:
+        return self.cache is not None and key in self.cache
+
+    def _resolve_source(self) -> pd.DataFrame:
+        key = self._root
+        if self._cached(key):
+            return self.source.decode(self.cache.get(key), None)
+        df = self.source.run(None)
+        if self.cache is not None:
+            self.cache.put(key, self.source.encode(df), self._source_path())
+        return df
+
+    def _source_path(self) -> str:
+        return self.source.file_path if isinstance(self.source, LoadStage) else None
+
+
+# Example usage
+if __name__ == "__main__":
+    # from data_handling.handling_missing_values import FillMissingVaulues
+    # from data_splitting.data_splitter import TrainTestSplit
+    # from outlier_detection.outlier_detection import IQROutlierDetection, ZScoreOutlierDetection
+    # from pipeline.pipeline import MissingValueStage, OutlierStage, SplitStage
+
+    # scheduler = SweepScheduler(LoadStage('houseprice.zip'), [
+    #     [MissingValueStage(FillMissingVaulues(method=method)) for method in ('mean', 'median', 'mode')],
+    #     [OutlierStage(ZScoreOutlierDetection(threshold=threshold)) for threshold in (2, 2.5, 3)]
+    #     + [OutlierStage(IQROutlierDetection())],
+    #     [SplitStage(TrainTestSplit(test_size=0.2, random_state=42), target_column='price')],
+    # ], n_jobs=4)
+    # for stages, split in scheduler.run():
+    #     print([stage.params() for stage in stages], len(split.train_index))
+    # print(scheduler.report_)
+
+    pass
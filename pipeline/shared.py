@@ -0,0 +1,79 @@
+# Importing Libraries
+import pandas as pd
+from data_splitting.cross_validation import SharedArray
+
+# ***************************************************************
+# ************ DataFrames Backed by Shared Memory ***************
+# ***************************************************************
+
+class SharedFrame:
+    # Shares a DataFrame with worker processes. Numeric and boolean columns are copied into
+    # shared memory as they are; other columns are shared as category codes, with the (small)
+    # category values and the original dtype sent in the spec. The index is shared the same
+    # way, except a RangeIndex which is sent as its bounds, so the spec sent with every task
+    # does not grow with the number of rows. Workers rebuild the frame around the shared
+    # arrays without copying the numeric columns.
+    def __init__(self, df: pd.DataFrame):
+        """
+        Parameters:
+        df (pd.DataFrame): The frame to share.
+        """
+        self._arrays = []
+        columns = [(column, *self._share(df[column])) for column in df.columns]
+        if isinstance(df.index, pd.RangeIndex):
+            index = ("range", df.index.start, df.index.stop, df.index.step, df.index.name)
+        else:
+            index = ("values", *self._share(df.index.to_series()), df.index.name)
+        self.spec = (columns, index)
+        self.nbytes = sum(array.nbytes for array in self._arrays)
+
+    def _share(self, series: pd.Series) -> tuple:
+        # (array spec, categories, dtype) of one column, categories is None for numeric columns
+        if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype) \
+                and not pd.api.types.is_extension_array_dtype(series.dtype):
+            array = SharedArray(series.to_numpy())
+            shared = (array.spec, None, None)
+        else:
+            categorical = pd.Categorical(series)
+            array = SharedArray(categorical.codes)
+            shared = (array.spec, categorical.categories, str(series.dtype))
+        self._arrays.append(array)
+        return shared
+
+    @staticmethod
+    def _attach(array_spec, categories, dtype):
+        shm, array = SharedArray.attach(array_spec)
+        if categories is None:
+            return shm, array
+        values = categories.array.take(array, allow_fill=True)
+        return shm, values if str(values.dtype) == dtype else values.astype(dtype)
+
+    @staticmethod
+    def attach(spec):
+        """
+        Attaches to a shared frame from its spec.
+
+        Parameters:
+        spec (tuple): The column specs and the index spec of the shared frame.
+
+        Returns:
+        handles, df: The shared memory handles, which must stay referenced, and the frame.
+        """
+        columns, index_spec = spec
+        handles, data = [], {}
+        for column, array_spec, categories, dtype in columns:
+            shm, data[column] = SharedFrame._attach(array_spec, categories, dtype)
+            handles.append(shm)
+        if index_spec[0] == "range":
+            _, start, stop, step, name = index_spec
+            index = pd.RangeIndex(start, stop, step, name=name)
+        else:
+            _, array_spec, categories, dtype, name = index_spec
+            shm, values = SharedFrame._attach(array_spec, categories, dtype)
+            handles.append(shm)
+            index = pd.Index(values, name=name, copy=False)
+        return handles, pd.DataFrame(data, index=index, copy=False)
+
+    def release(self):
+        for array in self._arrays:
+            array.release()
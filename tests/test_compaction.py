@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+from load_dataset.compaction import DtypeCompactor
+
+
+def test_stream_chunks_share_the_planned_dtypes():
+    compactor = DtypeCompactor(sample_rows=3)
+    chunks = [pd.DataFrame({"bedrooms": [1, 2, 3], "area": [0.5, 1.5, 2.5], "mainroad": ["yes", "no", "yes"]}),
+              pd.DataFrame({"bedrooms": [1.0, np.nan, 5.0], "area": [1.0, 2.0, 3.0], "mainroad": ["no", None, "yes"]}),
+              pd.DataFrame({"bedrooms": [4, 2, 1], "area": [0.5, 1.0, 2.0], "mainroad": ["no", "no", "no"]})]
+    compacted = [compactor.apply(chunk) for chunk in chunks]
+    for column, dtype in (("bedrooms", "Int8"), ("area", "float32"), ("mainroad", "boolean")):
+        assert [str(chunk[column].dtype) for chunk in compacted] == [dtype] * 3
+        assert str(pd.concat(compacted)[column].dtype) == dtype
+
+
+def test_stream_chunk_outside_the_plan_raises():
+    compactor = DtypeCompactor(sample_rows=2)
+    compactor.apply(pd.DataFrame({"parking": [1, 2], "price": [0.5, 1.5]}))
+    with pytest.raises(ValueError, match="parking"):
+        compactor.apply(pd.DataFrame({"parking": [1, 300], "price": [0.5, 1.0]}))
+    with pytest.raises(ValueError, match="price"):
+        compactor.apply(pd.DataFrame({"parking": [1, 2], "price": [0.1, 1.0]}))
+
+
+def test_whole_frame_widens_past_the_sample():
+    df = pd.DataFrame({"parking": [1, 2, 300], "price": [0.5, 1.5, 0.1]})
+    compacted = DtypeCompactor(sample_rows=2).compact(df)
+    assert (compacted["parking"].dtype, compacted["price"].dtype) == (np.int16, np.float64)
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from exporarative_data_analysis.correlation import CorrelationAnalyzer, PearsonCorrelation, dataset_fingerprint
+
+
+def _houses():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(2000, 3)) * [1000, 1, 1e6] + [5000, 3, 4e6],
+                      columns=["area", "bedrooms", "price"])
+    df["constant"] = 2.5
+    return df
+
+
+def test_pearson_matches_pandas():
+    df = _houses()
+    expected = df.corr()
+    pd.testing.assert_frame_equal(CorrelationAnalyzer(PearsonCorrelation()).correlation(df), expected, atol=1e-6)
+
+
+def test_fingerprint_is_remembered_per_frame():
+    df = _houses()
+    digest = dataset_fingerprint(df)
+    assert dataset_fingerprint(df) == digest
+    assert dataset_fingerprint(df.copy()) == digest
+    df.iloc[0, 0] = -1.0
+    assert dataset_fingerprint(df) != digest
@@ -0,0 +1,13 @@
+import numpy as np
+from data_splitting.cross_validation import run_folds
+
+
+def _mean_target(X_train, X_test, y_train, y_test):
+    return float(y_train.mean())
+
+
+def test_run_folds_without_folds():
+    results, report = run_folds(np.zeros((4, 2)), np.arange(4.0), [], _mean_target)
+    assert results == []
+    assert report["n_jobs"] == 0
+    assert report["fold_seconds"] == []
@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_splitting.data_splitter import DataSplitter, HashTrainTestSplit, KFoldSplit, TimeOrderedSplit
+
+
+def test_split_matrix_without_df_needs_a_target_only_strategy():
+    X, y = np.arange(40.0).reshape(20, 2), np.arange(20.0)
+    folds = DataSplitter(KFoldSplit(n_splits=4)).split_matrix(X, y)
+    assert len(folds) == 4
+    for strategy in (TimeOrderedSplit("listed"), HashTrainTestSplit("id"), HashTrainTestSplit()):
+        with pytest.raises(ValueError, match="pass the frame"):
+            DataSplitter(strategy).split_matrix(X, y)
+    df = pd.DataFrame({"listed": np.arange(20)[::-1], "price": y})
+    assert len(DataSplitter(TimeOrderedSplit("listed", n_splits=3)).split_matrix(X, y, df, "price")) == 3
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from data_handling.handling_missing_values import (FillMissingVaulues, IterativeImputation, KNNImputation,
+                                                     MissingValueHandler)
+
+
+def _houses():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"area": rng.normal(5000, 1000, 200), "bedrooms": rng.integers(1, 6, 200),
+                       "price": rng.normal(4e6, 1e6, 200).astype(np.float32)})
+    df.loc[::10, "area"] = np.nan
+    df.loc[5::20, "price"] = np.nan
+    return df
+
+
+def test_imputers_only_fill_missing_cells():
+    df = _houses()
+    for strategy in (KNNImputation(n_neighbors=3, n_jobs=1), IterativeImputation(max_iter=3)):
+        filled = strategy.handle(df)
+        assert filled["bedrooms"].dtype == np.int64
+        assert filled["price"].dtype == np.float32
+        assert not filled.isna().any().any()
+        observed = df.notna()
+        pd.testing.assert_frame_equal(filled[observed].dropna(how="all"), df[observed].dropna(how="all"))
+
+
+def test_nothing_to_fill_returns_a_copy():
+    df = _houses().dropna()
+    strategies = (FillMissingVaulues(), KNNImputation(n_neighbors=3, n_jobs=1), IterativeImputation(max_iter=3))
+    for strategy in strategies:
+        handler = MissingValueHandler(strategy)
+        filled = handler.handle_missing_values(df)
+        assert filled is not df
+        filled.iloc[0, 0] = -1.0
+        assert df.iloc[0, 0] != -1.0
+        assert handler.transform(df, inplace=True) is df
@@ -0,0 +1,18 @@
+import warnings
+import numpy as np
+from exporarative_data_analysis.large_data import bin_index, histogram2d
+
+
+def test_constant_float_column_keeps_every_point():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        counts, xedges, yedges = histogram2d(np.full(10, 2.5), np.arange(10.0))
+    assert counts.sum() == 10
+    assert counts.shape == (1, 10)
+    assert np.allclose(xedges, [2.0, 3.0])
+
+
+def test_integer_columns_get_one_bin_per_value():
+    index, edges = bin_index(np.array([1.0, 2.0, 5.0, np.nan]), 100)
+    assert index.tolist() == [0, 1, 4, -1]
+    assert len(edges) == 6
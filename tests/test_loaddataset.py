@@ -0,0 +1,51 @@
+import pandas as pd
+from load_dataset.cache import DatasetCache
+from load_dataset.compaction import DtypeCompactor
+from load_dataset.loaddataset import LoadDataFactory
+
+
+def test_cache_key_of_compacted_load_is_stable(tmp_path):
+    path = tmp_path / "houses.csv"
+    pd.DataFrame({"price": [100, 200, 300], "mainroad": ["yes", "no", "yes"]}).to_csv(path, index=False)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    for _ in range(2):
+        LoadDataFactory.get_data_loader(".csv", cache=cache, compactor=DtypeCompactor()).loader(str(path))
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_compressed_files_use_the_loader_of_their_inner_extension(tmp_path):
+    df = pd.DataFrame({"price": [100, 200], "area": [50, 60]})
+    path = tmp_path / "houses.jsonl.gz"
+    df.to_json(path, orient="records", lines=True)
+    assert LoadDataFactory.file_extension(str(path)) == ".jsonl"
+    loaded = LoadDataFactory.get_data_loader(LoadDataFactory.file_extension(str(path))).loader(str(path))
+    pd.testing.assert_frame_equal(loaded, df)
+    assert [LoadDataFactory.file_extension(name) for name in ("a.csv.bz2", "a.gz", ".csv", "a.zip")] == \
+        [".csv", ".csv", ".csv", ".zip"]
+
+
+def test_every_loader_takes_a_compactor(tmp_path):
+    df = pd.DataFrame({"price": [100, 200, 300], "mainroad": ["yes", "no", "yes"]})
+    for extension in (".parquet", ".feather"):
+        path = str(tmp_path / f"houses{extension}")
+        getattr(df, f"to_{extension[1:]}")(path)
+        loaded = LoadDataFactory.get_data_loader(extension, compactor=DtypeCompactor()).loader(path)
+        assert loaded["mainroad"].dtype == bool
+        assert loaded["price"].dtype == "int16"
+    assert LoadDataFactory.get_data_loader(".xlsx", compactor=DtypeCompactor()).compactor is not None
+
+
+def test_zip_loader_applies_the_configured_options(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "houses.zip"
+    df = pd.DataFrame({"price": [100, 200, 300], "area": [50, 60, 70], "mainroad": ["yes", "no", "yes"]})
+    df.to_csv(path, index=False, compression={"method": "zip", "archive_name": "houses.csv"})
+    for chunksize in (None, 2):
+        loader = LoadDataFactory.get_data_loader(".zip", usecols=["price", "area"], dtype={"area": "float32"},
+                                                 chunksize=chunksize)
+        loaded = loader.loader(str(path))
+        assert list(loaded.columns) == ["price", "area"]
+        assert loaded["area"].dtype == "float32"
+        assert len(loaded) == 3
+    assert not (tmp_path / "extracted_data").exists()
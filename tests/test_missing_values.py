@@ -0,0 +1,15 @@
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+from exporarative_data_analysis.missing_values import Incremental_Missing_Value_Analysis
+
+
+def test_batch_without_a_column_counts_it_as_missing(tmp_path):
+    state_path = str(tmp_path / "listings.json")
+    first = pd.DataFrame({"price": [1.0, np.nan, 3.0], "parking": [0, 1, 2]})
+    second = pd.DataFrame({"price": [4.0, 5.0]})
+    Incremental_Missing_Value_Analysis(state_path=state_path).identify_missing_values(first)
+    # a new analysis continues from the stored profile
+    missing = Incremental_Missing_Value_Analysis(state_path=state_path).identify_missing_values(second)
+    assert missing.to_dict() == {"price": 1, "parking": 2}
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from outlier_detection.outlier_detection import (IsolationForestOutlierDetection, MahalanobisOutlierDetection,
+                                                 OutlierDetector, ZScoreOutlierDetection)
+
+
+def _frames():
+    rng = np.random.default_rng(0)
+    a = pd.DataFrame(rng.normal(size=(1000, 3)), columns=["area", "bedrooms", "price"])
+    return a, a * 100 + 1000
+
+
+def test_multivariate_strategy_refits_on_every_frame():
+    a, b = _frames()
+    for strategy in (IsolationForestOutlierDetection, MahalanobisOutlierDetection):
+        detector = OutlierDetector(strategy(contamination=0.01, n_jobs=1))
+        detector.handle_outliers(a)
+        reused = detector.handle_outliers(b)
+        fresh = OutlierDetector(strategy(contamination=0.01, n_jobs=1)).handle_outliers(b)
+        assert len(reused) == len(fresh)
+        assert len(fresh) > 900
+
+
+def test_explicit_fit_keeps_the_model():
+    a, b = _frames()
+    detector = OutlierDetector(MahalanobisOutlierDetection(contamination=0.01)).fit(a)
+    model = detector._strategy.model_
+    # b is far from the fitted distribution, every row is an outlier for the kept model
+    assert len(detector.handle_outliers(b)) == 0
+    assert detector._strategy.model_ is model
+
+
+def test_remove_keeps_the_shape_of_rows_and_lists():
+    a, _ = _frames()
+    normal, outlier = np.zeros(3), np.full(3, 50.0)
+    for strategy in (ZScoreOutlierDetection(), MahalanobisOutlierDetection(contamination=0.01)):
+        detector = OutlierDetector(strategy).fit(a)
+        assert detector.transform(normal, method="remove").shape == (3,)
+        assert detector.transform(outlier, method="remove") is None
+        assert detector.transform([list(normal), list(outlier)], method="remove") == [list(normal)]
+        assert detector.transform(np.vstack([normal, outlier]), method="remove").shape == (1, 3)
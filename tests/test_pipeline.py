@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+from outlier_detection.outlier_detection import ZScoreOutlierDetection
+from pipeline.pipeline import OutlierStage
+
+
+def test_outlier_removal_with_repeated_index_labels():
+    rng = np.random.default_rng(0)
+    chunk = pd.DataFrame({"price": rng.normal(100, 10, 200), "city": ["a", "b"] * 100})
+    chunk.loc[5, "price"] = 1000.0
+    # two chunks concatenated without ignore_index repeat every label
+    data = pd.concat([chunk, chunk])
+    cleaned = OutlierStage(ZScoreOutlierDetection()).run(data)
+    assert len(cleaned) == 398
+    assert cleaned["price"].max() < 1000.0
+    assert list(cleaned.columns) == ["price", "city"]
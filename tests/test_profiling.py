@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from exporarative_data_analysis.profiling import DataProfile
+
+
+def _chunks():
+    first = pd.DataFrame({"price": [1.0, 2.0, np.nan], "city": ["a", "b", "a"]})
+    # the second file lacks city and adds area
+    second = pd.DataFrame({"price": [3.0, 4.0], "area": [50.0, np.nan]})
+    return first, second
+
+
+def test_columns_missing_from_a_chunk_count_as_missing():
+    profile = DataProfile(n_jobs=1)
+    for chunk in _chunks():
+        profile.update(chunk)
+    assert profile.missing_counts().to_dict() == {"price": 1, "city": 2, "area": 4}
+    columns = profile.to_dict()["columns"]
+    assert columns["city"]["null_fraction"] == 2 / 5
+    assert columns["area"]["count"] == 1
+
+
+def test_merge_counts_the_columns_of_one_side_as_missing():
+    first, second = _chunks()
+    merged = DataProfile(n_jobs=1).update(first).merge(DataProfile(n_jobs=1).update(second))
+    assert merged.missing_counts().to_dict() == {"price": 1, "city": 2, "area": 4}